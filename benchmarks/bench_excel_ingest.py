@@ -0,0 +1,116 @@
+"""Excel ingestion benchmark: wall time and peak Python memory.
+
+Generates a synthetic inventory workbook (100k rows by default) and loads it
+with ``load_devices_from_excel`` (read-only streaming) and, for comparison,
+with a full in-memory ``load_workbook`` walk like the old fallback did.
+
+    python benchmarks/bench_excel_ingest.py --rows 100000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import Workbook, load_workbook  # noqa: E402
+
+from device_loader import load_devices_from_excel  # noqa: E402
+
+HEADERS = ["Cihaz", "IP", "Device Name", "Model", "MAC", "Location", "Unit", "Description"]
+MAPPING = {
+    "device": "Cihaz",
+    "ip": "IP",
+    "name": "Device Name",
+    "model": "Model",
+    "mac": "MAC",
+    "location": "Location",
+    "unit": "Unit",
+    "description": "Description",
+}
+
+
+def make_workbook(path, rows, seed=1):
+    rnd = random.Random(seed)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(HEADERS)
+    for i in range(rows):
+        ws.append([
+            rnd.choice(["Switch", "AP", "Kamera", "Yazıcı"]),
+            f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}",
+            f"dev-{i}" if rnd.random() > 0.05 else None,
+            f"M-{rnd.randint(1, 400)}",
+            ":".join(f"{rnd.randint(0, 255):02x}" for _ in range(6)),
+            f"Bina {rnd.randint(1, 40)}",
+            rnd.randint(1, 12) * 1.0,     # Excel'den float gelen tam sayılar
+            "" if i % 7 else "  not  ",
+        ])
+    wb.save(path)
+
+
+def legacy_load(path, mapping):
+    wb = load_workbook(path, data_only=True)
+    ws = wb.active
+    headers = [cell.value for cell in ws[1]]
+    header_index = {h: i for i, h in enumerate(headers)}
+    devices = []
+    for row in ws.iter_rows(min_row=2, values_only=True):
+        device = {}
+        for field, header in mapping.items():
+            idx = header_index.get(header)
+            device[field] = row[idx] if idx is not None else None
+        devices.append(device)
+    return devices
+
+
+def measure(fn, *args):
+    """Wall time of a clean run, then peak memory of a traced second run.
+
+    tracemalloc slows allocation-heavy code several times over, so the two
+    are measured separately.
+    """
+    gc.collect()
+    t0 = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - t0
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--skip-legacy", action="store_true",
+                        help="only run the streaming loader")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "inventory.xlsx")
+        t0 = time.perf_counter()
+        make_workbook(path, args.rows)
+        print(f"workbook: {args.rows} rows, {os.path.getsize(path) / 1e6:.1f} MB, "
+              f"generated in {time.perf_counter() - t0:.1f}s")
+
+        runs = [("streaming", load_devices_from_excel)]
+        if not args.skip_legacy:
+            runs.append(("legacy full load", legacy_load))
+
+        for name, fn in runs:
+            devices, elapsed, peak = measure(fn, path, MAPPING)
+            print(f"{name:>17}: {len(devices)} devices  {elapsed:6.2f}s  "
+                  f"peak {peak / 1e6:7.1f} MB  ({args.rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Ping output parser: fixture check and lines/sec against the old two-regex parser.
+
+    python benchmarks/bench_ping_parser.py
+    python benchmarks/bench_ping_parser.py --lines 200000 -o parser.json
+
+First every file in ``fixtures/ping`` is parsed (raw bytes, as read from the
+ping process) and compared with ``fixtures/ping/expected.json``; a mismatch
+exits with status 1. Then the fixture lines are repeated up to ``--lines`` and
+parsed line by line as ``bytes`` and as ``str`` with the new parser and with
+the previous ``extract_ping_ms`` (lowercase + two ``re.search`` calls), and
+once as a single buffer with ``parse_ping_output``.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from ping_parser import extract_ping_ms, parse_ping_line, parse_ping_output  # noqa: E402
+
+FIXTURE_DIR = os.path.join(HERE, "fixtures", "ping")
+
+
+def legacy_extract_ping_ms(text):
+    """ping_engine.extract_ping_ms before the single-pass parser."""
+    text = text.lower()
+
+    match = re.search(r"time[=<]?\s*([\d\.]+)\s*ms", text)
+    if match:
+        return float(match.group(1))
+
+    match = re.search(r"time[=<]?([\d\.]+)ms", text)
+    if match:
+        return float(match.group(1))
+
+    return None
+
+
+def check_fixtures():
+    with open(os.path.join(FIXTURE_DIR, "expected.json"), "r", encoding="utf-8") as f:
+        expected = json.load(f)
+
+    failures = []
+    corpus = []
+    for name, want in sorted(expected.items()):
+        with open(os.path.join(FIXTURE_DIR, name), "rb") as f:
+            data = f.read()
+        corpus.extend(data.splitlines(keepends=True))
+        report = parse_ping_output(data)
+        got = {
+            "samples": [list(s) for s in report.samples],
+            "summary": report.summary._asdict(),
+        }
+        if got != want:
+            failures.append(name)
+            print(f"HATA {name}:\n  beklenen {want}\n  bulunan  {got}", file=sys.stderr)
+    return failures, corpus
+
+
+def lines_per_sec(fn, lines):
+    t0 = time.perf_counter()
+    for line in lines:
+        fn(line)
+    elapsed = time.perf_counter() - t0
+    return len(lines) / elapsed if elapsed else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100000)
+    parser.add_argument("-o", "--output", help="JSON sonuç dosyası (yoksa stdout)")
+    args = parser.parse_args(argv)
+
+    failures, corpus = check_fixtures()
+    print(f"fixture: {len(corpus)} satır, {len(failures)} hata", file=sys.stderr)
+
+    byte_lines = (corpus * (args.lines // len(corpus) + 1))[:args.lines]
+    # eski yol metin alıyordu; Windows çıktısı yerel kod sayfasıyla çözülür
+    text_lines = [line.decode("utf-8", "replace") for line in byte_lines]
+
+    # asıl kullanım: sürecin bütün çıktısı tek seferde
+    blob = b"".join(byte_lines)
+    t0 = time.perf_counter()
+    parse_ping_output(blob)
+    whole = len(byte_lines) / (time.perf_counter() - t0)
+
+    results = {
+        "lines": len(byte_lines),
+        "fixture_failures": failures,
+        "legacy_extract_ping_ms_str": lines_per_sec(legacy_extract_ping_ms, text_lines),
+        "extract_ping_ms_str": lines_per_sec(extract_ping_ms, text_lines),
+        "extract_ping_ms_bytes": lines_per_sec(extract_ping_ms, byte_lines),
+        "parse_ping_line_str": lines_per_sec(parse_ping_line, text_lines),
+        "parse_ping_line_bytes": lines_per_sec(parse_ping_line, byte_lines),
+        "parse_ping_output_bytes": whole,
+    }
+    for key, value in results.items():
+        if key.endswith(("_str", "_bytes")):
+            print(f"{key:>28}: {value:12,.0f} satır/sn", file=sys.stderr)
+
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
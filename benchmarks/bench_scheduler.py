@@ -0,0 +1,159 @@
+"""Continuous-monitoring scheduler throughput against a stub probe.
+
+    python benchmarks/bench_scheduler.py
+    python benchmarks/bench_scheduler.py --devices 20000 --interval 30 --duration 30 --down 0.1
+    python benchmarks/bench_scheduler.py --interval 1 --duration 10 -o scheduler.json
+
+``ProbeScheduler`` runs unchanged; only ``submit`` is replaced by a stub that
+answers after ``--latency-ms`` (or, for the ``--down`` share of devices,
+after the monitor timeout, holding its pool slot like a real timeout). The
+run reports how many devices got a probe sent within ``--duration`` (one interval
+by default, so every device should be probed once), the achieved probe rate
+against the rate the intervals ask for, and the schedule slip.
+"""
+import argparse
+import heapq
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import ProbeScheduler  # noqa: E402
+
+
+class StubProbe:
+    """``submit(ip, callback, timeout)`` answered from one timer thread."""
+
+    def __init__(self, latency, down_ips):
+        self.latency = latency
+        self.down_ips = down_ips
+        self.submitted = set()
+        self._heap = []
+        self._counter = 0
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="stub-probe", daemon=True)
+        self._thread.start()
+
+    def submit(self, ip, callback, timeout):
+        self.submitted.add(ip)
+        if ip in self.down_ips:
+            delay, ms, kind = timeout, None, "timeout"
+        else:
+            delay, ms, kind = self.latency, self.latency * 1000, "ok"
+        with self._cond:
+            self._counter += 1
+            heapq.heappush(self._heap, (time.monotonic() + delay, self._counter, ip, callback, ms, kind))
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                due = self._heap[0][0]
+                now = time.monotonic()
+                if due > now:
+                    self._cond.wait(due - now)
+                    continue
+                _, _, ip, callback, ms, kind = heapq.heappop(self._heap)
+            callback(ip, ms, kind)
+
+    def close(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout=2)
+
+
+def run(devices, interval, duration, latency, down, max_in_flight, timeout, seed=1):
+    rnd = random.Random(seed)
+    inventory = [{"ip": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"} for i in range(devices)]
+    down_ips = {d["ip"] for d in inventory if rnd.random() < down}
+
+    results = [0]
+
+    def on_result(ip, ms, kind):
+        results[0] += 1
+
+    stub = StubProbe(latency, down_ips)
+    scheduler = ProbeScheduler(on_result, {
+        "default_interval": interval,
+        "max_in_flight": max_in_flight,
+        "timeout": timeout,
+    }, submit=stub.submit)
+    scheduler.set_devices(inventory)
+    warning = scheduler.coverage_warning()
+
+    cpu0 = time.process_time()
+    t0 = time.perf_counter()
+    scheduler.start()
+    time.sleep(duration)
+    scheduler.stop()
+    elapsed = time.perf_counter() - t0
+    cpu = time.process_time() - cpu0
+    stub.close()
+
+    stats = scheduler.stats()
+    return {
+        "devices": devices,
+        "interval": interval,
+        "duration": round(elapsed, 2),
+        "latency_ms": latency * 1000,
+        "down": len(down_ips),
+        "max_in_flight": max_in_flight,
+        "timeout": timeout,
+        "required_rate": round(stats["required_rate"], 1),
+        "capacity": round(stats["capacity"], 1),
+        "coverage_warning": warning,
+        "probes": stats["probes"],
+        "results": results[0],
+        "probes_per_sec": round(stats["probes"] / elapsed, 1),
+        "devices_probed_pct": round(100.0 * len(stub.submitted) / devices, 2) if devices else None,
+        "avg_slip_ms": round(stats["avg_slip"] * 1000, 2),
+        "max_slip_ms": round(stats["max_slip"] * 1000, 2),
+        "late": stats["late"],
+        "skipped": stats["skipped"],
+        "cpu_pct": round(100.0 * cpu / elapsed, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=20000)
+    parser.add_argument("--interval", type=float, default=30, help="saniye")
+    parser.add_argument("--duration", type=float, help="saniye (yoksa bir aralık)")
+    parser.add_argument("--latency-ms", type=float, default=5)
+    parser.add_argument("--down", type=float, default=0.0,
+                        help="timeout'a kadar yanıt vermeyen cihaz oranı (0-1)")
+    parser.add_argument("--max-in-flight", type=int, default=512)
+    parser.add_argument("--timeout", type=float, default=2)
+    parser.add_argument("-o", "--output", help="JSON sonuç dosyası (yoksa stdout)")
+    args = parser.parse_args(argv)
+
+    result = run(args.devices, args.interval, args.duration or args.interval,
+                 args.latency_ms / 1000, args.down, args.max_in_flight, args.timeout)
+    print(f"{result['devices']} cihaz / {result['interval']:g} sn: "
+          f"%{result['devices_probed_pct']} ping atıldı, {result['probes_per_sec']:,.0f} ping/sn "
+          f"(gereken {result['required_rate']:,.0f}), kayma ort {result['avg_slip_ms']} ms / "
+          f"maks {result['max_slip_ms']} ms, CPU %{result['cpu_pct']}", file=sys.stderr)
+    if result["coverage_warning"]:
+        print(f"uyarı: {result['coverage_warning']}", file=sys.stderr)
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""Micro-benchmarks for the hot paths on synthetic 1k / 10k / 100k inventories.
+
+    python benchmarks/bench_suite.py -o bench.json
+    python benchmarks/bench_suite.py --sizes 1000,10000 --compare bench.json
+
+Results are written as JSON (one entry per case and size). With
+``--compare`` the run is checked against an earlier result file and the
+exit status is 1 if any case got slower than ``--tolerance``.
+
+main.py builds the Tk window at import time, so the cases exercise the
+modules its functions delegate to (filter / search index, ping output
+parser, Excel merge, persistence / SQLite storage, metrics exporter,
+VirtualTree, sort index). Row rendering mirrors ``device_row_values``.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from device_loader import load_devices, save_devices  # noqa: E402
+from device_storage import SqliteDeviceStorage  # noqa: E402
+from device_store import DeviceStore  # noqa: E402
+from filter_index import FilterIndex  # noqa: E402
+from latency_stats import LatencyStats  # noqa: E402
+from metrics_exporter import MetricsExporter  # noqa: E402
+from ping_parser import extract_ping_ms  # noqa: E402
+from pingmonitor import apply_result, carry_ping_state  # noqa: E402
+from search_index import SearchIndex  # noqa: E402
+from sort_index import SortIndex, ip_key, number_key, text_key  # noqa: E402
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+FILTER_FIELDS = ("device", "ip", "name", "model", "mac", "location", "unit", "description")
+
+PING_LINES = [
+    "64 bytes from 10.0.0.1: icmp_seq=1 ttl=64 time=0.045 ms\n",
+    "64 bytes from 8.8.8.8: icmp_seq=12 ttl=117 time=13.4 ms\n",
+    "Reply from 10.1.2.3: bytes=32 time=3ms TTL=128\n",
+    "Reply from 10.1.2.3: bytes=32 time<1ms TTL=128\n",
+    "Request timed out.\n",
+    "From 10.0.0.254 icmp_seq=3 Destination Host Unreachable\n",
+    "PING 10.0.0.1 (10.0.0.1) 56(84) bytes of data.\n",
+]
+
+
+# ---------------- veri ----------------
+def make_inventory(n, seed=1):
+    """Device dicts with the same shape as devices.json after an Excel merge."""
+    rnd = random.Random(seed)
+    statuses = ["FAST", "NORMAL", "SLOW", "VERY_SLOW", "DOWN", "UNKNOWN"]
+    devices = []
+    for i in range(n):
+        latency = None if rnd.random() < 0.1 else round(rnd.uniform(0.2, 250), 1)
+        devices.append({
+            "device": rnd.choice(["Switch", "AP", "Kamera", "Yazıcı", "Router"]),
+            "ip": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}",
+            "name": f"dev-{rnd.randint(0, n * 4):06d}",
+            "model": f"M-{rnd.randint(1, 400)}",
+            "mac": ":".join(f"{rnd.randint(0, 255):02x}" for _ in range(6)),
+            "location": f"Bina {rnd.randint(1, 40)}",
+            "unit": rnd.choice(["Bilgi İşlem", "Üretim", "Depo", "İdari", None]),
+            "description": rnd.choice(["", "kat 1", "kat 2", "yedek", "arızalı"]),
+            "latency": latency,
+            "last_ping": "2026-02-02 11:46:45",
+            "status": rnd.choice(statuses),
+        })
+    rnd.shuffle(devices)
+    return devices
+
+
+def stat_text(value, fmt="{:.1f}"):
+    return "-" if value is None else fmt.format(value)
+
+
+def make_row_values(stats):
+    def device_row_values(d):
+        latency_txt = "-" if d.get("latency") is None else f"{d['latency']:.1f}"
+        summary = stats.summary(d.get("ip")) or {}
+        return (
+            d.get("device", ""), d.get("ip", ""), latency_txt, d.get("last_ping") or "-",
+            stat_text(summary.get("p50")), stat_text(summary.get("p95")),
+            stat_text(summary.get("p99")), stat_text(summary.get("jitter")),
+            stat_text(summary.get("loss"), "{:.0f}"),
+            d.get("name", ""), d.get("model", ""), d.get("mac", ""),
+            d.get("location", ""), d.get("unit", ""), d.get("description", ""),
+        )
+    return device_row_values
+
+
+# ---------------- ölçüm ----------------
+def measure(fn, min_time=0.2, repeat=5):
+    """Best / median milliseconds per call over ``repeat`` rounds.
+
+    Each round runs ``fn`` enough times to last about ``min_time / repeat``.
+    """
+    t0 = time.perf_counter()
+    fn()
+    single = time.perf_counter() - t0
+    loops = max(1, int((min_time / repeat) / max(single, 1e-9)))
+    rounds = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        rounds.append((time.perf_counter() - t0) / loops * 1000)
+    return {"best_ms": min(rounds), "median_ms": statistics.median(rounds), "loops": loops}
+
+
+def cases_for(n, tmpdir, tk_root):
+    inventory = make_inventory(n)
+    store = DeviceStore(inventory)
+    filters = FilterIndex(FILTER_FIELDS)
+    search = SearchIndex()
+    store.subscribe(filters)
+    store.subscribe(search)
+
+    active = {f: set() for f in FILTER_FIELDS}
+    active["location"] = {f"Bina {i}" for i in range(1, 11)}
+    active["device"] = {"Switch", "AP"}
+
+    def matches_no_search():
+        filters.set_filters(active)
+        return [d for d in store if filters.matches(d)]
+
+    def matches_with_search():
+        filters.set_filters(active)
+        search.search("")
+        search.search("dev-00")
+        return [d for d in store if filters.matches(d) and search.matches(d)]
+
+    lines = PING_LINES * (max(1, n // len(PING_LINES)))
+
+    def parse_lines():
+        for line in lines:
+            extract_ping_ms(line)
+
+    sort_keys = {
+        "ip": lambda d: ip_key(d.get("ip")),
+        "name": lambda d: text_key(d.get("name")),
+        "location": lambda d: text_key(d.get("location")),
+        "latency": lambda d: number_key(d.get("latency")),
+    }
+    sort_store = DeviceStore(list(inventory))
+    sorter = SortIndex(sort_keys, volatile=("latency",))
+    sort_store.subscribe(sorter)
+    flip = [False]
+
+    def sort_ip_cold():
+        # anahtarlar her seferinde yeniden hesaplanır (ilk tıklama)
+        cold = SortIndex(sort_keys)
+        cold.reset(list(inventory))
+        cold.sort([("ip", False)])
+
+    def sort_cached(order):
+        def run():
+            flip[0] = not flip[0]
+            sorter.sort([(col, rev != flip[0]) for col, rev in order])
+        return run
+
+    live_store = DeviceStore([dict(d) for d in inventory])
+    live_sorter = SortIndex(sort_keys, volatile=("latency",))
+    live_store.subscribe(live_sorter)
+    live_sorter.sort([("latency", False)])
+    moving = live_store[::100]
+    rnd = random.Random(2)
+
+    def sort_reposition():
+        # canlı kolon: %1'in sonucu gelir, satırlar ikili aramayla yerine taşınır
+        for d in moving:
+            d["latency"] = round(rnd.uniform(0.2, 250), 1)
+        live_sorter.touch_many(moving)
+
+    excel_rows = [{k: d[k] for k in FILTER_FIELDS} for d in inventory]
+
+    def merge():
+        carry_ping_state([dict(r) for r in excel_rows], store)
+
+    path = os.path.join(tmpdir, f"devices-{n}.json")
+
+    stats = LatencyStats({"status_source": "p95"})
+    rnd = random.Random(2)
+    for d in inventory[:1000]:
+        for _ in range(30):
+            stats.record(d["ip"], None if rnd.random() < 0.05 else rnd.uniform(0.2, 250))
+    results = [(d["ip"], d.get("latency")) for d in inventory]
+
+    def record_stats():
+        for d, (ip, ms) in zip(inventory, results):
+            apply_result(d, ms, "2026-02-02 11:46:45", stats)
+
+    def save():
+        save_devices(inventory, path)
+
+    save()
+
+    def load():
+        load_devices(path)
+
+    db = SqliteDeviceStorage(os.path.join(tmpdir, f"devices-{n}.db"))
+    db.save(inventory)
+    dirty = store[::100]
+
+    def sqlite_upsert():
+        # bir flush: cihazların %1'i tek işlemde
+        db.save(dirty, {d["ip"] for d in dirty})
+
+    def sqlite_load():
+        db.load()
+
+    # scrape arası cihazların %1'i yeni sonuç almış
+    exporter = MetricsExporter(lambda: store, stats, min_interval=0)
+    exporter.payload()
+    changing = store[::100]
+
+    def scrape():
+        for d in changing:
+            d["latency"] = (d.get("latency") or 0) + 0.1
+            exporter.result(d["latency"])
+        exporter.payload()
+
+    cases = [
+        ("extract_ping_ms", parse_lines, len(lines)),
+        ("device_matches_filters", matches_no_search, n),
+        ("device_matches_filters+search", matches_with_search, n),
+        ("sort_ip_cold", sort_ip_cold, n),
+        ("sort_ip", sort_cached([("ip", False)]), n),
+        ("sort_text", sort_cached([("name", False)]), n),
+        ("sort_multi", sort_cached([("location", False), ("latency", True)]), n),
+        ("sort_latency_reposition_1pct", sort_reposition, len(moving)),
+        ("excel_merge", merge, n),
+        ("apply_result+stats", record_stats, n),
+        ("metrics_scrape", scrape, n),
+        ("save_devices", save, n),
+        ("load_devices", load, n),
+        ("sqlite_upsert_1pct", sqlite_upsert, len(dirty)),
+        ("sqlite_load", sqlite_load, n),
+    ]
+
+    if tk_root is not None:
+        from tkinter import ttk
+        from virtual_list import VirtualTree
+
+        tree = ttk.Treeview(tk_root, columns=[str(i) for i in range(15)], show="headings")
+        view = VirtualTree(tree, lambda d: d["ip"], make_row_values(stats), lambda d: (d["status"],))
+        page = [store[0:100], store[100:200]]
+
+        def refresh_page():
+            # sayfa değiştirme: 100 satırın tamamı farklı
+            page.reverse()
+            view.set_rows(page[0])
+            tk_root.update_idletasks()
+
+        cases.append(("refresh_device_list_page", refresh_page, 100))
+
+        vtree = ttk.Treeview(tk_root, columns=[str(i) for i in range(15)], show="headings")
+        vview = VirtualTree(vtree, lambda d: d["ip"], make_row_values(stats), lambda d: (d["status"],),
+                            virtual=True)
+
+        def refresh_virtual():
+            vview.set_rows(matches_no_search())
+            tk_root.update_idletasks()
+
+        cases.append(("refresh_device_list_virtual", refresh_virtual, n))
+
+    return cases
+
+
+def hidden_root():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:   # tkinter yok veya ekran yok
+        print(f"Tk kullanılamıyor, liste ölçümleri atlandı: {e}", file=sys.stderr)
+        return None
+    root.withdraw()
+    return root
+
+
+def run(sizes, min_time):
+    results = []
+    tk_root = hidden_root()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n in sizes:
+            for name, fn, items in cases_for(n, tmpdir, tk_root):
+                r = measure(fn, min_time)
+                r.update(name=name, size=n, items=items,
+                         items_per_sec=items / (r["best_ms"] / 1000) if r["best_ms"] else None)
+                results.append(r)
+                print(f"{name:>30} n={n:<7} best {r['best_ms']:9.3f} ms  "
+                      f"median {r['median_ms']:9.3f} ms", file=sys.stderr)
+    if tk_root is not None:
+        tk_root.destroy()
+    return {
+        "timestamp": datetime.now().astimezone().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Print ratios vs. a baseline run; return the list of regressions."""
+    old = {(r["name"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in current["results"]:
+        prev = old.get((r["name"], r["size"]))
+        if not prev or not prev.get("best_ms"):
+            continue
+        ratio = r["best_ms"] / prev["best_ms"]
+        flag = "  << YAVAŞLADI" if ratio > 1 + tolerance else ""
+        print(f"{r['name']:>30} n={r['size']:<7} x{ratio:5.2f}{flag}", file=sys.stderr)
+        if flag:
+            regressions.append({"name": r["name"], "size": r["size"], "ratio": ratio})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="saniye; vaka başına yaklaşık ölçüm süresi")
+    parser.add_argument("-o", "--output", help="JSON sonuç dosyası (yoksa stdout)")
+    parser.add_argument("--compare", help="önceki sonuç dosyası")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="izin verilen yavaşlama oranı (0.25 = %%25)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    report = run(sizes, args.min_time)
+
+    status = 0
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["regressions"] = compare(report, baseline, args.tolerance)
+        status = 1 if report["regressions"] else 0
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,159 +1,238 @@
-import json
-import os
-from openpyxl import load_workbook
-from openpyxl import load_workbook
-
-
-DEVICES_XLSX = "devices.xlsx"
-
-def load_devices_from_excel(path, mapping):
-    if not path or not os.path.exists(path):
-        raise ValueError("Excel dosya yolu geçersiz")
-
-    if not path.lower().endswith((".xlsx", ".xlsm", ".xltx", ".xltm")):
-        raise ValueError(f"Desteklenmeyen Excel formatı: {path}")
-
-def add_device_to_excel(device, excel_path, excel_mapping):
-    from openpyxl import load_workbook
-
-    wb = load_workbook(excel_path)
-    ws = wb.active
-
-    headers = [cell.value for cell in ws[1]]
-    header_index = {h: i for i, h in enumerate(headers)}
-
-    # boş bir satır hazırla
-    new_row = ["" for _ in headers]
-
-    for field, header in excel_mapping.items():
-        col_idx = header_index.get(header)
-        if col_idx is not None:
-            new_row[col_idx] = device.get(field, "")
-
-    ws.append(new_row)
-    wb.save(excel_path)
-
-
-
-
-
-def load_devices_from_excel(path, mapping):
-    devices = []
-
-    # 1️⃣ ÖNCE PANDAS DENE
-    try:
-        import pandas as pd
-
-        df = pd.read_excel(path)
-
-        for _, row in df.iterrows():
-            device = {}
-            for field, header in mapping.items():
-                device[field] = row.get(header)
-            devices.append(device)
-
-        return devices
-
-    except Exception:
-        pass   # pandas yoksa sessizce devam et
-
-    # 2️⃣ FALLBACK → OPENPYXL
-    from openpyxl import load_workbook
-
-    wb = load_workbook(path, data_only=True)
-    ws = wb.active
-
-    headers = [cell.value for cell in ws[1]]
-
-    header_index = {h: i for i, h in enumerate(headers)}
-
-    for row in ws.iter_rows(min_row=2, values_only=True):
-        device = {}
-
-        for field, header in mapping.items():
-            idx = header_index.get(header)
-            device[field] = row[idx] if idx is not None else None
-
-        devices.append(device)
-
-    return devices
-
-
-
-def update_device_in_excel(old_ip, updated_device, excel_path, mapping):
-    from openpyxl import load_workbook
-
-    if not os.path.exists(excel_path):
-        return
-
-    wb = load_workbook(excel_path)
-    ws = wb.active
-
-    # Excel başlıklarını al
-    headers = [cell.value for cell in ws[1]]
-    header_index = {h: i for i, h in enumerate(headers)}
-
-    # IP hangi kolonda?
-    ip_header = mapping.get("ip")
-    if ip_header not in header_index:
-        return
-
-    ip_col = header_index[ip_header] + 1  # 1-based index
-
-    for row in ws.iter_rows(min_row=2):
-        if str(row[ip_col - 1].value) == str(old_ip):
-
-            for field, header in mapping.items():
-                col_idx = header_index.get(header)
-                if col_idx is None:
-                    continue
-
-                row[col_idx].value = updated_device.get(field, "")
-
-            break
-
-    wb.save(excel_path)
-
-def save_devices(devices):
-    with open("devices.json", "w", encoding="utf-8") as f:
-        json.dump(devices, f, indent=2, ensure_ascii=False)
-
-
-def load_devices():
-    if not os.path.exists("devices.json"):
-        return []
-    with open("devices.json", "r", encoding="utf-8") as f:
-        return json.load(f)
-    
-
-
-
-def delete_device_from_excel(ip, excel_path, excel_mapping):
-    if not excel_path or not excel_mapping:
-        return
-
-    wb = load_workbook(excel_path)
-    ws = wb.active
-
-    ip_col_header = excel_mapping.get("ip")
-    if not ip_col_header:
-        return
-
-    # IP kolon index
-    ip_col_index = None
-    for col in range(1, ws.max_column + 1):
-        if ws.cell(row=1, column=col).value == ip_col_header:
-            ip_col_index = col
-            break
-
-    if not ip_col_index:
-        return
-
-    # IP eşleşen satırı bul ve sil
-    for row in range(2, ws.max_row + 1):
-        cell_value = ws.cell(row=row, column=ip_col_index).value
-        if str(cell_value).strip() == ip:
-            ws.delete_rows(row)
-            break
-
-    wb.save(excel_path)
\ No newline at end of file
+import json
+import math
+import os
+import tempfile
+import zipfile
+
+
+DEVICES_XLSX = "devices.xlsx"
+
+
+def normalize_cell(value):
+    """Turn one Excel cell into a JSON-safe value.
+
+    Blank / NaN → None, integral floats → int, text is stripped, dates and
+    anything else become strings so ``save_devices`` can always dump them.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, float):
+        if math.isnan(value) or math.isinf(value):
+            return None
+        return int(value) if value.is_integer() else value
+    if isinstance(value, int):
+        return value
+    if hasattr(value, "isoformat"):
+        return value.isoformat(sep=" ") if hasattr(value, "hour") else value.isoformat()
+    return str(value)
+
+
+def _load_workbook(path, **kwargs):
+    # openpyxl'in yüklenmesi ~150 ms sürer; sadece Excel gerçekten açılırken import edilir
+    from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    try:
+        return load_workbook(path, **kwargs)
+    except (OSError, EOFError, zipfile.BadZipFile, InvalidFileException, KeyError) as e:
+        raise ValueError(f"Excel okunamadı: {e}") from e
+
+
+def load_devices_from_excel(path, mapping):
+    """Stream the active sheet row by row into device dicts.
+
+    The workbook is opened ``read_only`` so rows are parsed lazily from the
+    XML instead of building every cell object up front; each row is a plain
+    tuple (``values_only``) and is normalized as it is read. Fully empty rows
+    are skipped. Unreadable files raise ``ValueError``.
+    """
+    if not path or not os.path.exists(path):
+        raise ValueError("Excel dosya yolu geçersiz")
+
+    if not path.lower().endswith((".xlsx", ".xlsm", ".xltx", ".xltm")):
+        raise ValueError(f"Desteklenmeyen Excel formatı: {path}")
+
+    wb = _load_workbook(path, read_only=True, data_only=True)
+    try:
+        return rows_to_devices(wb.active.iter_rows(values_only=True), mapping)
+    finally:
+        wb.close()
+
+
+def rows_to_devices(rows, mapping):
+    """Header row + value tuples → normalized device dicts (empty rows skipped)."""
+    rows = iter(rows)
+    headers = next(rows, None) or ()
+    header_index = {h: i for i, h in enumerate(headers) if h is not None}
+
+    # alan → kolon sırası; kolon yoksa None kalır
+    columns = [(field, header_index.get(header)) for field, header in mapping.items()]
+
+    devices = []
+    for row in rows:
+        device = {}
+        empty = True
+        width = len(row)
+        for field, idx in columns:
+            value = normalize_cell(row[idx]) if idx is not None and idx < width else None
+            if value is not None:
+                empty = False
+            device[field] = value
+        if not empty:
+            devices.append(device)
+    return devices
+
+
+def _open_for_edit(path):
+    if not path or not os.path.exists(path):
+        raise ValueError("Excel dosya yolu geçersiz")
+    return _load_workbook(path)
+
+
+def _save_workbook(wb, path):
+    # Excel'in yarım kalmış dosya görmemesi için geçici dosya + os.replace
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".~excel-", suffix=os.path.splitext(path)[1], dir=directory)
+    os.close(fd)
+    try:
+        wb.save(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _row_runs(rows_desc):
+    """Descending row numbers → (first_row, count) runs of consecutive rows."""
+    runs = []
+    for r in rows_desc:
+        if runs and runs[-1][0] == r + 1:
+            runs[-1][0] = r
+            runs[-1][1] += 1
+        else:
+            runs.append([r, 1])
+    return runs
+
+
+def apply_excel_changes(path, mapping, ops):
+    """Apply ``(op, key_ip, device)`` changes in one load → edit → save pass.
+
+    ``op`` is ``"add"``, ``"update"`` or ``"delete"``; ``key_ip`` is the IP
+    the row has in the file. Rows are located through one scan of the IP
+    column. Returns ``(conflicts, devices)``: ``conflicts`` lists
+    ``(op, key_ip, reason)`` for rows that were not where the app expected
+    them (the change is still applied as sensibly as possible), ``devices``
+    is the normalized content of the saved sheet (None if it has formulas).
+    """
+    wb = _open_for_edit(path)
+    ws = wb.active
+
+    headers = [cell.value for cell in ws[1]]
+    header_index = {h: i for i, h in enumerate(headers) if h is not None}
+    ip_col = header_index.get(mapping.get("ip"))
+    if ip_col is None:
+        raise ValueError("IP kolonu Excel'de bulunamadı")
+
+    row_of = {}
+    ip_cells = ws.iter_rows(min_row=2, min_col=ip_col + 1, max_col=ip_col + 1, values_only=True)
+    for r, (value,) in enumerate(ip_cells, start=2):
+        value = normalize_cell(value)
+        if value is not None:
+            row_of.setdefault(str(value), r)
+
+    columns = [(field, header_index[h]) for field, h in mapping.items() if h in header_index]
+    conflicts = []
+    deleted = []
+    appended = []
+
+    for op, key, device in ops:
+        row = row_of.get(key)
+        if op == "delete":
+            if row is None:
+                conflicts.append((op, key, "satır Excel'de yok"))
+            else:
+                deleted.append(row)
+                del row_of[key]
+            continue
+
+        if row is None:
+            if op == "update":
+                conflicts.append((op, key, "satır Excel'de yok, yeniden eklendi"))
+            appended.append(device)
+            continue
+
+        if op == "add":
+            conflicts.append((op, key, "IP Excel'de zaten var, satır güncellendi"))
+        for field, idx in columns:
+            ws.cell(row=row, column=idx + 1).value = device.get(field)
+
+    # alttan yukarı, ardışık satırları tek seferde sil
+    for first, count in _row_runs(sorted(set(deleted), reverse=True)):
+        ws.delete_rows(first, count)
+
+    for device in appended:
+        new_row = [None] * len(headers)
+        for field, idx in columns:
+            new_row[idx] = device.get(field)
+        ws.append(new_row)
+
+    _save_workbook(wb, path)
+
+    devices = rows_to_devices(ws.iter_rows(values_only=True), mapping)
+    # formül içeren sayfada hesaplanmış değerler elimizde yok → anlık görüntü verme
+    if any(isinstance(v, str) and v.startswith("=") for d in devices for v in d.values()):
+        devices = None
+    return conflicts, devices
+
+
+def add_device_to_excel(device, excel_path, excel_mapping):
+    apply_excel_changes(excel_path, excel_mapping, [("add", str(device.get("ip")), device)])
+
+
+def update_device_in_excel(old_ip, updated_device, excel_path, mapping):
+    if not os.path.exists(excel_path):
+        return
+    apply_excel_changes(excel_path, mapping, [("update", str(old_ip), updated_device)])
+
+
+DEVICES_JSON = "devices.json"
+
+def save_devices(devices, path=DEVICES_JSON, fsync=False):
+    # önce geçici dosyaya yaz, sonra tek adımda değiştir → yarım dosya kalmaz
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".devices-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(devices, f, ensure_ascii=False, separators=(",", ":"))
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_devices(path=DEVICES_JSON):
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        # eski dosyalarda kalmış NaN / Infinity → None
+        return json.load(f, parse_constant=lambda _: None)
+
+
+def delete_device_from_excel(ip, excel_path, excel_mapping):
+    if not excel_path or not excel_mapping:
+        return
+    apply_excel_changes(excel_path, excel_mapping, [("delete", str(ip).strip(), None)])
@@ -0,0 +1,269 @@
+import json
+import os
+import sqlite3
+import threading
+from urllib.request import pathname2url
+
+from device_loader import DEVICES_JSON, load_devices, save_devices
+
+DEVICES_DB = "devices.db"
+
+DEFAULT_STORAGE_SETTINGS = {
+    "backend": "sqlite",     # "sqlite" | "json"
+    "path": None,            # None → devices.db / devices.json
+    "page_size": 5000,       # açılışta bir sorguda okunan cihaz sayısı
+    "busy_timeout": 5.0,     # saniye; başka bir örnek yazarken bekleme süresi
+}
+
+# sorgulanabilir kolonlar; cihazın tamamı ``data`` içinde JSON olarak durur
+INDEXED_FIELDS = ("status", "location", "unit")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    ip       TEXT PRIMARY KEY,
+    pos      INTEGER NOT NULL,
+    status   TEXT,
+    location TEXT,
+    unit     TEXT,
+    data     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS devices_pos ON devices (pos);
+CREATE INDEX IF NOT EXISTS devices_status ON devices (status);
+CREATE INDEX IF NOT EXISTS devices_location ON devices (location);
+CREATE INDEX IF NOT EXISTS devices_unit ON devices (unit);
+"""
+
+_UPSERT = """
+INSERT INTO devices (ip, pos, status, location, unit, data) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (ip) DO UPDATE SET
+    pos = excluded.pos, status = excluded.status, location = excluded.location,
+    unit = excluded.unit, data = excluded.data
+"""
+
+# durum / ölçüm güncellemesinde sıra korunur
+_UPSERT_KEEP_POS = _UPSERT.replace("pos = excluded.pos, ", "")
+
+
+def _text(value):
+    return None if value is None else str(value)
+
+
+def _row(device, pos):
+    return (str(device["ip"]), pos, _text(device.get("status")), _text(device.get("location")),
+            _text(device.get("unit")),
+            json.dumps(device, ensure_ascii=False, separators=(",", ":")))
+
+
+class JsonDeviceStorage:
+    """The original ``devices.json`` file: every save rewrites the whole list."""
+
+    partial = False
+
+    def __init__(self, path=DEVICES_JSON, fsync=False, page_size=5000):
+        self.path = path
+        self.fsync = fsync
+        self.page_size = max(1, int(page_size))
+
+    def load(self):
+        return load_devices(self.path)
+
+    def iter_pages(self, page_size=None):
+        page_size = page_size or self.page_size
+        devices = self.load()
+        for i in range(0, len(devices), page_size):
+            yield devices[i:i + page_size]
+
+    def save(self, devices, ips=None):
+        """``ips`` is ignored: a JSON file can only be written as a whole."""
+        save_devices(devices, self.path, fsync=self.fsync)
+
+    def close(self):
+        pass
+
+
+class SqliteDeviceStorage:
+    """Device state in an SQLite database (WAL), one row per IP.
+
+    The full device dict is stored as JSON in ``data``; ``status``,
+    ``location`` and ``unit`` are copied to indexed columns and ``pos`` keeps
+    the list order. ``save(devices, ips)`` upserts only the given devices in
+    one transaction, so a flush after a few results touches a few rows
+    instead of rewriting the file, and two app instances sharing the
+    database only overwrite the devices they changed. A full ``save``
+    (``ips=None``) also deletes rows that are no longer in the list, but only
+    rows this instance has read or written: a device another instance added
+    in the meantime is never deleted by a list that simply hasn't seen it.
+
+    Devices are keyed by IP: rows without an IP are not stored and, like
+    ``DeviceStore.get``, the first device of a duplicated IP wins.
+
+    ``read_only=True`` opens an existing database without creating or
+    changing anything (no schema, no WAL switch); saving then raises
+    ``sqlite3.OperationalError``.
+    """
+
+    partial = True
+
+    def __init__(self, path=DEVICES_DB, fsync=False, busy_timeout=5.0, page_size=5000,
+                 read_only=False):
+        self.path = path
+        self.page_size = max(1, int(page_size))
+        self._lock = threading.Lock()
+        # okunan / yazılan IP'ler: tam kayıt sadece bunlardan eksik olanları siler
+        self._known = set()
+        if read_only:
+            uri = "file:" + pathname2url(os.path.abspath(path)) + "?mode=ro"
+            self._conn = sqlite3.connect(uri, uri=True, timeout=float(busy_timeout),
+                                         check_same_thread=False, isolation_level=None)
+            return
+        # persister iş parçacığı ve Tk thread'i aynı bağlantıyı kilitle paylaşır
+        self._conn = sqlite3.connect(path, timeout=float(busy_timeout), check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={'FULL' if fsync else 'NORMAL'}")
+        self._conn.executescript(_SCHEMA)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM devices").fetchone()[0]
+
+    def iter_pages(self, page_size=None):
+        """Devices in list order, ``page_size`` rows per query (keyset paging)."""
+        page_size = page_size or self.page_size
+        last = -1
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT pos, data FROM devices WHERE pos > ? ORDER BY pos LIMIT ?",
+                    (last, page_size),
+                ).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            page = [json.loads(data) for _, data in rows]
+            with self._lock:
+                self._known.update(str(d["ip"]) for d in page)
+            yield page
+
+    def load(self):
+        devices = []
+        for page in self.iter_pages():
+            devices.extend(page)
+        return devices
+
+    def select(self, **where):
+        """Devices matching ``field=value`` on the indexed columns."""
+        unknown = set(where) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"İndekssiz alan: {', '.join(sorted(unknown))}")
+        sql = "SELECT data FROM devices"
+        if where:
+            sql += " WHERE " + " AND ".join(f"{field} = ?" for field in where)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY pos", [_text(v) for v in where.values()])
+            devices = [json.loads(data) for (data,) in rows]
+            self._known.update(str(d["ip"]) for d in devices)
+            return devices
+
+    def save(self, devices, ips=None):
+        """Upsert ``devices`` in one transaction.
+
+        With ``ips`` (the dirty set) only those devices are written and IPs
+        missing from ``devices`` are deleted; list positions of existing rows
+        are kept. Without it ``devices`` is the whole list as this instance
+        knows it: known rows missing from it are deleted, others are kept.
+        """
+        rows = []
+        seen = set()
+        if ips is None:
+            for pos, d in enumerate(devices):
+                ip = d.get("ip")
+                if ip is None or ip in seen:
+                    continue
+                seen.add(ip)
+                rows.append(_row(d, pos))
+        else:
+            for d in devices:
+                ip = d.get("ip")
+                if ip is None or ip in seen:
+                    continue
+                seen.add(ip)
+                rows.append(_row(d, 0))
+
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if ips is None:
+                    conn.executemany(_UPSERT, rows)
+                    kept = {r[0] for r in rows}
+                    gone = [(ip,) for ip in self._known if ip not in kept]
+                    if gone:
+                        conn.executemany("DELETE FROM devices WHERE ip = ?", gone)
+                else:
+                    # yeni eklenen satırlar listenin sonuna
+                    end = conn.execute("SELECT COALESCE(MAX(pos), -1) + 1 FROM devices").fetchone()[0]
+                    rows = [r[:1] + (end + i,) + r[2:] for i, r in enumerate(rows)]
+                    conn.executemany(_UPSERT_KEEP_POS, rows)
+                    gone = [(str(ip),) for ip in ips if str(ip) not in seen]
+                    if gone:
+                        conn.executemany("DELETE FROM devices WHERE ip = ?", gone)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            self._known.difference_update(ip for (ip,) in gone)
+            self._known.update(r[0] for r in rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def import_json(storage, path=DEVICES_JSON):
+    """Replace the stored list with a ``devices.json`` file; returns the count."""
+    devices = load_devices(path)
+    # tam kayıt sadece bilinen satırları siler; içe aktarma hepsinin yerine geçer
+    storage.load()
+    storage.save(devices)
+    return len(devices)
+
+
+def export_json(storage, path=DEVICES_JSON):
+    """Write the stored list in the ``devices.json`` format; returns the count."""
+    devices = storage.load()
+    save_devices(devices, path)
+    return len(devices)
+
+
+def open_storage(settings=None, fsync=False, read_only=False):
+    """Storage backend from config ``"storage"``.
+
+    A new SQLite database is filled once from the ``devices.json`` next to
+    it, so upgrading keeps the saved ping state. With ``read_only`` nothing
+    is created or migrated: a missing / empty database is read from that
+    ``devices.json`` instead, and the caller must not save.
+    """
+    cfg = dict(DEFAULT_STORAGE_SETTINGS)
+    cfg.update(settings or {})
+    if cfg["backend"] == "json":
+        return JsonDeviceStorage(cfg["path"] or DEVICES_JSON, fsync, cfg["page_size"])
+    if cfg["backend"] != "sqlite":
+        raise ValueError(f"Bilinmeyen storage.backend: {cfg['backend']}")
+
+    path = cfg["path"] or DEVICES_DB
+    # eski kayıt veritabanıyla aynı klasörde aranır, çalışma dizininde değil
+    legacy = os.path.join(os.path.dirname(os.path.abspath(path)), DEVICES_JSON)
+    if read_only:
+        if os.path.exists(path):
+            storage = SqliteDeviceStorage(path, busy_timeout=cfg["busy_timeout"],
+                                          page_size=cfg["page_size"], read_only=True)
+            if len(storage) or not os.path.exists(legacy):
+                return storage
+            storage.close()
+        return JsonDeviceStorage(legacy, page_size=cfg["page_size"])
+
+    storage = SqliteDeviceStorage(path, fsync, cfg["busy_timeout"], cfg["page_size"])
+    if not len(storage) and os.path.exists(legacy):
+        import_json(storage, legacy)
+    return storage
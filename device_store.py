@@ -0,0 +1,112 @@
+class DeviceStore(list):
+    """The device list plus an ip → device index.
+
+    It is still a plain list for iteration, sorting, slicing and JSON dumps,
+    so existing ``for d in devices`` code keeps working. Changes that touch IPs
+    must go through ``reset`` / ``add`` / ``remove`` / ``change_ip`` so that
+    ``get`` stays O(1). When the Excel sheet contains the same IP twice, the
+    first device wins, which matches the old ``next(...)`` scans.
+
+    Secondary indexes (search, filters) register with ``subscribe`` and get
+    ``reset(devices)`` / ``add(device)`` / ``remove(device)`` /
+    ``update(device)`` calls for every change made through the store.
+    Listeners that keep state per IP may also define ``change_ip(device,
+    old_ip)``; it is called when an edit moved the last device off
+    ``old_ip``, so that state can be dropped.
+    """
+
+    def __init__(self, devices=()):
+        super().__init__()
+        self._by_ip = {}
+        self._counts = {}
+        self._listeners = []
+        self.reset(devices)
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+        listener.reset(self)
+
+    # ---- index ----
+    def _index(self, device):
+        ip = device.get("ip")
+        self._counts[ip] = self._counts.get(ip, 0) + 1
+        self._by_ip.setdefault(ip, device)
+
+    def _unindex(self, device, ip):
+        count = self._counts.get(ip, 0) - 1
+        if count <= 0:
+            self._counts.pop(ip, None)
+            self._by_ip.pop(ip, None)
+            return
+
+        self._counts[ip] = count
+        if self._by_ip.get(ip) is device:
+            # aynı IP'li başka bir cihaz var → onu öne al (sadece kopyalarda O(n))
+            self._by_ip[ip] = next(d for d in self if d is not device and d.get("ip") == ip)
+
+    # ---- lookups ----
+    def get(self, ip, default=None):
+        return self._by_ip.get(ip, default)
+
+    def has_ip(self, ip, exclude_device=None):
+        count = self._counts.get(ip, 0)
+        if exclude_device is not None and exclude_device.get("ip") == ip:
+            count -= 1
+        return count > 0
+
+    def ips(self):
+        return self._by_ip.keys()
+
+    # ---- mutations ----
+    def reset(self, devices):
+        """Replace the whole list (Excel reload / startup merge)."""
+        self[:] = devices
+        self._by_ip = {}
+        self._counts = {}
+        for d in self:
+            self._index(d)
+        for listener in self._listeners:
+            listener.reset(self)
+
+    def add(self, device):
+        self.append(device)
+        self._index(device)
+        for listener in self._listeners:
+            listener.add(device)
+
+    def remove_device(self, device):
+        for i, d in enumerate(self):
+            if d is device:
+                del self[i]
+                self._unindex(device, device.get("ip"))
+                for listener in self._listeners:
+                    listener.remove(device)
+                return True
+        return False
+
+    def remove_ip(self, ip):
+        device = self._by_ip.get(ip)
+        if device is None:
+            return None
+        self.remove_device(device)
+        return device
+
+    def change_ip(self, device, old_ip):
+        """Re-key a device whose ``ip`` field was edited in place."""
+        if old_ip == device.get("ip"):
+            return
+        self._unindex(device, old_ip)
+        self._index(device)
+        if self.has_ip(old_ip):
+            return
+        for listener in self._listeners:
+            rekey = getattr(listener, "change_ip", None)
+            if rekey is not None:
+                rekey(device, old_ip)
+
+    def updated(self, device, old_ip=None):
+        """Call after editing a device's fields in place."""
+        if old_ip is not None:
+            self.change_ip(device, old_ip)
+        for listener in self._listeners:
+            listener.update(device)
@@ -0,0 +1,249 @@
+import bisect
+import ipaddress
+import re
+import threading
+import time
+
+import ping_engine
+from sweep_control import SweepController
+
+DEFAULT_DISCOVERY_SETTINGS = {
+    "timeout": 1.0,            # saniye; keşifte çoğu adres boş, uzun beklemeye gerek yok
+    "max_addresses": 1 << 20,  # tek taramada en fazla adres (/12)
+    "max_rate": 2000,
+    "max_in_flight": 2000,
+    "initial_in_flight": 256,
+}
+
+_SPLIT_RE = re.compile(r"[\s,;]+")
+
+
+def parse_targets(spec, max_addresses=DEFAULT_DISCOVERY_SETTINGS["max_addresses"]):
+    """``"10.0.0.0/22, 10.1.0.1-10.1.0.200 10.2.0.1-254"`` → sorted ``(version, first, last)``.
+
+    Accepts CIDR blocks (network / broadcast excluded like
+    ``ip_network().hosts()``), ``a-b`` ranges where ``b`` may be the last
+    octet only, and single addresses. Overlaps are merged. Raises
+    ``ValueError`` for bad input or more than ``max_addresses`` addresses.
+    """
+    ranges = []
+    for item in _SPLIT_RE.split(spec.strip()):
+        if not item:
+            continue
+        try:
+            if "/" in item:
+                net = ipaddress.ip_network(item, strict=False)
+                first, last = int(net.network_address), int(net.broadcast_address)
+                if net.version == 4 and net.prefixlen < 31 or net.version == 6 and net.prefixlen < 127:
+                    first += 1
+                    if net.version == 4:
+                        last -= 1
+            elif "-" in item:
+                a, b = item.split("-", 1)
+                start = ipaddress.ip_address(a.strip())
+                b = b.strip()
+                if start.version == 4 and "." not in b:
+                    b = a.rsplit(".", 1)[0] + "." + b
+                end = ipaddress.ip_address(b)
+                if end.version != start.version:
+                    raise ValueError
+                first, last = int(start), int(end)
+            else:
+                first = last = int(ipaddress.ip_address(item))
+        except ValueError:
+            raise ValueError(f"Geçersiz adres / aralık: {item}")
+        if last < first:
+            raise ValueError(f"Aralık ters: {item}")
+        version = 6 if ":" in item else 4
+        ranges.append((version, first, last))
+
+    ranges.sort()
+    merged = []
+    for version, first, last in ranges:
+        if merged and merged[-1][0] == version and first <= merged[-1][2] + 1:
+            merged[-1][2] = max(merged[-1][2], last)
+        else:
+            merged.append([version, first, last])
+
+    total = sum(last - first + 1 for _, first, last in merged)
+    if not total:
+        raise ValueError("Taranacak adres yok")
+    if total > max_addresses:
+        raise ValueError(f"{total} adres, en fazla {max_addresses} taranabilir")
+    return [tuple(r) for r in merged]
+
+
+class AddressSpace:
+    """Ordered set of addresses over a few ranges, without listing them.
+
+    Every address has a dense index (0 … ``len - 1``) that is used as its
+    bit position in ``LivenessBitmap``.
+    """
+
+    def __init__(self, ranges):
+        self.ranges = list(ranges)
+        self._offsets = []
+        self._lookup = {}   # sürüm → (aralık başları, aralık sırası); v4 ve v6 ayrı sıralı
+        total = 0
+        for pos, (version, first, last) in enumerate(self.ranges):
+            self._offsets.append(total)
+            firsts, positions = self._lookup.setdefault(version, ([], []))
+            firsts.append(first)
+            positions.append(pos)
+            total += last - first + 1
+        self._len = total
+
+    @classmethod
+    def parse(cls, spec, max_addresses=DEFAULT_DISCOVERY_SETTINGS["max_addresses"]):
+        return cls(parse_targets(spec, max_addresses))
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for version, first, last in self.ranges:
+            make = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+            for value in range(first, last + 1):
+                yield str(make(value))
+
+    def index(self, ip):
+        """Bit position of ``ip``, or None when it is outside the space."""
+        try:
+            addr = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        value = int(addr)
+        firsts, positions = self._lookup.get(addr.version, ((), ()))
+        i = bisect.bisect_right(firsts, value) - 1
+        if i < 0:
+            return None
+        pos = positions[i]
+        _, first, last = self.ranges[pos]
+        if value > last:
+            return None
+        return self._offsets[pos] + value - first
+
+    def address(self, index):
+        pos = bisect.bisect_right(self._offsets, index) - 1
+        version, first, _ = self.ranges[pos]
+        make = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+        return str(make(first + index - self._offsets[pos]))
+
+    def __contains__(self, ip):
+        return self.index(ip) is not None
+
+
+class LivenessBitmap:
+    """One bit per address in an ``AddressSpace`` (a /16 is 8 KiB)."""
+
+    def __init__(self, size):
+        self.size = size
+        self.bits = bytearray((size + 7) // 8)
+
+    def set(self, index):
+        self.bits[index >> 3] |= 1 << (index & 7)
+
+    def __contains__(self, index):
+        return bool(self.bits[index >> 3] >> (index & 7) & 1)
+
+    def count(self):
+        return int.from_bytes(self.bits, "little").bit_count()
+
+    def indexes(self):
+        """Positions of the set bits in order; empty bytes are skipped."""
+        for byte_no, byte in enumerate(self.bits):
+            if byte:
+                base = byte_no << 3
+                for bit in range(8):
+                    if byte >> bit & 1:
+                        yield base + bit
+
+
+class DiscoverySweep:
+    """Probe every address of an ``AddressSpace`` once.
+
+    Addresses are produced lazily by the space and pulled by the probe
+    workers (``ping_engine.ping_many`` with a ``SweepController``), so memory
+    is the bitmap plus the RTT of the live hosts, whatever the range size.
+    ``run()`` may be called on a worker thread; ``done`` / ``alive`` can be
+    read from the Tk thread for progress and ``stop()`` ends it early.
+    """
+
+    def __init__(self, space, settings=None):
+        cfg = dict(DEFAULT_DISCOVERY_SETTINGS)
+        cfg.update(settings or {})
+        self.space = space
+        self.timeout = float(cfg["timeout"])
+        self.controller = SweepController(**cfg)
+        self.live = LivenessBitmap(len(space))
+        self.rtt = {}               # indeks → ms, sadece yanıt verenler
+        self.done = 0
+        self.started_at = None
+        self.finished_at = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self):
+        return len(self.rtt)
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def stop(self):
+        self._stop.set()
+
+    def _addresses(self):
+        for ip in self.space:
+            if self._stop.is_set():
+                return
+            yield ip
+
+    def _on_result(self, ip, ms):
+        index = self.space.index(ip)
+        with self._lock:
+            self.done += 1
+            if ms is not None and index is not None:
+                self.live.set(index)
+                self.rtt[index] = ms
+
+    def run(self):
+        self.started_at = time.monotonic()
+        try:
+            ping_engine.ping_many(self._addresses(), self._on_result, timeout=self.timeout,
+                                  controller=self.controller)
+        finally:
+            self.controller.finish()
+            self.finished_at = time.monotonic()
+        return self
+
+    def live_hosts(self):
+        """``(ip, ms)`` of every address that answered, in address order."""
+        for index in self.live.indexes():
+            yield self.space.address(index), self.rtt.get(index)
+
+    def diff(self, devices):
+        """Reconcile with the inventory (anything with ``get(ip)`` and iteration).
+
+        Returns ``{"unknown": [(ip, ms)], "never_alive": [device], "outside": n}``:
+        live hosts missing from the inventory, inventory devices inside the
+        swept range that never answered, and how many inventory devices lie
+        outside the range. Only meaningful after a complete run.
+        """
+        unknown = [(ip, ms) for ip, ms in self.live_hosts() if devices.get(ip) is None]
+        never_alive = []
+        outside = 0
+        for d in devices:
+            index = self.space.index(d.get("ip"))
+            if index is None:
+                outside += 1
+            elif index not in self.live:
+                never_alive.append(d)
+        return {"unknown": unknown, "never_alive": never_alive, "outside": outside}
+
+    def stats(self):
+        stats = self.controller.stats()
+        stats.update(addresses=len(self.space), probed=self.done, alive=self.alive,
+                     stopped=self.stopped)
+        return stats
@@ -0,0 +1,196 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from device_loader import apply_excel_changes
+
+DEFAULT_JOURNAL_SETTINGS = {
+    "delay": 1.0,        # saniye; ilk değişiklikten sonra toplu yazmadan önce beklenen süre
+    "retry": 10.0,       # dosya kilitliyse (Excel'de açık) tekrar deneme aralığı
+}
+
+# Excel'de yazılacak alanlar (ping durumu yazılmaz)
+DEVICE_FIELDS = ("name", "ip", "device", "model", "mac", "location", "unit", "description")
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class ExcelJournal:
+    """Queue of workbook edits, applied in one pass on a background thread.
+
+    The Tk thread updates the in-memory store itself and only records
+    ``add`` / ``update`` / ``delete`` here. Changes are coalesced per row
+    (keyed by the IP the row has *in the file*): add + update stays an add,
+    add + delete cancels out, an IP change follows the row. After ``delay``
+    the worker loads the workbook once, applies everything with
+    ``apply_excel_changes`` and saves it once.
+
+    ``mark_synced`` records the file stamp the app last read; if the file
+    has a different stamp when the batch is written, someone edited it
+    outside the app. The batch is still applied row by row on top of their
+    version and the result reports ``external=True`` with the merged sheet,
+    so the UI can adopt it. Locked files (open in Excel on Windows) keep the
+    batch pending and are retried.
+
+    ``get_target`` returns ``(excel_path, mapping)`` at flush time;
+    ``on_result`` gets a dict (from the worker thread) after every attempt.
+    """
+
+    def __init__(self, get_target, on_result=None, cache=None, delay=1.0, retry=10.0,
+                 apply=apply_excel_changes):
+        self.get_target = get_target
+        self.on_result = on_result
+        self.cache = cache
+        self.delay = max(0.0, float(delay))
+        self.retry = max(0.5, float(retry))
+        self._apply = apply
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending = OrderedDict()   # dosyadaki IP → (op, device kopyası)
+        self._alias = {}                # güncel IP → dosyadaki IP
+        self._stamp = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="excel-journal", daemon=True)
+
+        self.batches = 0
+        self.last_error = None
+        self.last_batch_seconds = 0.0
+
+    @classmethod
+    def from_settings(cls, get_target, settings=None, on_result=None, cache=None):
+        cfg = dict(DEFAULT_JOURNAL_SETTINGS)
+        cfg.update(settings or {})
+        return cls(get_target, on_result, cache, cfg["delay"], cfg["retry"])
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    # ---------------- kayıt ----------------
+    @staticmethod
+    def _snapshot(device):
+        return {k: device.get(k) for k in DEVICE_FIELDS}
+
+    def add(self, device):
+        key = str(device.get("ip"))
+        with self._lock:
+            old = self._pending.get(key)
+            # silinip aynı IP ile yeniden eklendi → satırı güncelle
+            op = "update" if old and old[0] in ("delete", "update") else "add"
+            self._pending[key] = (op, self._snapshot(device))
+        self._wake.set()
+
+    def update(self, old_ip, device):
+        new_ip = str(device.get("ip"))
+        with self._lock:
+            key = self._alias.pop(str(old_ip), str(old_ip))
+            old = self._pending.get(key)
+            op = "add" if old and old[0] == "add" else "update"
+            self._pending[key] = (op, self._snapshot(device))
+            if new_ip != key:
+                self._alias[new_ip] = key
+        self._wake.set()
+
+    def delete(self, ip):
+        with self._lock:
+            key = self._alias.pop(str(ip), str(ip))
+            old = self._pending.get(key)
+            if old and old[0] == "add":
+                del self._pending[key]   # dosyaya hiç yazılmadı
+            else:
+                self._pending[key] = ("delete", None)
+        self._wake.set()
+
+    def mark_synced(self, path):
+        """Remember the stamp of the file content the app currently shows."""
+        self._stamp = _file_stamp(path)
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    # ---------------- yazma ----------------
+    def flush(self):
+        """Write pending changes now. Safe to call from any thread."""
+        with self._write_lock:
+            with self._lock:
+                if not self._pending:
+                    return None
+                batch = self._pending
+                aliases = self._alias
+                self._pending = OrderedDict()
+                self._alias = {}
+
+            path, mapping = self.get_target()
+            result = {"ops": len(batch), "conflicts": [], "external": False,
+                      "devices": None, "error": None}
+
+            if not path or not mapping:
+                result["error"] = "Excel seçilmemiş veya kolon eşleştirmesi yok"
+                self._report(result)
+                return result
+
+            started = time.perf_counter()
+            ops = [(op, key, device) for key, (op, device) in batch.items()]
+            external = self._stamp is not None and _file_stamp(path) != self._stamp
+            try:
+                conflicts, sheet = self._apply(path, mapping, ops)
+            except (OSError, ValueError) as e:
+                # kilitli / okunamadı → geri koy (araya yeni kayıt girdiyse o kazanır)
+                self.last_error = e
+                with self._lock:
+                    for key, entry in batch.items():
+                        self._pending.setdefault(key, entry)
+                    for ip, key in aliases.items():
+                        self._alias.setdefault(ip, key)
+                result["error"] = str(e)
+                self._report(result)
+                return result
+
+            self._stamp = _file_stamp(path)
+            if self.cache is not None and sheet is not None:
+                try:
+                    self.cache.store(path, mapping, sheet)
+                except OSError:
+                    pass
+
+            self.last_error = None
+            self.batches += 1
+            self.last_batch_seconds = time.perf_counter() - started
+            result.update(conflicts=conflicts, external=external, devices=sheet)
+            self._report(result)
+            return result
+
+    def _report(self, result):
+        if self.on_result is not None:
+            self.on_result(result)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            # kısa bir süre bekle → art arda gelen düzenlemeler tek yazmada birleşir
+            if self._stop.wait(self.delay):
+                return
+            self._wake.clear()
+            result = self.flush()
+            if result and result["error"] and self._pending:
+                if self._stop.wait(self.retry):
+                    return
+                self._wake.set()
+
+    def close(self):
+        """Stop the worker and write whatever is still pending."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=5)
+        return self.flush()
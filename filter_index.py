@@ -0,0 +1,217 @@
+# bir değer envanterin 1/DENSE_DIVISOR'ından fazlasını kapsarsa küme → int bitmap
+DENSE_DIVISOR = 256
+DENSE_MIN = 64
+
+# silinen doküman oranı bunu geçince indeks yeniden kurulur
+COMPACT_RATIO = 0.5
+
+
+def filter_value(value):
+    """Values are compared as the strings the filter popup shows."""
+    return "" if value is None else str(value)
+
+
+def bits_from_positions(positions, size):
+    """Build an int bitset from doc ids in one pass (bytearray → int)."""
+    buf = bytearray((size >> 3) + 1)
+    for p in positions:
+        buf[p >> 3] |= 1 << (p & 7)
+    return int.from_bytes(buf, "little")
+
+
+def positions_from_bits(bits):
+    out = []
+    data = bits.to_bytes((bits.bit_length() >> 3) + 1, "little")
+    for i, byte in enumerate(data):
+        if byte:
+            base = i << 3
+            for j in range(8):
+                if byte >> j & 1:
+                    out.append(base + j)
+    return out
+
+
+class FilterIndex:
+    """Per-field inverted index for the column filters: value → doc ids.
+
+    Rare values keep their doc ids in a plain ``set``; once a value covers
+    more than ``1 / DENSE_DIVISOR`` of the inventory it becomes an ``int``
+    bitset. A unique column like ``ip`` therefore costs one tiny set per
+    device, while ``location`` / ``unit`` cost a few dense bitmaps.
+    Selected values of one field are ORed, fields are ANDed, and the facet
+    counts of the filter popup are popcounts against the other fields.
+
+    Doc ids are stable per device object (not list positions), so sorting
+    changes nothing. It is a ``DeviceStore`` listener and, like the search
+    index, is built lazily the first time a filter is actually used.
+    """
+
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self.filters = {}
+        self.reset(())
+
+    # ---- DeviceStore listener ----
+    def reset(self, devices):
+        self._source = devices
+        self._built = False
+        self._allowed = None
+
+    def add(self, device):
+        if not self._built:
+            return
+        doc = self._add(device)
+        if self._allowed is not None and self._passes(doc):
+            self._allowed.add(doc)
+
+    def remove(self, device):
+        if not self._built:
+            return
+        doc = self._doc_of.pop(id(device), None)
+        if doc is None:
+            return
+        for values, key in zip(self._index.values(), self._keys[doc]):
+            bucket = values.get(key)
+            if bucket is None:
+                continue
+            if isinstance(bucket, int):
+                bucket &= ~(1 << doc)
+                values[key] = bucket
+            else:
+                bucket.discard(doc)
+            if not bucket:
+                del values[key]
+        self._docs[doc] = None
+        self._keys[doc] = None
+        self._dead += 1
+        if self._allowed is not None:
+            self._allowed.discard(doc)
+        if self._dead > COMPACT_RATIO * len(self._docs):
+            self._build([d for d in self._docs if d is not None])
+
+    def update(self, device):
+        self.remove(device)
+        self.add(device)
+
+    # ---- internals ----
+    def _build(self, devices):
+        self._docs = []          # doc id → device (silinmişse None)
+        self._keys = []          # doc id → alan değerleri (silmek için)
+        self._doc_of = {}        # id(device) → doc id
+        self._index = {f: {} for f in self.fields}
+        self._dead = 0
+        for d in devices:
+            self._add(d)
+        self._built = True
+
+        size = len(self._docs)
+        threshold = max(DENSE_MIN, size // DENSE_DIVISOR)
+        for values in self._index.values():
+            for key, bucket in values.items():
+                if len(bucket) > threshold:
+                    values[key] = bits_from_positions(bucket, size)
+        self._refresh_allowed()
+
+    def _ensure_built(self):
+        if not self._built:
+            self._build(self._source)
+
+    def _refresh_allowed(self):
+        self._allowed = None
+        if self.filters and self._built:
+            self._allowed = set(positions_from_bits(self._combined_bits(self.filters)))
+
+    def _add(self, device):
+        doc = len(self._docs)
+        keys = tuple(filter_value(device.get(f)) for f in self.fields)
+        self._docs.append(device)
+        self._keys.append(keys)
+        self._doc_of[id(device)] = doc
+        for values, key in zip(self._index.values(), keys):
+            bucket = values.get(key)
+            if bucket is None:
+                values[key] = {doc}
+            elif isinstance(bucket, int):
+                values[key] = bucket | (1 << doc)
+            else:
+                bucket.add(doc)
+        return doc
+
+    def _passes(self, doc):
+        keys = dict(zip(self.fields, self._keys[doc]))
+        return all(keys.get(f) in selected for f, selected in self.filters.items())
+
+    def _field_bits(self, field, selected):
+        """OR of the selected values of one field, as an int bitset."""
+        values = self._index[field]
+        bits = 0
+        sparse = []
+        for v in selected:
+            bucket = values.get(filter_value(v))
+            if bucket is None:
+                continue
+            if isinstance(bucket, int):
+                bits |= bucket
+            else:
+                sparse.extend(bucket)
+        if sparse:
+            bits |= bits_from_positions(sparse, len(self._docs))
+        return bits
+
+    def _combined_bits(self, active_filters, skip_field=None):
+        """AND of every active field filter; None when nothing filters."""
+        result = None
+        for field, selected in active_filters.items():
+            if not selected or field == skip_field or field not in self._index:
+                continue
+            bits = self._field_bits(field, selected)
+            result = bits if result is None else result & bits
+        return result
+
+    # ---- queries ----
+    def set_filters(self, active_filters):
+        """Snapshot the checkbox filters; call whenever they change."""
+        self.filters = {
+            f: {filter_value(v) for v in selected}
+            for f, selected in active_filters.items()
+            if selected and f in self.fields
+        }
+        self._refresh_allowed()
+
+    def matches(self, device):
+        """True if the device passes every active field filter."""
+        if not self.filters:
+            return True
+        self._ensure_built()
+        return self._doc_of.get(id(device)) in self._allowed
+
+    def facet_counts(self, field, active_filters):
+        """Non-empty value → devices it would show, given the *other* filters.
+
+        The field's own selection is ignored, so the counts read like a
+        spreadsheet auto-filter.
+        """
+        self._ensure_built()
+        values = self._index.get(field, {})
+        others = self._combined_bits(active_filters, skip_field=field)
+        counts = {}
+
+        if others is None:
+            for key, bucket in values.items():
+                if key:
+                    counts[key] = bucket.bit_count() if isinstance(bucket, int) else len(bucket)
+            return counts
+
+        others_bytes = others.to_bytes((others.bit_length() >> 3) + 1, "little")
+        limit = len(others_bytes) << 3
+        for key, bucket in values.items():
+            if not key:
+                continue
+            if isinstance(bucket, int):
+                counts[key] = (bucket & others).bit_count()
+            else:
+                counts[key] = sum(
+                    1 for p in bucket
+                    if p < limit and others_bytes[p >> 3] >> (p & 7) & 1
+                )
+        return counts
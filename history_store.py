@@ -0,0 +1,269 @@
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+
+# (timestamp, device id, rtt ms, status) → 20 bayt sabit genişlikte kayıt
+RECORD = struct.Struct("<dIfB3x")
+
+STATUS_CODES = ["UNKNOWN", "FAST", "NORMAL", "SLOW", "VERY_SLOW", "DOWN"]
+STATUS_TO_CODE = {s: i for i, s in enumerate(STATUS_CODES)}
+
+DEFAULT_HISTORY_SETTINGS = {
+    "dir": "history",
+    "segment_mb": 16,       # bir segment dosyasının en büyük boyutu
+    "max_segments": 32,     # diskte tutulacak en fazla segment (eskiler silinir)
+    "flush_records": 4096,  # tampon bu kadar kayda ulaşınca diske yaz
+    "flush_seconds": 2.0,
+    "lookback_days": 7,     # detay penceresindeki "Son DOWN" en fazla bu kadar geriye bakar
+}
+
+SEGMENT_PREFIX = "seg-"
+SEGMENT_SUFFIX = ".bin"
+DEVICE_INDEX = "devices.txt"
+
+
+class HistoryStore:
+    """Append-only latency log split into fixed-size, rotating segment files.
+
+    Every probe result becomes one ``RECORD`` in the newest segment. IPs are
+    mapped to small integer ids through ``devices.txt`` (one IP per line,
+    line number = id), so records stay fixed width. Queries memory-map the
+    segments and binary-search the timestamp column, which is monotonic
+    because records are only ever appended.
+    """
+
+    def __init__(self, directory="history", segment_mb=16, max_segments=32,
+                 flush_records=4096, flush_seconds=2.0, lookback_days=7):
+        self.directory = directory
+        self.segment_bytes = max(1, int(segment_mb * 1024 * 1024)) // RECORD.size * RECORD.size
+        self.max_segments = max(1, int(max_segments))
+        self.flush_records = int(flush_records)
+        self.flush_seconds = float(flush_seconds)
+        self.lookback_seconds = float(lookback_days) * 86400
+
+        self._lock = threading.Lock()
+        self._buffer = bytearray()
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._last_ts = 0.0
+
+        os.makedirs(directory, exist_ok=True)
+        self._ids = {}
+        self._ips = []
+        self._load_device_index()
+
+        segments = self._segment_numbers()
+        self._segment_no = segments[-1] if segments else 1
+        # yeniden açılışta saat geride olsa bile zaman kolonu sıralı kalsın
+        self._last_ts = self._last_timestamp(segments)
+        self._file = open(self._segment_path(self._segment_no), "ab")
+
+    @classmethod
+    def from_settings(cls, settings=None):
+        cfg = dict(DEFAULT_HISTORY_SETTINGS)
+        cfg.update(settings or {})
+        return cls(
+            cfg["dir"],
+            segment_mb=cfg["segment_mb"],
+            max_segments=cfg["max_segments"],
+            flush_records=cfg["flush_records"],
+            flush_seconds=cfg["flush_seconds"],
+            lookback_days=cfg["lookback_days"],
+        )
+
+    # ---- device ids ----
+    def _load_device_index(self):
+        path = os.path.join(self.directory, DEVICE_INDEX)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    ip = line.rstrip("\n")
+                    self._ids[ip] = len(self._ips)
+                    self._ips.append(ip)
+        self._index_file = open(path, "a", encoding="utf-8")
+
+    def _device_id(self, ip):
+        dev_id = self._ids.get(ip)
+        if dev_id is None:
+            dev_id = len(self._ips)
+            self._ids[ip] = dev_id
+            self._ips.append(ip)
+            self._index_file.write(ip + "\n")
+            self._index_file.flush()
+        return dev_id
+
+    # ---- segments ----
+    def _segment_path(self, number):
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}")
+
+    def _segment_numbers(self):
+        numbers = []
+        for name in os.listdir(self.directory):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                try:
+                    numbers.append(int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+        return sorted(numbers)
+
+    def _last_timestamp(self, numbers):
+        """Timestamp of the last complete record on disk, or 0.0."""
+        for number in reversed(numbers):
+            try:
+                with open(self._segment_path(number), "rb") as f:
+                    count = os.fstat(f.fileno()).st_size // RECORD.size
+                    if not count:
+                        continue
+                    f.seek((count - 1) * RECORD.size)
+                    return RECORD.unpack(f.read(RECORD.size))[0]
+            except OSError:
+                continue
+        return 0.0
+
+    def _rotate(self):
+        self._file.close()
+        self._segment_no += 1
+        self._file = open(self._segment_path(self._segment_no), "ab")
+
+        # disk sınırı: en eski segmentleri sil
+        numbers = self._segment_numbers()
+        for number in numbers[:-self.max_segments]:
+            try:
+                os.remove(self._segment_path(number))
+            except OSError:
+                pass
+
+    # ---- write ----
+    def append(self, ip, rtt, status, ts=None):
+        """Buffer one probe result; rtt None is stored as NaN."""
+        if ts is None:
+            ts = time.time()
+
+        with self._lock:
+            # saat geri giderse sıralamayı bozma
+            ts = max(ts, self._last_ts)
+            self._last_ts = ts
+
+            self._buffer += RECORD.pack(
+                ts,
+                self._device_id(ip),
+                math.nan if rtt is None else rtt,
+                STATUS_TO_CODE.get(status, 0)
+            )
+            self._buffered += 1
+
+            if (self._buffered >= self.flush_records
+                    or time.monotonic() - self._last_flush >= self.flush_seconds):
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+
+        data = memoryview(self._buffer)
+        while data:
+            room = self.segment_bytes - self._file.tell()
+            if room <= 0:
+                self._rotate()
+                continue
+            chunk = data[:room]
+            self._file.write(chunk)
+            data = data[len(chunk):]
+
+        self._file.flush()
+        self._buffer = bytearray()
+        self._buffered = 0
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._file.close()
+            self._index_file.close()
+
+    # ---- read ----
+    def _segment_records(self, number, start, end, dev_id):
+        path = self._segment_path(number)
+        try:
+            size = os.path.getsize(path) // RECORD.size * RECORD.size
+        except OSError:
+            return []
+        if size == 0:
+            return []
+
+        out = []
+        try:
+            f = open(path, "rb")
+        except OSError:
+            # okurken döndürülüp silinmiş
+            return []
+        with f, mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+            count = size // RECORD.size
+
+            def ts_at(i):
+                return struct.unpack_from("<d", mm, i * RECORD.size)[0]
+
+            if start is not None and ts_at(count - 1) < start:
+                return []
+            if end is not None and ts_at(0) > end:
+                return []
+
+            lo = _bisect(ts_at, count, start) if start is not None else 0
+            hi = _bisect(ts_at, count, end, right=True) if end is not None else count
+
+            for ts, rec_id, rtt, code in RECORD.iter_unpack(mm[lo * RECORD.size:hi * RECORD.size]):
+                if rec_id == dev_id:
+                    out.append((ts, None if math.isnan(rtt) else rtt, STATUS_CODES[code]))
+        return out
+
+    def query(self, ip, start=None, end=None):
+        """Return ``[(ts, rtt_ms or None, status), ...]`` for one device, oldest first."""
+        self.flush()
+        dev_id = self._ids.get(ip)
+        if dev_id is None:
+            return []
+
+        results = []
+        for number in self._segment_numbers():
+            results.extend(self._segment_records(number, start, end, dev_id))
+        return results
+
+    def last_change_to(self, ip, status="DOWN", start=None):
+        """Timestamp at which the device last entered ``status``, or None.
+
+        Segments are read newest first and the scan stops as soon as the
+        latest run of ``status`` has a different record before it; records
+        older than ``start`` are never read.
+        """
+        self.flush()
+        dev_id = self._ids.get(ip)
+        if dev_id is None:
+            return None
+
+        since = None
+        for number in reversed(self._segment_numbers()):
+            for ts, _, st in reversed(self._segment_records(number, start, None, dev_id)):
+                if st == status:
+                    since = ts
+                elif since is not None:
+                    return since
+        return since
+
+
+def _bisect(ts_at, count, value, right=False):
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        t = ts_at(mid)
+        if t < value or (right and t == value):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
@@ -0,0 +1,134 @@
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+
+from device_loader import load_devices_from_excel
+
+CACHE_FILE = "inventory.cache"
+CACHE_VERSION = 1
+
+# marshal biçimi Python sürümüne bağlı → anahtara dahil
+_PY_TAG = "%d.%d" % sys.version_info[:2]
+
+
+def file_digest(path, chunk_size=1 << 20):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def mapping_key(mapping):
+    return sorted((str(k), str(v)) for k, v in (mapping or {}).items())
+
+
+class InventoryCache:
+    """Snapshot of the parsed workbook, so unchanged files skip openpyxl.
+
+    The snapshot holds the normalized device rows from
+    ``load_devices_from_excel`` in ``marshal`` format plus the key they were
+    built from: workbook path, size, mtime, content hash and the column
+    mapping. A lookup first compares path / size / mtime / mapping; if only
+    the mtime moved (file touched or copied back) the content hash decides,
+    and a hit just refreshes the stored mtime. Anything else is a miss and the
+    workbook is parsed and the snapshot rewritten atomically.
+    """
+
+    def __init__(self, path=CACHE_FILE, loader=load_devices_from_excel):
+        self.path = path
+        self.loader = loader
+        self.hits = 0
+        self.misses = 0
+
+    def _read(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION \
+                or data.get("python") != _PY_TAG:
+            return None
+        return data
+
+    def _write(self, data):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".inventory-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(marshal.dumps(data))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def load(self, excel_path, mapping):
+        """Return device dicts for the workbook, from the snapshot when valid.
+
+        Raises ``ValueError`` like ``load_devices_from_excel`` when the
+        workbook is missing or unreadable.
+        """
+        if not excel_path or not os.path.exists(excel_path):
+            raise ValueError("Excel dosya yolu geçersiz")
+
+        st = os.stat(excel_path)
+        key = self._key(excel_path, mapping, st)
+
+        cached = self._read()
+        if cached is not None and all(cached.get(k) == v for k, v in key.items()):
+            if cached.get("mtime_ns") == st.st_mtime_ns:
+                self.hits += 1
+                return cached["devices"]
+            digest = file_digest(excel_path)
+            if cached.get("digest") == digest:
+                # sadece zaman damgası değişmiş → içeriği yeniden okumaya gerek yok
+                cached["mtime_ns"] = st.st_mtime_ns
+                self._save(cached)
+                self.hits += 1
+                return cached["devices"]
+        else:
+            digest = file_digest(excel_path)
+
+        self.misses += 1
+        devices = self.loader(excel_path, mapping)
+        self._save(dict(key, mtime_ns=st.st_mtime_ns, digest=digest, devices=devices))
+        return devices
+
+    def store(self, excel_path, mapping, devices):
+        """Record rows the app itself just wrote, so the next load is a hit."""
+        st = os.stat(excel_path)
+        self._save(dict(
+            self._key(excel_path, mapping, st),
+            mtime_ns=st.st_mtime_ns,
+            digest=file_digest(excel_path),
+            devices=devices,
+        ))
+
+    @staticmethod
+    def _key(excel_path, mapping, st):
+        return {
+            "version": CACHE_VERSION,
+            "python": _PY_TAG,
+            "path": os.path.abspath(excel_path),
+            "size": st.st_size,
+            "mapping": mapping_key(mapping),
+        }
+
+    def _save(self, data):
+        try:
+            self._write(data)
+        except (OSError, ValueError):
+            # önbellek yazılamazsa sadece bir sonraki açılış yavaş olur
+            pass
+
+    def invalidate(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,215 @@
+import math
+from array import array
+
+DEFAULT_STATS_SETTINGS = {
+    "window": 120,           # örnek; yüzdelikler ve kayıp bu kadar son ölçüm üzerinden
+    "slices": 4,             # pencere bu kadar dilimde kayar (dilim başına en fazla 255 örnek)
+    "min_samples": 5,        # bundan az örnekle durum tek ölçüme göre belirlenir
+    "status_source": "last", # "last" | "p50" | "p95" | "p99" → durumu belirleyen değer
+    "down_loss": 50.0,       # pencere kaybı (%) bu değere ulaşınca DOWN
+}
+
+STATUS_SOURCES = ("last", "p50", "p95", "p99")
+
+# log ölçekli sabit kovalar: 0.1 ms'den başlayıp her kova 2^(1/4) katı (≈%9 hata),
+# son kova ~6.5 s ve üstünü toplar
+BASE_MS = 0.1
+BINS_PER_OCTAVE = 4
+BINS = 64
+
+_LOG_BASE = math.log2(BASE_MS)
+# kovanın temsil değeri: alt ve üst sınırının geometrik ortası
+_BIN_VALUES = tuple(BASE_MS * 2 ** ((i + 0.5) / BINS_PER_OCTAVE) for i in range(BINS))
+
+
+def status_by_latency(ms):
+    if ms is None:
+        return "DOWN"
+    if ms < 50:
+        return "FAST"
+    elif ms < 100:
+        return "NORMAL"
+    elif ms < 200:
+        return "SLOW"
+    return "VERY_SLOW"
+
+
+def bin_for(ms):
+    if ms <= BASE_MS:
+        return 0
+    i = int((math.log2(ms) - _LOG_BASE) * BINS_PER_OCTAVE)
+    return i if i < BINS else BINS - 1
+
+
+class LatencyWindow:
+    """Sliding-window RTT histogram, loss counter and RFC 3550 jitter for one device.
+
+    The window is split into ``slices`` sub-histograms of ``BINS`` one-byte
+    counters; when the current slice is full the oldest one is subtracted
+    from the running totals and reused, so memory is fixed (under 1 KiB with
+    the defaults) however many samples arrive. Quantiles are read
+    from the totals with ~9% relative error. Jitter is the RFC 3550
+    interarrival estimate ``J += (|D| - J) / 16`` with ``D`` the difference of
+    consecutive RTTs.
+    """
+
+    __slots__ = ("slices", "slice_size", "counts", "totals", "sent", "lost",
+                 "pos", "fill", "jitter", "last_rtt", "version")
+
+    def __init__(self, window=120, slices=4):
+        self.slices = max(1, int(slices))
+        self.slice_size = min(255, max(1, int(window) // self.slices))
+        self.counts = bytearray(self.slices * BINS)
+        self.totals = array("H", bytes(2 * BINS))   # pencere ≤ 4 × 255 örnek
+        self.sent = [0] * self.slices
+        self.lost = [0] * self.slices
+        self.pos = 0
+        self.fill = 0
+        self.jitter = None
+        self.last_rtt = None
+        self.version = 0     # LatencyStats.record sayacı; önbellekler değişikliği buradan anlar
+
+    def _advance(self):
+        self.pos = (self.pos + 1) % self.slices
+        start = self.pos * BINS
+        counts = self.counts
+        totals = self.totals
+        for i in range(BINS):
+            c = counts[start + i]
+            if c:
+                totals[i] -= c
+                counts[start + i] = 0
+        self.sent[self.pos] = 0
+        self.lost[self.pos] = 0
+        self.fill = 0
+
+    def add(self, ms):
+        if self.fill >= self.slice_size:
+            self._advance()
+        self.fill += 1
+        self.sent[self.pos] += 1
+
+        if ms is None:
+            self.lost[self.pos] += 1
+            return
+
+        i = bin_for(ms)
+        self.counts[self.pos * BINS + i] += 1
+        self.totals[i] += 1
+
+        if self.last_rtt is not None:
+            d = abs(ms - self.last_rtt)
+            self.jitter = d if self.jitter is None else self.jitter + (d - self.jitter) / 16
+        self.last_rtt = ms
+
+    @property
+    def samples(self):
+        return sum(self.sent)
+
+    def loss_pct(self):
+        sent = sum(self.sent)
+        return 100.0 * sum(self.lost) / sent if sent else None
+
+    def quantiles(self, qs=(0.5, 0.95, 0.99)):
+        """Approximate RTT quantiles (ms) of the replies in the window, or Nones."""
+        received = sum(self.totals)
+        if not received:
+            return tuple(None for _ in qs)
+        result = []
+        ranks = [max(1, math.ceil(q * received)) for q in qs]
+        seen = 0
+        k = 0
+        for i, c in enumerate(self.totals):
+            if not c:
+                continue
+            seen += c
+            while k < len(ranks) and seen >= ranks[k]:
+                result.append(_BIN_VALUES[i])
+                k += 1
+            if k == len(ranks):
+                break
+        return tuple(result)
+
+    def summary(self):
+        p50, p95, p99 = self.quantiles()
+        return {"p50": p50, "p95": p95, "p99": p99,
+                "jitter": self.jitter, "loss": self.loss_pct(), "samples": self.samples}
+
+
+class LatencyStats:
+    """Per-IP ``LatencyWindow`` registry; also a ``DeviceStore`` listener.
+
+    Windows are created on the first result for an IP and dropped when the
+    device leaves the store, so only probed devices cost memory.
+    ``classify`` turns the window into a status when ``status_source`` is a
+    percentile: one slow reply or one lost packet no longer flips the
+    device, only the percentile or a window loss of ``down_loss`` does.
+    """
+
+    def __init__(self, settings=None):
+        cfg = dict(DEFAULT_STATS_SETTINGS)
+        cfg.update(settings or {})
+        self.window = int(cfg["window"])
+        self.slices = int(cfg["slices"])
+        self.min_samples = int(cfg["min_samples"])
+        self.status_source = cfg["status_source"] if cfg["status_source"] in STATUS_SOURCES else "last"
+        self.down_loss = float(cfg["down_loss"])
+        self._windows = {}
+        self.records = 0
+
+    @classmethod
+    def from_settings(cls, settings=None):
+        return cls(settings)
+
+    def record(self, ip, ms):
+        w = self._windows.get(ip)
+        if w is None:
+            w = self._windows[ip] = LatencyWindow(self.window, self.slices)
+        w.add(ms)
+        # tüm pencerelerde artan sayaç: düşürülüp yeniden açılan pencere de yeni değer alır
+        self.records += 1
+        w.version = self.records
+        return w
+
+    def get(self, ip):
+        return self._windows.get(ip)
+
+    def version(self, ip):
+        """Changes whenever the window of ``ip`` gets a sample; 0 without one."""
+        w = self._windows.get(ip)
+        return w.version if w is not None else 0
+
+    def summary(self, ip):
+        w = self._windows.get(ip)
+        return w.summary() if w is not None else None
+
+    def classify(self, window, ms):
+        """Status for the latest result ``ms`` given the device's window."""
+        if self.status_source == "last" or window is None or window.samples < self.min_samples:
+            return status_by_latency(ms)
+        loss = window.loss_pct()
+        if loss is not None and loss >= self.down_loss:
+            return "DOWN"
+        p50, p95, p99 = window.quantiles()
+        value = {"p50": p50, "p95": p95, "p99": p99}[self.status_source]
+        # pencerede hiç yanıt yoksa (kayıp eşiği < %100) son ölçüme dön
+        return status_by_latency(value if value is not None else ms)
+
+    # ---- DeviceStore listener ----
+    def reset(self, devices):
+        keep = {d.get("ip") for d in devices}
+        for ip in [ip for ip in self._windows if ip not in keep]:
+            del self._windows[ip]
+
+    def add(self, device):
+        pass
+
+    def remove(self, device):
+        self._windows.pop(device.get("ip"), None)
+
+    def update(self, device):
+        pass
+
+    def change_ip(self, device, old_ip):
+        # ölçümler eski adrese ait; yeni IP boş pencereyle başlar
+        self._windows.pop(old_ip, None)
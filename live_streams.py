@@ -0,0 +1,236 @@
+import asyncio
+import subprocess
+import threading
+import time
+from collections import deque
+
+import ping_engine
+from ping_parser import parse_ping_line
+
+DEFAULT_LIVE_SETTINGS = {
+    "interval": 1.0,      # saniye; sadece ICMP motorunda (ping komutu kendi aralığıyla çalışır)
+    "timeout": 2.0,
+    "max_streams": 50,
+    "history": 40,        # satır başına grafikte gösterilen son ölçüm
+}
+
+# sparkline: 8 seviye, kayıp "×"
+_BARS = "▁▂▃▄▅▆▇█"
+LOST_MARK = "×"
+
+
+class LiveStream:
+    """Recent results of one live ping, kept on the Tk thread."""
+
+    __slots__ = ("ip", "samples", "sent", "lost", "last_ms", "started")
+
+    def __init__(self, ip, history=40):
+        self.ip = ip
+        self.samples = deque(maxlen=history)
+        self.sent = 0
+        self.lost = 0
+        self.last_ms = None
+        self.started = time.time()
+
+    def add(self, ms):
+        self.samples.append(ms)
+        self.sent += 1
+        self.last_ms = ms
+        if ms is None:
+            self.lost += 1
+
+    def loss_pct(self):
+        return 100.0 * self.lost / self.sent if self.sent else None
+
+    def sparkline(self):
+        """Recent RTTs as block characters, scaled to the largest one shown."""
+        values = [ms for ms in self.samples if ms is not None]
+        top = max(values) if values else 0
+        if top <= 0:
+            return "".join(LOST_MARK if ms is None else _BARS[0] for ms in self.samples)
+        last = len(_BARS) - 1
+        return "".join(
+            LOST_MARK if ms is None else _BARS[min(last, int(ms / top * last + 0.5))]
+            for ms in self.samples
+        )
+
+
+class LiveStreams:
+    """Many continuous pings at once, read by a single event loop.
+
+    With the ICMP engine every stream is a coroutine on the engine's loop,
+    so all replies come through its one socket reader. Otherwise each
+    stream is a ``ping -t`` / ``ping`` child process whose stdout is read by
+    one asyncio loop thread owned by this object (Proactor pipes on
+    Windows, the selector elsewhere) instead of a thread per process.
+    Output lines are parsed with ``parse_ping_line``.
+
+    ``on_result(ip, ms, kind)`` is called on the loop thread; ``start`` /
+    ``stop`` / ``record`` are for the Tk thread. Nothing here touches the
+    shared UI queue other than through ``on_result``, so bulk sweeps keep
+    running alongside.
+    """
+
+    def __init__(self, on_result, interval=1.0, timeout=2.0, max_streams=50, history=40):
+        self.on_result = on_result
+        self.interval = max(0.2, float(interval))
+        self.timeout = float(timeout)
+        self.max_streams = max(1, int(max_streams))
+        self.history = max(1, int(history))
+
+        self.streams = {}          # ip → LiveStream (Tk thread)
+        self._tasks = {}           # ip → concurrent.futures.Future
+        self._loop = None
+        self._loop_thread = None
+        self._children = set()     # toplanmamış ping süreçleri (Windows dışı)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, on_result, settings=None):
+        cfg = dict(DEFAULT_LIVE_SETTINGS)
+        cfg.update(settings or {})
+        return cls(on_result, cfg["interval"], cfg["timeout"], cfg["max_streams"], cfg["history"])
+
+    def __len__(self):
+        return len(self.streams)
+
+    def __contains__(self, ip):
+        return ip in self.streams
+
+    # ---------------- akışlar ----------------
+    def start(self, ip):
+        """Start a live ping for ``ip``; False when it runs already or the limit is reached."""
+        if ip in self.streams or len(self.streams) >= self.max_streams:
+            return False
+        engine = ping_engine.get_engine()
+        if engine is not None:
+            future = engine.submit(self._icmp_stream(engine, ip))
+        else:
+            future = asyncio.run_coroutine_threadsafe(self._process_stream(ip), self._reader_loop())
+        self.streams[ip] = LiveStream(ip, self.history)
+        self._tasks[ip] = future
+        return True
+
+    def stop(self, ip):
+        self.streams.pop(ip, None)
+        future = self._tasks.pop(ip, None)
+        if future is not None:
+            # görev iptal edilir; süreç varsa _process_stream kapatır
+            future.cancel()
+
+    def stop_all(self):
+        for ip in list(self.streams):
+            self.stop(ip)
+
+    def record(self, ip, ms):
+        """Add one result to its stream; None if the stream was stopped meanwhile."""
+        stream = self.streams.get(ip)
+        if stream is not None:
+            stream.add(ms)
+        return stream
+
+    def close(self):
+        self.stop_all()
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=3)
+            except Exception:
+                pass
+            loop.call_soon_threadsafe(loop.stop)
+            self._loop_thread.join(timeout=2)
+        for proc in list(self._children):
+            self._reap(proc)
+
+    # ---------------- ICMP ----------------
+    async def _icmp_stream(self, engine, ip):
+        while True:
+            started = time.monotonic()
+            ms, kind = await engine.probe_result(ip, self.timeout)
+            self.on_result(ip, ms, kind)
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    # ---------------- ping süreçleri ----------------
+    def _reader_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+                    loop.close()
+
+                self._loop_thread = threading.Thread(target=run, name="live-ping-reader", daemon=True)
+                self._loop_thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    async def _spawn(self, ip):
+        """Start ``ping`` for ``ip``; returns ``(process, StreamReader)``."""
+        cmd = ping_engine.ping_command(ip)
+        if ping_engine.IS_WINDOWS:
+            # Proactor döngüsü boruları IOCP ile okur
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+                creationflags=subprocess.CREATE_NO_WINDOW,
+            )
+            return proc, proc.stdout
+
+        # asyncio alt süreçleri burada süreç başına bekleme thread'i açar;
+        # düz Popen borusu seçiciye kaydedilir, süreç poll() ile toplanır
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        reader = asyncio.StreamReader()
+        self._children.add(proc)
+        await asyncio.get_running_loop().connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), proc.stdout)
+        return proc, reader
+
+    def _terminate(self, proc):
+        if proc.returncode is None:
+            try:
+                proc.terminate()
+            except ProcessLookupError:
+                pass
+        if isinstance(proc, subprocess.Popen):
+            asyncio.get_running_loop().call_later(2, self._reap, proc)
+
+    def _reap(self, proc):
+        self._children.discard(proc)
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+    async def _process_stream(self, ip):
+        try:
+            proc, reader = await self._spawn(ip)
+        except OSError:
+            self.on_result(ip, None, ping_engine.RESULT_ERROR)
+            return
+
+        n = 0
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    # ping kendiliğinden bitti (çözülemeyen ad vb.)
+                    self.on_result(ip, None, ping_engine.RESULT_ERROR)
+                    return
+                # ham bayt: konsol kod sayfası çözülmeden ayrıştırılır
+                sample = parse_ping_line(line, n + 1)
+                if sample is None:
+                    continue
+                n += 1
+                ms = sample.rtt_us / 1000 if sample.kind == ping_engine.RESULT_OK else None
+                self.on_result(ip, ms, sample.kind)
+        finally:
+            self._terminate(proc)
+
+    async def _shutdown(self):
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
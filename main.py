@@ -1,18 +1,48 @@
+import sys
+
+# derlenmiş exe toplu tarama işçisi olarak başlatıldıysa Tk kurulmadan çalışıp çıkar
+from sharded_sweep import run_worker_if_requested
+run_worker_if_requested()
+
+import time
+
+# açılış ölçümü: ilk boyama (TTFP) ve etkileşime hazır (TTI) bu ana göre
+STARTUP_T0 = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk
 import subprocess
 import threading
-import queue
 import platform
-import re
 from datetime import datetime
 from tkinter import messagebox
-from device_loader import load_devices
-from device_loader import load_devices_from_excel, save_devices
+from device_storage import open_storage, JsonDeviceStorage
+from inventory_cache import InventoryCache, CACHE_FILE
+from excel_journal import ExcelJournal
+from pingmonitor import apply_result, carry_ping_state, apply_sweep_results
+from latency_stats import LatencyStats
+from transitions import TransitionDetector
+from metrics_exporter import MetricsExporter
+from live_streams import LiveStreams
 from tkinter import filedialog
 import json
 import os
-import sys
+import sqlite3
+import ping_engine
+from ping_engine import ping_command
+from ping_parser import parse_ping_line
+from sweep_control import SweepController
+from sharded_sweep import ShardedSweep, should_shard
+from discovery import AddressSpace, DiscoverySweep, DEFAULT_DISCOVERY_SETTINGS
+from scheduler import ProbeScheduler
+from history_store import HistoryStore
+from persistence import DevicePersister
+from device_store import DeviceStore
+from result_queue import CoalescingQueue, DEFAULT_UI_SETTINGS
+from virtual_list import VirtualTree
+from search_index import SearchIndex
+from filter_index import FilterIndex
+from sort_index import SortIndex, ip_key, number_key, text_key
 
 # ---------------- UI THEME (Modern Dark) ----------------
 # This block only affects styling (colors, rounded controls). Core logic is unchanged.
@@ -32,8 +62,8 @@ def resource_path(relative_path: str) -> str:
 
 def load_ui_assets():
     """Load PNG assets used to fake rounded corners on Tk widgets."""
+    # bg.png (~240 KB) burada değil, ilk boyamadan sonra load_background ile
     assets = {}
-    assets["bg"] = tk.PhotoImage(file=resource_path("bg.png"))
     assets["btn_normal"] = tk.PhotoImage(file=resource_path(os.path.join("assets", "btn_normal.png")))
     assets["btn_hover"] = tk.PhotoImage(file=resource_path(os.path.join("assets", "btn_hover.png")))
     assets["btn_pressed"] = tk.PhotoImage(file=resource_path(os.path.join("assets", "btn_pressed.png")))
@@ -46,6 +76,15 @@ def load_ui_assets():
     assets["search_bg"] = tk.PhotoImage(file=resource_path(os.path.join("assets", "search_bg.png")))
     return assets
 
+def load_background():
+    """Decode the window background once the first frame is on screen."""
+    global bg_photo
+    try:
+        bg_photo = tk.PhotoImage(file=resource_path("bg.png"))
+    except tk.TclError:
+        return
+    bg_label.config(image=bg_photo)
+
 def apply_ttk_dark_style(root):
     """Style ttk widgets (Treeview + Scrollbars) for a modern dark look."""
     style = ttk.Style(root)
@@ -233,11 +272,34 @@ FONT_NAME = "Segoe UI" if IS_WINDOWS else "Helvetica"
 
 # ---------------- GLOBAL STATE ----------------
 CONFIG_FILE = "config.json"
+app_config = {}
+# ayrıştırılmış Excel anlık görüntüsü, config.json'ın yanında
+inventory_cache = InventoryCache(os.path.join(os.path.dirname(os.path.abspath(CONFIG_FILE)), CACHE_FILE))
 excel_path = None
 excel_mapping = None
 bulk_total = 0
 bulk_done = 0
+bulk_controller = None
+bulk_stop_event = threading.Event()
+monitor_scheduler = None
+monitor_dropped = 0       # kuyruk geride kaldığı için atılan sürekli izleme ölçümleri
+live_dropped = 0          # aynı nedenle atılan canlı akış sonuçları
+history = None
+persister = None
+storage = None   # devices.db / devices.json (device_storage)
+latency_stats = None
+transitions = None
+metrics_exporter = None   # config'te "metrics.enabled" ise HTTP uç noktası
+live_streams = None       # 📈 aynı anda çalışan canlı pingler (live_streams.py)
+live_window = None
+live_tree = None
+excel_journal = None
+excel_sync_error = None
+device_pages = None          # açılışta henüz eklenmemiş kayıtlı sayfalar (storage.iter_pages)
+pending_inventory = None     # sayfalar bitmeden gelen Excel sonucu
+startup_times = {}         # açılış aşaması → STARTUP_T0'dan beri ms (mark_startup)
 PAGE_SIZE = 100
+VIRTUAL_LIST = False
 current_page = 1
 total_pages = 1
 REQUIRED_FIELDS = [
@@ -255,6 +317,11 @@ COLUMN_WIDTHS = {
     "IP": 130,
     "Ping (ms)": 100,
     "Son Ping": 170,
+    "p50": 70,
+    "p95": 70,
+    "p99": 70,
+    "Jitter": 70,
+    "Kayıp %": 70,
     "Device Name": 160,   # 👈 EKLE
     "Model": 120,
     "MAC": 160,
@@ -262,196 +329,173 @@ COLUMN_WIDTHS = {
     "Unit": 120,
     "Description": 200
 }
-current_sort_column = None
-current_sort_reverse = False
-
-devices = []
+devices = DeviceStore()
+search_index = SearchIndex()
+devices.subscribe(search_index)
+device_view = None   # VirtualTree, Treeview oluşturulunca atanır
 current_ip = None
 is_running = False
 ping_process = None
 is_bulk_running = False
 ping_thread = None
-ui_queue = queue.Queue()
+ping_stop_event = None
+ui_queue = CoalescingQueue()
+UI_FRAME_BUDGET = DEFAULT_UI_SETTINGS["frame_budget_ms"] / 1000
+VALUE_REFRESH_SECONDS = DEFAULT_UI_SETTINGS["value_refresh_s"]
+status_changed_ips = set()   # bu turda durumu değişenler → hemen çizilir
+value_changed_ips = set()    # sadece ms / istatistik değişenler → VALUE_REFRESH_SECONDS'ta bir
+value_refresh_at = 0.0
+single_ping_seq = 0          # tekli pingin ayrıştırılan sonuç sayısı (Windows satırlarında sıra yok)
+sort_touched_ips = set()     # sıralama canlı kolondayken bu turda sonucu gelenler
 started_from_entry = False
 
 def update_column_headers():
-    for col, field in COLUMN_TO_FIELD.items():
+    sort_rank = {col: (i, rev) for i, (col, rev) in enumerate(sort_index.order)}
+    for col in cols:
+        field = COLUMN_TO_FIELD.get(col)
         text = col
 
         # 🔍 Filtre aktif mi?
-        if active_filters.get(field):
+        if field and active_filters.get(field):
             text += " 🔍"
 
-        # ⬆⬇ sıralama oku
-        if col == current_sort_column:
-            text += " ▼" if current_sort_reverse else " ▲"
-        else:
+        # ⬆⬇ sıralama oku (çok kolonluda sırası da yazılır)
+        if col in sort_rank:
+            i, rev = sort_rank[col]
+            text += " ▼" if rev else " ▲"
+            if len(sort_rank) > 1:
+                text += str(i + 1)
+        elif field:
             text += " ▼"
 
         device_tree.heading(col, text=text)
 
-def update_tree_item_for_ip(ip):
-    for item in device_tree.get_children():
-        values = device_tree.item(item)["values"]
-        if values and values[1] == ip:
-            device = next((d for d in devices if d["ip"] == ip), None)
-            if not device:
-                return
-
-            latency_txt = "-" if device.get("latency") is None else f"{device['latency']:.1f}"
-
-            device_tree.item(
-                item,
-                values=(
-                    device.get("device", ""),
-                    device.get("ip", ""),
-                    latency_txt,
-                    device.get("last_ping") or "-",
-                    device.get("name", ""),   # 👈 EKLE
-                    device.get("model", ""),
-                    device.get("mac", ""),
-                    device.get("location", ""),
-                    device.get("unit", ""),
-                    device.get("description", "")
-                ),
-                tags=(device.get("status", "UNKNOWN"),)
-            )
-            return
+def stat_text(value, fmt="{:.1f}"):
+    return "-" if value is None else fmt.format(value)
+
+def device_row_values(d):
+    latency_txt = "-" if d.get("latency") is None else f"{d['latency']:.1f}"
+    # 📊 kayan pencere istatistikleri (latency_stats.py), ölçüm yoksa "-"
+    stats = latency_stats.summary(d.get("ip")) if latency_stats else None
+    stats = stats or {}
+    return (
+        d.get("device", ""),
+        d.get("ip", ""),
+        latency_txt,
+        d.get("last_ping") or "-",
+        stat_text(stats.get("p50")),
+        stat_text(stats.get("p95")),
+        stat_text(stats.get("p99")),
+        stat_text(stats.get("jitter")),
+        stat_text(stats.get("loss"), "{:.0f}"),
+        d.get("name", ""),     # 👈 DEVICE NAME
+        d.get("model", ""),
+        d.get("mac", ""),
+        d.get("location", ""),
+        d.get("unit", ""),
+        d.get("description", "")
+    )
 
-# ---------------- PING HELPERS ----------------
-def extract_ping_ms(text):
-    text = text.lower()
+def device_row_tags(d):
+    return (d.get("status", "UNKNOWN"),)
 
-    # time=14.2 ms | time<1ms | time=1ms
-    match = re.search(r"time[=<]?\s*([\d\.]+)\s*ms", text)
-    if match:
-        return float(match.group(1))
+def update_tree_item_for_ip(ip):
+    # görünmüyorsa (başka sayfa / pencere dışı) hiçbir şey yapmaz
+    device_view.refresh_key(ip)
 
-    # bazı sistemlerde boşluk yok: time<1ms
-    match = re.search(r"time[=<]?([\d\.]+)ms", text)
-    if match:
-        return float(match.group(1))
+def ip_for_item(item):
+    return device_view.item_keys.get(item)
 
-    return None
+def first_selected_ip():
+    return device_view.first_selected()
 
+# ---------------- PING HELPERS ----------------
 def single_ping(ip, timeout=2):
-    try:
-        if IS_WINDOWS:
-            cmd = ["ping", "-n", "1", "-w", str(timeout * 1000), ip]
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
-            proc = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-        else:
-            cmd = ["ping", "-c", "1", ip]
-            proc = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True
-            )
-
-        output, _ = proc.communicate(timeout=timeout + 1)
-        return extract_ping_ms(output)
-
-    except Exception:
-        return None
-    
-from concurrent.futures import ThreadPoolExecutor
+    return ping_engine.ping(ip, timeout)
 
 
 def ip_exists(ip, exclude_device=None):
-    for d in devices:
-        if d["ip"] == ip:
-            if exclude_device and d is exclude_device:
-                continue
-            return True
-    return False
+    return devices.has_ip(ip, exclude_device)
 
 def bulk_ping_worker(devices_to_ping):
-    global is_bulk_running
+    global bulk_controller
 
-    def ping_one(device):
-        ip = device["ip"]
-        ms = single_ping(ip)
+    # config.json → "sweep": {"max_rate": ..., "max_in_flight": ..., "processes": 0, "shard_threshold": 20000}
+    sweep_settings = app_config.get("sweep", {})
+    if should_shard(len(devices_to_ping), sweep_settings):
+        sharded_bulk_ping(devices_to_ping, sweep_settings)
+        return
+
+    bulk_controller = SweepController(**sweep_settings)
+
+    def on_result(ip, ms):
         ui_queue.put(("BULK", ip, ms))
 
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        executor.map(ping_one, devices_to_ping)
+    ping_engine.ping_many(
+        [d["ip"] for d in devices_to_ping],
+        on_result,
+        controller=bulk_controller
+    )
 
+    bulk_controller.finish()
     ui_queue.put(("BULK_DONE", None, None))
 
-def device_matches_filters(device):
-    # 1️⃣ Checkbox filtreleri
-    for field, selected_values in active_filters.items():
-        if selected_values:
-            if device.get(field) not in selected_values:
-                return False
-
-    # 2️⃣ Global arama
-    if search_text:
-        haystack = " ".join(
-            str(device.get(k, "")).lower()
-            for k in [
-                "device", "ip", "model",
-                "mac", "location", "unit", "description"
-            ]
+def sharded_bulk_ping(devices_to_ping, sweep_settings):
+    """Very large sweeps: one worker process per core, results merged in one step."""
+    global bulk_controller
+
+    bulk_controller = ShardedSweep(
+        [d["ip"] for d in devices_to_ping],
+        settings=sweep_settings,
+        backend=ping_engine.probe_backend
+    )
+    try:
+        results = bulk_controller.run(
+            on_progress=lambda done: ui_queue.put(("BULK_PROGRESS", None, done)),
+            stop_event=bulk_stop_event
         )
-        if search_text.lower() not in haystack:
-            return False
+    except OSError:
+        results = []
+    ui_queue.put(("BULK_MERGE", None, results))
+    ui_queue.put(("BULK_DONE", None, None))
 
-    return True
+def device_matches_filters(device):
+    # 1️⃣ Checkbox filtreleri (bitmap indeksi, bkz. filter_index.py)
+    if not filter_index.matches(device):
+        return False
 
-def status_by_latency(ms):
-    if ms is None:
-        return "DOWN"
-    if ms < 50:
-        return "FAST"
-    elif ms < 100:
-        return "NORMAL"
-    elif ms < 200:
-        return "SLOW"
-    return "VERY_SLOW"
+    # 2️⃣ Global arama (trigram indeksi, bkz. search_index.py)
+    if search_text and not search_index.matches(device):
+        return False
 
+    return True
 
-def sort_devices_by_column(col, reverse=False):
+def sort_devices_by_column(col, reverse=False, then=False):
+    """Sort by ``col``; with ``then`` it becomes the next key of the current sort."""
     global current_page
     current_page = 1
-    global current_sort_column, current_sort_reverse
 
-    if col == "IP":
-        devices.sort(key=lambda d: ip_to_tuple(d.get("ip", "")), reverse=reverse)
-    else:
-        field = COLUMN_TO_FIELD.get(col)
-        devices.sort(
-            key=lambda d: (d.get(field) or "").lower(),
-            reverse=reverse
-        )
-
-    current_sort_column = col
-    current_sort_reverse = reverse
+    # anahtarlar sort_index'te önbellekli; eşitler önceki sıralarını korur (stable)
+    order = [(c, r) for c, r in sort_index.order if c != col] if then else []
+    sort_index.sort(order + [(col, reverse)])
+    sort_index.take_moved()
 
     refresh_device_list(keep_selection=True)
     update_column_headers()
 
-def ping_command(ip):
-    return ["ping", "-t", ip] if IS_WINDOWS else ["ping", ip]
+def reorder_device_list():
+    # canlı kolona göre sıralıyken: satırlar yeni sırayla, seçim olduğu gibi kalır
+    filtered = [d for d in devices if device_matches_filters(d)]
+    device_view.set_rows(filtered if VIRTUAL_LIST else get_paged_devices(filtered))
 
-def ip_to_tuple(ip):
-    try:
-        return tuple(int(x) for x in ip.split("."))
-    except:
-        return (0, 0, 0, 0)
+def stat_sort_key(name):
+    def key(d):
+        stats = latency_stats.summary(d.get("ip")) if latency_stats else None
+        return number_key((stats or {}).get(name))
+    return key
 
 def load_config():
-    global excel_path, excel_mapping
+    global app_config, excel_path, excel_mapping
 
     if not os.path.exists(CONFIG_FILE):
         return
@@ -459,6 +503,10 @@ def load_config():
     with open(CONFIG_FILE, "r", encoding="utf-8") as f:
         data = json.load(f)
 
+    # bilinmeyen anahtarlar da save_config'te korunur
+    app_config = data
+    ping_engine.set_backend(data.get("probe_backend", "auto"))
+
     excel_path = data.get("excel_path")
     excel_mapping = data.get("excel_mapping")
 
@@ -467,12 +515,12 @@ def load_config():
         excel_mapping = None
 
 def save_config():
+    app_config["excel_path"] = excel_path
+    app_config["excel_mapping"] = excel_mapping
+
     with open(CONFIG_FILE, "w", encoding="utf-8") as f:
         json.dump(
-            {
-                "excel_path": excel_path,
-                "excel_mapping": excel_mapping
-            },
+            app_config,
             f,
             ensure_ascii=False,
             indent=2
@@ -505,6 +553,11 @@ cols = (
     "IP",
     "Ping (ms)",
     "Son Ping",
+    "p50",
+    "p95",
+    "p99",
+    "Jitter",
+    "Kayıp %",
     "Device Name",   # 👈 YENİ
     "Model",
     "MAC",
@@ -513,13 +566,37 @@ cols = (
     "Description"
 )
 
+# 🔃 kolon → sıralama anahtarı; ölçümle değişenler canlı tutulur (sort_index.py)
+SORT_KEYS = {col: (lambda d, field=field: text_key(d.get(field)))
+             for col, field in COLUMN_TO_FIELD.items()}
+SORT_KEYS.update({
+    "IP": lambda d: ip_key(d.get("ip")),
+    "Ping (ms)": lambda d: number_key(d.get("latency")),
+    "Son Ping": lambda d: text_key(d.get("last_ping")),
+    "p50": stat_sort_key("p50"),
+    "p95": stat_sort_key("p95"),
+    "p99": stat_sort_key("p99"),
+    "Jitter": stat_sort_key("jitter"),
+    "Kayıp %": stat_sort_key("loss"),
+})
+LIVE_SORT_COLUMNS = ("Ping (ms)", "Son Ping", "p50", "p95", "p99", "Jitter", "Kayıp %")
+sort_index = SortIndex(SORT_KEYS, LIVE_SORT_COLUMNS)
+devices.subscribe(sort_index)
+
 active_filters = {key: set() for key in FILTERABLE_FIELDS}
+filter_index = FilterIndex(FILTERABLE_FIELDS)
+devices.subscribe(filter_index)
 search_text = ""
 
 # ---------------- PING LOOP ----------------
-def ping_loop(ip):
+def ping_loop(ip, stop_event):
     global ping_process
 
+    engine = ping_engine.get_engine()
+    if engine is not None:
+        icmp_ping_loop(engine, ip, stop_event)
+        return
+
     flags = subprocess.CREATE_NO_WINDOW if IS_WINDOWS else 0
 
     ping_process = subprocess.Popen(
@@ -531,7 +608,7 @@ def ping_loop(ip):
     )
 
     for line in ping_process.stdout:
-        if not is_running:
+        if stop_event.is_set():
             break
         ui_queue.put(("SINGLE", ip, line))
 
@@ -540,78 +617,215 @@ def ping_loop(ip):
     except Exception:
         pass
 
+def icmp_ping_loop(engine, ip, stop_event, interval=1):
+    """Continuous ping over the ICMP engine, emitting ping-style output lines."""
+    seq = 0
+    while not stop_event.is_set():
+        seq += 1
+        started = time.monotonic()
+        ms = engine.ping(ip, timeout=2)
+
+        if stop_event.is_set():
+            break
+
+        if ms is None:
+            line = f"Request timeout for icmp_seq {seq}\n"
+        else:
+            line = f"Reply from {ip}: icmp_seq={seq} time={ms:.1f} ms\n"
+        ui_queue.put(("SINGLE", ip, line))
+
+        stop_event.wait(max(0, interval - (time.monotonic() - started)))
+
 # ---------------- UI QUEUE ----------------
+def apply_ping_result(ip, ms, now, update_tree=True, immediate=False):
+    """Write one probe result into the device, its tree row and the history log.
+
+    The status goes through ``transitions``; consumers of status changes
+    are called from ``on_status_change``.
+    """
+    d = devices.get(ip)
+    if d is None:
+        return None
+
+    apply_result(d, ms, now, latency_stats, transitions, immediate)
+    if metrics_exporter:
+        metrics_exporter.result(ms)
+    if sort_index.is_live:
+        sort_touched_ips.add(ip)
+    if update_tree:
+        update_tree_item_for_ip(ip)
+
+    if history:
+        history.append(ip, ms, d["status"])
+    return d
+
+def on_status_change(event):
+    # 🔔 sadece gerçek durum değişikliği: satır bu turda çizilir, cihaz kaydı kirlenir
+    status_changed_ips.add(event.ip)
+    if persister:
+        persister.mark_dirty(event.ip)
+
+def bulk_rate_text():
+    if not bulk_controller:
+        return ""
+    stats = bulk_controller.stats()
+    return f"  •  {stats['probes_per_sec']:.0f} ping/sn  •  eşzamanlı: {stats['limit']}"
+
 def process_ui_queue():
-    while not ui_queue.empty():
-        item = ui_queue.get()
+    global bulk_done, is_bulk_running, value_refresh_at, single_ping_seq, monitor_dropped, live_dropped
+
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    changed_ips = value_changed_ips
+    live_changed = set()
+    output_lines = []
+    bulk_changed = False
 
-        item_type, ip, payload = item
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # ⏱ kare bütçesi dolunca kalanlar bir sonraki tura kalır
+    for item_type, ip, payload, count in ui_queue.drain(UI_FRAME_BUDGET):
 
         # 🔵 TEKLİ PING
         if item_type == "SINGLE":
             line = payload
+            output_lines.append(line)
 
-            output_box.config(state=tk.NORMAL)
-            output_box.insert(tk.END, line)
-            output_box.see(tk.END)
-            output_box.config(state=tk.DISABLED)
-
-            ms = extract_ping_ms(line)
-
-            for d in devices:
-                if d["ip"] == ip:
-                    d["latency"] = ms
-                    d["last_ping"] = now
-                    d["status"] = status_by_latency(ms)
-                    update_tree_item_for_ip(ip)
-                    break
+            # başlık / boş / özet satırları ölçüm değildir (sahte DOWN yazılmaz)
+            sample = parse_ping_line(line, single_ping_seq + 1)
+            if sample is None:
+                continue
+            single_ping_seq += 1
+            ms = sample.rtt_us / 1000 if sample.kind == ping_engine.RESULT_OK else None
 
-            save_devices(devices)
+            if apply_ping_result(ip, ms, now, update_tree=False):
+                changed_ips.add(ip)
 
         # 🟢 TOPLU PING
         elif item_type == "BULK":
-            global bulk_done
-
-            bulk_done += 1   # 🔥 BAŞARILI / BAŞARISIZ FARK ETMEZ
-
-            bulk_status_label.config(
-                text=f"Toplu Ping: {bulk_done} / {bulk_total}"
-            )
+            bulk_done += count   # 🔥 BAŞARILI / BAŞARISIZ FARK ETMEZ (birleşenler dahil)
+            bulk_changed = True
 
             ms = payload  # None olabilir, sorun değil
 
-            for d in devices:
-                if d["ip"] == ip:
-                    d["latency"] = ms
-                    d["last_ping"] = now
-                    d["status"] = status_by_latency(ms)
-                    update_tree_item_for_ip(ip)
-                    break
-
-          
+            # tek seferlik tarama: histerezis beklemeden
+            if apply_ping_result(ip, ms, now, update_tree=False, immediate=True):
+                changed_ips.add(ip)
+
+        # 📈 CANLI İZLEME (çoklu akış)
+        elif item_type == "LIVE":
+            ms = payload
+            if live_streams.record(ip, ms) is not None:
+                live_changed.add(ip)
+                if apply_ping_result(ip, ms, now, update_tree=False):
+                    changed_ips.add(ip)
+
+        # ⏱ SÜREKLİ İZLEME
+        elif item_type == "MONITOR":
+            # birikmiş her ölçüm işlenir (geçmiş / kayıp % / geçişler), satır bir kez çizilir
+            for ms in payload:
+                if apply_ping_result(ip, ms, now, update_tree=False):
+                    changed_ips.add(ip)
+
+        # 🟢 TOPLU PING (çok süreçli): ilerleme ve tek seferde birleştirme
+        elif item_type == "BULK_PROGRESS":
+            bulk_done = payload
+            bulk_changed = True
+
+        elif item_type == "BULK_MERGE":
+            for ip, ms, status, ts in apply_sweep_results(devices, payload, latency_stats,
+                                                          transitions):
+                if history:
+                    history.append(ip, ms, status, ts)
+                if metrics_exporter:
+                    metrics_exporter.result(ms)
+                changed_ips.add(ip)
+                if sort_index.is_live:
+                    sort_touched_ips.add(ip)
 
         # 🔴 TOPLU PING BİTTİ
         elif item_type == "BULK_DONE":
-            global is_bulk_running
-
             is_bulk_running = False
-            save_devices(devices)
+            bulk_changed = False
+            # ölçüm değerleri de yazılsın (ara kayıtlar sadece durum değişikliğinde)
+            persister.mark_dirty()
+            persister.flush_soon()
             start_btn.ui_set_enabled(True)
             refresh_btn.ui_set_enabled(True)
             add_btn.ui_set_enabled(True)
             bulk_status_label.config(
-            text=f"Toplu Ping tamamlandı ({bulk_total} / {bulk_total})"
+            text=f"Toplu Ping tamamlandı ({bulk_total} / {bulk_total}){bulk_rate_text()}"
             )
               # ⏱ 3 saniye sonra temizle
             root.after(5000, lambda: bulk_status_label.config(text=""))
-  
 
-    root.after(30, process_ui_queue)
+        # 📗 EXCEL'E TOPLU YAZMA SONUCU (diyalog göstereceği için ayrı turda)
+        elif item_type == "EXCEL_SYNC":
+            root.after_idle(lambda result=payload: handle_excel_sync(result))
+
+        # 📗 AÇILIŞTA ARKA PLANDA OKUNAN EXCEL
+        elif item_type == "INVENTORY":
+            root.after_idle(lambda result=payload: handle_inventory_loaded(result))
+
+        # 📈 DETAY PENCERESİ: geçmişten son DOWN zamanı
+        elif item_type == "DOWN_SINCE":
+            show_down_since(*payload)
+
+    # kuyruk doluyken atılan toplu sonuçlar da sayaca girsin
+    dropped = ui_queue.take_dropped("BULK")
+    if dropped:
+        bulk_done += dropped
+        bulk_changed = True
+
+    # ⚠️ atılan satır / ölçümler sessizce kaybolmasın
+    dropped = ui_queue.take_dropped("SINGLE")
+    if dropped:
+        output_lines.insert(0, f"… {dropped} satır atlandı (arayüz geride kaldı)\n")
+    monitor_dropped += ui_queue.take_dropped("MONITOR")
+    dropped = ui_queue.take_dropped("LIVE")
+    if dropped:
+        live_dropped += dropped
+        if live_window is not None and live_window.winfo_exists():
+            live_window.title(f"Canlı İzleme — {live_dropped} sonuç atlandı")
+
+    # 🔃 canlı kolona göre sıralıysa sonucu gelen satırlar yerine kaydırılır (tam sıralama yok)
+    if sort_touched_ips:
+        sort_index.touch_many(d for d in map(devices.get, sort_touched_ips) if d is not None)
+        sort_touched_ips.clear()
+
+    # 🌲 Treeview'e tek seferde yaz: IP başına bir güncelleme. Durumu değişenler
+    # hemen, sadece değeri değişenler VALUE_REFRESH_SECONDS'ta bir toplu çizilir
+    for ip in status_changed_ips:
+        update_tree_item_for_ip(ip)
+    changed_ips.difference_update(status_changed_ips)
+    status_changed_ips.clear()
+    if (changed_ips or sort_index.moved) and time.monotonic() >= value_refresh_at:
+        if sort_index.take_moved():
+            # sıra değişti: görünen satırlar yeni sırayla yeniden yazılır
+            reorder_device_list()
+        else:
+            for ip in changed_ips:
+                update_tree_item_for_ip(ip)
+        changed_ips.clear()
+        value_refresh_at = time.monotonic() + VALUE_REFRESH_SECONDS
+
+    if live_changed:
+        refresh_live_rows(live_changed)
+
+    if output_lines:
+        output_box.config(state=tk.NORMAL)
+        output_box.insert(tk.END, "".join(output_lines))
+        output_box.see(tk.END)
+        output_box.config(state=tk.DISABLED)
+
+    if bulk_changed and is_bulk_running:
+        bulk_status_label.config(
+            text=f"Toplu Ping: {bulk_done} / {bulk_total}{bulk_rate_text()}"
+        )
+
+    # iş kaldıysa hemen devam et, yoksa normal aralıkla
+    root.after(1 if not ui_queue.empty() else 30, process_ui_queue)
 
 # ---------------- ACTIONS ----------------
 def start_ping(event=None):
-    global is_running, current_ip, ping_thread, started_from_entry
+    global is_running, current_ip, ping_thread, ping_stop_event, started_from_entry, single_ping_seq
     bulk_status_label.config(text="")
     ip = ip_entry.get().strip()
     if not ip:
@@ -630,10 +844,12 @@ def start_ping(event=None):
     output_box.delete("1.0", tk.END)
     output_box.config(state=tk.DISABLED)
 
-    while not ui_queue.empty():
-        ui_queue.get_nowait()
+    # sadece önceki pingin bekleyen satırları; Excel / toplu tarama mesajları kalır
+    ui_queue.clear_lines("SINGLE")
+    single_ping_seq = 0
 
-    ping_thread = threading.Thread(target=ping_loop, args=(ip,), daemon=True)
+    ping_stop_event = threading.Event()
+    ping_thread = threading.Thread(target=ping_loop, args=(ip, ping_stop_event), daemon=True)
     ping_thread.start()
 
 def start_ping_from_menu():
@@ -645,6 +861,8 @@ def stop_ping(event=None):
     global is_running, ping_process
 
     is_running = False
+    if ping_stop_event:
+        ping_stop_event.set()
     start_btn.config(text="▶ Başlat")
         # Ping durdu, artık entry'yi otomatik doldurabiliriz
     global started_from_entry
@@ -665,8 +883,6 @@ def toggle_ping():
 
 
 def refresh_from_excel():
-    global devices
-
     if not excel_path or not excel_mapping:
         messagebox.showwarning(
             "Excel",
@@ -674,33 +890,167 @@ def refresh_from_excel():
         )
         return
 
-    # 1️⃣ Excel'den cihazları oku
-    excel_devices = load_devices_from_excel(excel_path, excel_mapping)
-
-    # 2️⃣ Eski ping bilgilerini koru
-    new_devices = []
+    # 1️⃣ bekleyen düzenlemeler önce yazılsın, sonra Excel'den cihazları oku
+    excel_journal.flush()
+    try:
+        excel_devices = inventory_cache.load(excel_path, excel_mapping)
+    except ValueError as e:
+        messagebox.showerror("Excel Okuma Hatası", f"Excel okunamadı:\n\n{e}")
+        return
+    excel_journal.mark_synced(excel_path)
 
-    for ex in excel_devices:
-        old = next((d for d in devices if d.get("ip") == ex.get("ip")), None)
+    merge_excel_devices(excel_devices)
 
-        if old:
-            ex["latency"] = old.get("latency")
-            ex["last_ping"] = old.get("last_ping")
-            ex["status"] = old.get("status", "UNKNOWN")
-        else:
-            ex["latency"] = None
-            ex["last_ping"] = None
-            ex["status"] = "UNKNOWN"
 
-        new_devices.append(ex)
+def merge_excel_devices(excel_devices):
+    # 2️⃣ Eski ping bilgilerini koru
+    new_devices = carry_ping_state(excel_devices, devices)
 
     # 3️⃣ RAM + JSON güncelle
-    devices = new_devices
-    save_devices(devices)
+    devices.reset(new_devices)
+    persister.mark_dirty()
+    sync_monitor_devices()
 
     # 4️⃣ Listeyi yenile
     refresh_device_list(keep_selection=True)
 
+def load_down_since(ip, label):
+    """Look up the last DOWN of ``ip`` on a worker thread; DOWN_SINCE fills ``label``."""
+    def worker():
+        since = history.last_change_to(ip, "DOWN", start=time.time() - history.lookback_seconds)
+        ui_queue.put(("DOWN_SINCE", None, (label, since)))
+
+    threading.Thread(target=worker, name="history-lookup", daemon=True).start()
+
+def show_down_since(label, since):
+    # pencere bu arada kapanmış olabilir
+    if label.winfo_exists():
+        label.config(text=datetime.fromtimestamp(since).strftime("%Y-%m-%d %H:%M:%S") if since else "-")
+
+def load_inventory_async():
+    """Read the workbook on a worker thread; the result comes back as INVENTORY."""
+    def worker():
+        try:
+            result = inventory_cache.load(excel_path, excel_mapping)
+        except ValueError as e:
+            result = e
+        ui_queue.put(("INVENTORY", None, result))
+
+    threading.Thread(target=worker, name="inventory-load", daemon=True).start()
+
+def load_next_device_page():
+    """Add one more stored page per Tk turn; the last one completes the saved state."""
+    if device_pages is None:
+        return
+    page = next(device_pages, None)
+    if page is None:
+        finish_device_pages()
+        return
+    for d in page:
+        devices.add(d)
+    root.after(1, load_next_device_page)
+
+def drain_device_pages():
+    global device_pages
+    if device_pages is None:
+        return False
+    for page in device_pages:
+        for d in page:
+            devices.add(d)
+    device_pages = None
+    return True
+
+def finish_device_pages():
+    global pending_inventory
+    if not drain_device_pages():
+        return
+    mark_startup("cached_state")
+    refresh_device_list(keep_selection=True)
+    sync_monitor_devices()
+    # tam liste olmadan yazılırsa yüklenmemiş satırlar silinirdi
+    persister.start()
+
+    # Excel sayfalardan önce okunduysa şimdi birleştirilir
+    if pending_inventory is not None:
+        result, pending_inventory = pending_inventory, None
+        handle_inventory_loaded(result)
+    elif not (excel_path and excel_mapping):
+        mark_startup("interactive")
+
+def handle_inventory_loaded(result):
+    global pending_inventory
+    if device_pages is not None:
+        # kayıtlı liste henüz tamamlanmadı: ping durumu eksik taşınmasın
+        pending_inventory = result
+        return
+    if isinstance(result, ValueError):
+        # Excel açılamadı → son kaydedilen liste ile devam et
+        messagebox.showwarning("Excel", f"Excel okunamadı, son kayıtlı liste kullanılıyor:\n\n{result}")
+    else:
+        excel_journal.mark_synced(excel_path)
+        # ping durumu şu anki listeden taşınır: açılıştan beri gelen sonuçlar kaybolmaz
+        merge_excel_devices(result)
+    mark_startup("interactive")
+
+def mark_startup(stage):
+    """Record ``stage`` in ms since process start; logs the timings once interactive."""
+    if stage in startup_times:
+        return
+    startup_times[stage] = (time.perf_counter() - STARTUP_T0) * 1000
+    if stage == "interactive" and sys.stderr is not None:
+        # --noconsole derlemede stderr yok
+        print(
+            "startup: "
+            + " ".join(f"{name}={ms:.0f}ms" for name, ms in startup_times.items())
+            + f" devices={len(devices)}",
+            file=sys.stderr,
+        )
+
+def on_first_paint():
+    if "first_paint" in startup_times:
+        return
+    mark_startup("first_paint")
+    load_background()
+    # 2️⃣ kalan kayıtlı sayfalar Tk turlarına bölünerek eklenir, Excel arka planda
+    # okunur; ikisi de bitince 3️⃣ birleştirilip listeye konur
+    if excel_path and excel_mapping:
+        load_inventory_async()
+    load_next_device_page()
+
+def on_root_mapped(event):
+    # alt bileşenlerin <Map> olayları da root bağına gelir; sadece ana pencere
+    if event.widget is not root:
+        return
+    root.unbind("<Map>")
+    # pencere ekranda; bekleyen geometri / çizim işleri bitince ölçülür
+    root.update_idletasks()
+    on_first_paint()
+
+def handle_excel_sync(result):
+    global excel_sync_error
+
+    if result["error"]:
+        # aynı hatayı her denemede tekrar gösterme
+        if result["error"] != excel_sync_error:
+            excel_sync_error = result["error"]
+            messagebox.showwarning(
+                "Excel",
+                f"Değişiklikler Excel'e yazılamadı, tekrar denenecek:\n\n{result['error']}"
+            )
+        return
+    excel_sync_error = None
+
+    # dosya uygulama dışında değişmiş → bizim değişikliklerle birleşmiş sayfayı al
+    if result["external"] and result["devices"] is not None and not excel_journal.pending:
+        merge_excel_devices(result["devices"])
+
+    if result["conflicts"]:
+        lines = "\n".join(f"{ip}: {reason}" for _, ip, reason in result["conflicts"][:20])
+        messagebox.showwarning(
+            "Excel Çakışması",
+            f"Bazı satırlar Excel'de beklenen yerde değildi:\n\n{lines}"
+        )
+
 def open_mapping_window(excel_headers, on_done):
     messagebox.showinfo(
     "DEBUG",
@@ -806,11 +1156,18 @@ def select_excel_file():
     messagebox.showinfo("DEBUG", "Excel okundu, eşleştirme açılıyor")
 
     def on_mapping_done(mapping):
-        global excel_mapping, devices
+        global excel_mapping
         excel_mapping = mapping
         save_config()
 
-        devices = load_devices_from_excel(excel_path, excel_mapping)
+        try:
+            devices.reset(inventory_cache.load(excel_path, excel_mapping))
+        except ValueError as e:
+            messagebox.showerror("Excel Okuma Hatası", f"Excel okunamadı:\n\n{e}")
+            return
+        excel_journal.mark_synced(excel_path)
+        persister.mark_dirty()
+        sync_monitor_devices()
         refresh_device_list()
 
     root.after(
@@ -818,55 +1175,23 @@ def select_excel_file():
         lambda: open_mapping_window(headers, on_mapping_done))
 # ---------------- DEVICE LIST ----------------
 def extend_selection(direction):
-    items = device_tree.get_children()
-    if not items:
-        return "break"
-
-    sel = device_tree.selection()
-
-    # hiç seçim yoksa → ilk satırı seç
-    if not sel:
-        device_tree.selection_set(items[0])
-        device_tree.focus(items[0])
-        return "break"
-
-    # son seçili satır
-    last = sel[-1]
-    index = items.index(last)
-
-    new_index = index + direction
-    if new_index < 0 or new_index >= len(items):
-        return "break"
-
-    new_item = items[new_index]
-
-    # yeni satırı DAHİL ET
-    device_tree.selection_add(new_item)
-    device_tree.focus(new_item)
-    device_tree.see(new_item)
-
+    # seçime bir satır daha ekle (model sırasına göre, O(1))
+    device_view.move_focus(direction, extend=True)
+    write_ip_from_selection()
     return "break"
 
 def select_all_rows(event=None):
-    items = device_tree.get_children()
-    if not items:
+    if not device_view.rows:
         return "break"
 
-    device_tree.selection_set(items)
-    device_tree.focus(items[0])
-    device_tree.see(items[0])
+    device_view.select_all()
     return "break"
 
     
 def get_selected_devices():
     selected = []
-    for item in device_tree.selection():
-        values = device_tree.item(item)["values"]
-        if not values:
-            continue
-
-        ip = values[1]
-        dev = next((d for d in devices if d["ip"] == ip), None)
+    for ip in device_view.selection_keys():
+        dev = devices.get(ip)
         if dev:
             selected.append(dev)
 
@@ -877,30 +1202,8 @@ def on_tree_arrow(direction):
     return "break"   # 🔴 EN KRİTİK SATIR
     
 def move_selection(direction):
-    items = device_tree.get_children()
-    if not items:
-        return
-
-    sel = device_tree.selection()
-    if sel:
-        index = items.index(sel[0])
-    else:
-        index = 0
-
-    new_index = index + direction
-
-    if new_index < 0 or new_index >= len(items):
-        return
-
-    device_tree.selection_set(items[new_index])
-    device_tree.focus(items[new_index])
-    device_tree.see(items[new_index])
-    def write_ip_from_selection():
-        global started_from_entry
-
-        # 🔴 BİRDEN FAZLA SEÇİM VARSA HİÇBİR ŞEY YAPMA
-        if len(device_tree.selection()) > 1:
-            return
+    if device_view.move_focus(direction) is not None:
+        write_ip_from_selection()
 
 def get_paged_devices(filtered_devices):
     global total_pages
@@ -914,59 +1217,30 @@ def get_paged_devices(filtered_devices):
 
 def refresh_device_list(keep_selection=False):
     # mevcut seçimi hatırla
-    selected_ip = None
-    if keep_selection:
-        sel = device_tree.selection()
-        if sel:
-            selected_ip = device_tree.item(sel[0])["values"][1]
+    selected_ips = device_view.selection_keys() if keep_selection else []
+    focus_ip = device_view.focus_key if keep_selection else None
 
-    device_tree.delete(*device_tree.get_children())
     filtered = [d for d in devices if device_matches_filters(d)]
-    paged_devices = get_paged_devices(filtered)
-
-    for d in paged_devices:
-        if not device_matches_filters(d):
-            continue
-
-        latency_txt = "-" if d.get("latency") is None else f"{d['latency']:.1f}"
-        device_tree.insert(
-            "",
-            tk.END,
-            values=(
-                d.get("device", ""),
-                d.get("ip", ""),
-                latency_txt,
-                d.get("last_ping") or "-",
-                d.get("name", ""),     # 👈 DEVICE NAME
-                d.get("model", ""),
-                d.get("mac", ""),
-                d.get("location", ""),
-                d.get("unit", ""),
-                d.get("description", "")
-            ),
-            tags=(d.get("status", "UNKNOWN"),)
-        )
+    # sanal listede sayfalama yok: tüm filtreli liste, sadece görünen satırlar çizilir
+    rows = filtered if VIRTUAL_LIST else get_paged_devices(filtered)
+
+    # 🔁 anahtar (IP) bazlı fark: sadece değişen satırlara dokunulur
+    device_view.set_rows(rows)
 
     # aynı IP varsa onu tekrar seç
-    if selected_ip:
-        for item in device_tree.get_children():
-            if device_tree.item(item)["values"][1] == selected_ip:
-                device_tree.selection_set(item)
-                device_tree.focus(item)
-                device_tree.see(item)
-                write_ip_from_selection()
-                return
-
-    # yoksa ilk satırı seç
-    items = device_tree.get_children()
-    if items:
-        device_tree.selection_set(items[0])
-        device_tree.focus(items[0])
-        device_tree.see(items[0])
+    still_there = [ip for ip in selected_ips if ip in device_view.key_pos]
+    if still_there:
+        focus = focus_ip if focus_ip in device_view.key_pos else still_there[0]
+        device_view.select(still_there, focus=focus)
         write_ip_from_selection()
+    else:
+        # yoksa ilk satırı seç
+        first = device_view.key_at(0)
+        if first is not None:
+            device_view.select([first], focus=first)
+            write_ip_from_selection()
 
     update_page_label()
-    device_tree.update_idletasks()
     
 
 
@@ -976,15 +1250,16 @@ def write_ip_from_selection():
     if started_from_entry:
         return
 
-    sel = device_tree.selection()
-    if not sel:
+    ip = device_view.focus_key or first_selected_ip()
+    if not ip:
         return
 
     ip_entry.delete(0, tk.END)
-    ip_entry.insert(0, device_tree.item(sel[0])["values"][1])
+    ip_entry.insert(0, ip)
 
 def on_tree_select(event=None):
     global started_from_entry
+    device_view.on_user_select()
     started_from_entry = False   # 👈 kilidi burada açıyoruz
     write_ip_from_selection()
 
@@ -996,6 +1271,7 @@ def on_double_click(event):
 
     device_tree.selection_set(row_id)
     device_tree.focus(row_id)
+    device_view.select([ip_for_item(row_id)], focus=ip_for_item(row_id))
     write_ip_from_selection()
     started_from_entry = False
 
@@ -1028,6 +1304,16 @@ def show_sort_menu(event, col):
         label="Z'den A'ya Sırala",
         command=lambda: sort_devices_by_column(col, reverse=True)
     )
+    # 🔃 mevcut sıralamaya ikincil anahtar olarak ekle (eşitler bu kolona göre)
+    if sort_index.order and sort_index.order[0][0] != col:
+        menu.add_command(
+            label="Sonra Buna Göre (A'dan Z'ye)",
+            command=lambda: sort_devices_by_column(col, reverse=False, then=True)
+        )
+        menu.add_command(
+            label="Sonra Buna Göre (Z'den A'ya)",
+            command=lambda: sort_devices_by_column(col, reverse=True, then=True)
+        )
 
     menu.tk_popup(event.x_root, event.y_root)
 
@@ -1076,6 +1362,64 @@ def start_bulk_ping():
         daemon=True
     ).start()
 
+# ---------------- CONTINUOUS MONITORING ----------------
+def start_monitoring():
+    global monitor_scheduler, monitor_dropped
+
+    if monitor_scheduler and monitor_scheduler.running:
+        return
+    monitor_dropped = 0
+
+    def on_result(ip, ms, kind):
+        ui_queue.put(("MONITOR", ip, ms))
+
+    # config.json → "monitor": {"default_interval": 30, "location_intervals": {...}, ...}
+    monitor_scheduler = ProbeScheduler(on_result, app_config.get("monitor", {}))
+    monitor_scheduler.set_devices(devices)
+    monitor_scheduler.start()
+    update_monitor_status()
+    warning = monitor_scheduler.coverage_warning()
+    if warning:
+        messagebox.showwarning("Sürekli İzleme", warning)
+
+def stop_monitoring():
+    global monitor_scheduler
+
+    if monitor_scheduler:
+        monitor_scheduler.stop()
+        monitor_scheduler = None
+    monitor_status_label.config(text="")
+    persister.flush_soon()
+
+def toggle_monitoring():
+    if monitor_scheduler and monitor_scheduler.running:
+        stop_monitoring()
+    else:
+        start_monitoring()
+
+def sync_monitor_devices():
+    # Excel yenilenince / cihaz düzenlenince izlenen listeyi güncelle
+    if monitor_scheduler and monitor_scheduler.running:
+        monitor_scheduler.set_devices(devices)
+
+def update_monitor_status():
+    if not monitor_scheduler or not monitor_scheduler.running:
+        return
+
+    stats = monitor_scheduler.stats()
+    monitor_status_label.config(
+        text=(
+            f"İzleme: {stats['devices']} cihaz  •  {stats['probes']} ping  •  "
+            f"kayma ort {stats['avg_slip'] * 1000:.0f} ms / maks {stats['max_slip'] * 1000:.0f} ms  •  "
+            f"geciken: {stats['late']}"
+            + (f"  •  atılan ölçüm: {monitor_dropped}" if monitor_dropped else "")
+            + (f"  •  ⚠ gereken {stats['required_rate']:.0f} ping/sn > {stats['capacity']:.0f}"
+               if stats["required_rate"] > stats["capacity"] else "")
+        )
+    )
+
+    root.after(1000, update_monitor_status)
+
 def start_bulk_ping_all_filtered():
     global is_bulk_running, bulk_total, bulk_done
 
@@ -1192,13 +1536,14 @@ def open_add_device_window():
             "status": "UNKNOWN"
         }
 
-        # ✅ 1️⃣ Excel'e yaz
-        from device_loader import add_device_to_excel
-        add_device_to_excel(new_device, excel_path, excel_mapping)
-
-        # ✅ 2️⃣ Excel'den TEKRAR OKU (tek gerçek kaynak)
-        refresh_from_excel()
+        # ✅ 1️⃣ RAM'e ekle, Excel'e arka planda yazılır
+        devices.add(new_device)
+        if excel_path and excel_mapping:
+            excel_journal.add(new_device)
 
+        persister.mark_dirty()
+        sync_monitor_devices()
+        refresh_device_list(keep_selection=True)
         win.destroy()
 
     btns = tk.Frame(win)
@@ -1209,15 +1554,200 @@ def open_add_device_window():
         
     
         
-def show_device_details():
-    sel = device_tree.selection()
-    if not sel:
+def live_row_values(stream):
+    d = devices.get(stream.ip) or {}
+    loss = stream.loss_pct()
+    return (
+        stream.ip,
+        d.get("name") or "",
+        "-" if stream.last_ms is None else f"{stream.last_ms:.1f}",
+        "-" if loss is None else f"{loss:.0f}",
+        stream.sparkline(),
+    )
+
+def refresh_live_rows(ips):
+    if live_tree is None or not live_tree.winfo_exists():
+        return
+    for ip in ips:
+        stream = live_streams.streams.get(ip)
+        if stream is not None and live_tree.exists(ip):
+            live_tree.item(ip, values=live_row_values(stream))
+
+def start_live_streams(devs=None):
+    """Seçilen cihazları canlı izlemeye ekle (bulk ping ile aynı anda çalışabilir)."""
+    devs = get_selected_devices() if devs is None else devs
+    running = sum(1 for d in devs if d["ip"] in live_streams)
+    added = [d["ip"] for d in devs if live_streams.start(d["ip"])]
+    skipped = len(devs) - running - len(added)
+    open_live_window()
+    for ip in added:
+        live_tree.insert("", tk.END, iid=ip, values=live_row_values(live_streams.streams[ip]))
+    if skipped > 0:
+        messagebox.showwarning(
+            "Canlı İzleme",
+            f"En fazla {live_streams.max_streams} cihaz aynı anda izlenebilir; {skipped} cihaz eklenmedi.",
+            parent=live_window,
+        )
+
+def open_live_window():
+    """Her canlı akış bir satır: son ms, kayıp ve son ölçümlerin grafiği."""
+    global live_window, live_tree
+    if live_window is not None and live_window.winfo_exists():
+        live_window.lift()
         return
 
-    item = device_tree.item(sel[0])
-    ip = item["values"][1]
+    win = tk.Toplevel(root)
+    win.title("Canlı İzleme")
+    win.geometry("760x420")
+
+    body = tk.Frame(win)
+    body.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+    columns = ("ip", "name", "ms", "loss", "spark")
+    tree = ttk.Treeview(body, columns=columns, show="headings")
+    for col, text, width in zip(columns, ("IP", "Cihaz Adı", "ms", "Kayıp %", "Son ölçümler"),
+                                (120, 180, 60, 60, 320)):
+        tree.heading(col, text=text)
+        tree.column(col, width=width, anchor="w")
+    scroll = ttk.Scrollbar(body, orient="vertical", command=tree.yview)
+    tree.configure(yscrollcommand=scroll.set)
+    scroll.pack(side=tk.RIGHT, fill=tk.Y)
+    tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+    def stop_selected():
+        for ip in tree.selection():
+            live_streams.stop(ip)
+            tree.delete(ip)
+
+    def close_window():
+        global live_window, live_tree, live_dropped
+        live_streams.stop_all()
+        live_window = live_tree = None
+        live_dropped = 0
+        win.destroy()
+
+    bar = tk.Frame(win)
+    bar.pack(fill=tk.X, padx=10, pady=(0, 10))
+    tk.Button(bar, text="➕ Seçilenleri Ekle", command=start_live_streams).pack(side=tk.LEFT)
+    tk.Button(bar, text="⏹ Seçileni Durdur", command=stop_selected).pack(side=tk.LEFT, padx=6)
+    tk.Button(bar, text="⏹ Tümünü Durdur", command=close_window).pack(side=tk.RIGHT)
+
+    tree.bind("<Delete>", lambda e: stop_selected())
+    win.protocol("WM_DELETE_WINDOW", close_window)
+    live_window, live_tree = win, tree
+
+def open_discovery_window():
+    """CIDR / aralık taraması: canlı ama envanterde olmayanlar ve hiç yanıt vermeyen cihazlar."""
+    win = tk.Toplevel(root)
+    win.title("Ağ Keşfi")
+    win.geometry("640x480")
+    win.transient(root)
+
+    # config.json → "discovery": {"timeout": 1.0, "max_rate": 2000, "max_in_flight": 2000}
+    settings = app_config.get("discovery", {})
+    state = {"sweep": None}
+
+    bar = tk.Frame(win)
+    bar.pack(fill=tk.X, padx=10, pady=(10, 5))
+    tk.Label(bar, text="Aralık:").pack(side=tk.LEFT)
+    target_entry = tk.Entry(bar)
+    target_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=8)
+    typed = ip_entry.get().strip()
+    if "/" in typed or "-" in typed:
+        target_entry.insert(0, typed)
+    run_btn = tk.Button(bar, text="🔍 Tara", width=10)
+    run_btn.pack(side=tk.LEFT)
+
+    status_lbl = tk.Label(win, text="Örnek: 10.0.0.0/22, 10.1.0.1-10.1.0.200, 10.2.0.1-254", anchor="w")
+    status_lbl.pack(fill=tk.X, padx=10)
+
+    body = tk.Frame(win)
+    body.pack(fill=tk.BOTH, expand=True, padx=10, pady=(5, 10))
+    columns = ("kind", "ip", "ms", "name")
+    result_tree = ttk.Treeview(body, columns=columns, show="headings")
+    for col, text, width in zip(columns, ("Durum", "IP", "ms", "Cihaz Adı"), (140, 140, 70, 240)):
+        result_tree.heading(col, text=text)
+        result_tree.column(col, width=width, anchor="w")
+    result_scroll = ttk.Scrollbar(body, orient="vertical", command=result_tree.yview)
+    result_tree.configure(yscrollcommand=result_scroll.set)
+    result_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+    result_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+    def show_results(sweep):
+        state["sweep"] = None
+        run_btn.config(text="🔍 Tara")
+        diff = sweep.diff(devices)
+        result_tree.delete(*result_tree.get_children())
+        for ip, ms in diff["unknown"]:
+            result_tree.insert("", tk.END, values=("Envanterde yok", ip, f"{ms:.1f}", ""))
+
+        # yarıda kesilen taramada taranmamış adresler "yanıt yok" sayılmaz
+        never_alive = [] if sweep.stopped else diff["never_alive"]
+        for d in never_alive:
+            result_tree.insert("", tk.END, values=("Yanıt yok", d.get("ip"), "-", d.get("name") or ""))
+
+        text = (f"{sweep.done} / {len(sweep.space)} adres  •  canlı: {sweep.alive}  •  "
+                f"envanterde yok: {len(diff['unknown'])}")
+        if sweep.stopped:
+            text += "  •  durduruldu"
+        else:
+            text += f"  •  yanıt vermeyen envanter: {len(never_alive)}"
+        status_lbl.config(text=text)
+
+    def poll():
+        sweep = state["sweep"]
+        if sweep is None or not win.winfo_exists():
+            return
+        if sweep.finished_at is None:
+            status_lbl.config(
+                text=f"Taranıyor: {sweep.done} / {len(sweep.space)}  •  canlı: {sweep.alive}  •  "
+                     f"{sweep.controller.throughput():.0f} ping/sn"
+            )
+            win.after(250, poll)
+            return
+        show_results(sweep)
+
+    def toggle_scan():
+        if state["sweep"] is not None:
+            state["sweep"].stop()
+            return
+        limit = settings.get("max_addresses", DEFAULT_DISCOVERY_SETTINGS["max_addresses"])
+        try:
+            space = AddressSpace.parse(target_entry.get(), limit)
+        except ValueError as e:
+            messagebox.showwarning("Uyarı", str(e), parent=win)
+            return
+
+        sweep = DiscoverySweep(space, settings)
+        state["sweep"] = sweep
+        run_btn.config(text="⏹ Durdur")
+        result_tree.delete(*result_tree.get_children())
+        threading.Thread(target=sweep.run, daemon=True).start()
+        poll()
+
+    def add_unknown_host(event=None):
+        item = result_tree.focus()
+        if not item:
+            return
+        kind, ip = result_tree.item(item, "values")[:2]
+        if kind != "Envanterde yok" or ip_exists(ip):
+            return
+        ip_entry.delete(0, tk.END)
+        ip_entry.insert(0, ip)
+        open_add_device_window()
 
-    device = next((d for d in devices if d["ip"] == ip), None)
+    def close_window():
+        if state["sweep"] is not None:
+            state["sweep"].stop()
+        win.destroy()
+
+    run_btn.config(command=toggle_scan)
+    target_entry.bind("<Return>", lambda e: toggle_scan())
+    result_tree.bind("<Double-1>", add_unknown_host)
+    win.protocol("WM_DELETE_WINDOW", close_window)
+    target_entry.focus_set()
+
+def show_device_details():
+    device = devices.get(first_selected_ip())
     if not device:
         return
 
@@ -1250,6 +1780,14 @@ def show_device_details():
             ent.config(state="disabled")
 
         entries[label] = ent
+
+    # 📈 geçmişten: en son ne zaman DOWN oldu (segmentler arka planda okunur)
+    tk.Label(win, text="Son DOWN").grid(row=len(fields), column=0, sticky="w", padx=10, pady=4)
+    down_label = tk.Label(win, text="…" if history else "-")
+    down_label.grid(row=len(fields), column=1, sticky="w", padx=10, pady=4)
+    if history:
+        load_down_since(device["ip"], down_label)
+
     def save_changes():
         new_ip = entries["IP Address"].get().strip()
 
@@ -1274,40 +1812,33 @@ def show_device_details():
         device["location"] = entries["Location"].get()
         device["unit"] = entries["Unit"].get()
         device["description"] = entries["Description"].get()
+        devices.updated(device, old_ip)
 
-        from device_loader import update_device_in_excel
-        update_device_in_excel(
-            old_ip,
-            device,
-            excel_path,
-            excel_mapping
-        )
+        if excel_path and excel_mapping:
+            excel_journal.update(old_ip, device)
 
-        save_devices(devices)
+        persister.mark_dirty()
+        sync_monitor_devices()
         refresh_device_list(keep_selection=True)
         win.destroy()
 
     btns = tk.Frame(win)
-    btns.grid(row=len(fields), column=0, columnspan=2, pady=10)
+    btns.grid(row=len(fields) + 1, column=0, columnspan=2, pady=10)
 
     tk.Button(btns, text="Kaydet", width=12, command=save_changes).pack(side=tk.LEFT, padx=5)
     tk.Button(btns, text="İptal", width=12, command=win.destroy).pack(side=tk.LEFT, padx=5)
 def copy_selected_ip():
-    sel = device_tree.selection()
-    if not sel:
+    ip = first_selected_ip()
+    if not ip:
         return
-    ip = device_tree.item(sel[0])["values"][1]
     root.clipboard_clear()
     root.clipboard_append(ip)
 
 def delete_selected_device():
-    sel = device_tree.selection()
-    if not sel:
+    ip = first_selected_ip()
+    if not ip:
         return
 
-    item = device_tree.item(sel[0])
-    ip = item["values"][1]
-
     answer = messagebox.askyesno(
         "Cihaz Sil",
         f"{ip} adresli cihaz silinsin mi?\n\nBu işlem geri alınamaz."
@@ -1316,12 +1847,14 @@ def delete_selected_device():
     if not answer:
         return
 
-    # 1️⃣ Excel’den sil
-    from device_loader import delete_device_from_excel
-    delete_device_from_excel(ip, excel_path, excel_mapping)
+    # 1️⃣ RAM'den sil, Excel'den arka planda silinir
+    devices.remove_ip(ip)
+    if excel_path and excel_mapping:
+        excel_journal.delete(ip)
 
-    # 2️⃣ Excel’den yeniden yükle
-    refresh_from_excel()
+    persister.mark_dirty()
+    sync_monitor_devices()
+    refresh_device_list(keep_selection=True)
 
 
 def open_filter_window(field):
@@ -1413,6 +1946,7 @@ def open_filter_window(field):
         for val, var in vars_map.items():
             if var.get():
                 active_filters[field].add(val)
+        filter_index.set_filters(active_filters)
 
         refresh_device_list()
         update_column_headers()
@@ -1422,10 +1956,18 @@ def open_filter_window(field):
     tk.Button(bottom, text="OK", width=10, command=apply_filters).pack(side=tk.RIGHT, padx=10)
 
     # ================== VERİLER ==================
-    values = sorted(
-        set(str(d.get(field)) for d in devices if d.get(field)),
-        key=lambda x: tuple(int(p) for p in x.split(".")) if field == "ip" else x.lower()
-    )
+    # değerler ve sayılar indeksten gelir (diğer kolon filtrelerine göre)
+    counts = filter_index.facet_counts(field, active_filters)
+
+    def _sort_key(x):
+        if field == "ip":
+            try:
+                return (0, tuple(int(p) for p in x.split(".")))
+            except ValueError:
+                return (1, x.lower())
+        return x.lower()
+
+    values = sorted(counts, key=_sort_key)
 
     vars_map = {}
     checkbuttons = {}
@@ -1445,7 +1987,7 @@ def open_filter_window(field):
                 continue
 
             var = tk.BooleanVar(value=val in active_filters[field])
-            chk = tk.Checkbutton(scroll_frame, text=val, variable=var)
+            chk = tk.Checkbutton(scroll_frame, text=f"{val} ({counts[val]})", variable=var)
             chk.pack(anchor="w")
 
             vars_map[val] = var
@@ -1471,6 +2013,7 @@ def clear_all_filters():
     # 1️⃣ tüm filtre setlerini boşalt
     for field in active_filters:
         active_filters[field].clear()
+    filter_index.set_filters(active_filters)
 
     # 2️⃣ kolon başlıklarını eski haline döndür
     for col in COLUMN_TO_FIELD:
@@ -1487,6 +2030,7 @@ def clear_single_filter(field):
     global current_page
 
     active_filters[field].clear()
+    filter_index.set_filters(active_filters)
     current_page = 1
     refresh_device_list()
     update_column_headers()
@@ -1502,6 +2046,16 @@ def show_column_menu(event, col):
         label="Z'den A'ya Sırala",
         command=lambda: sort_devices_by_column(col, reverse=True)
     )
+    # 🔃 mevcut sıralamaya ikincil anahtar olarak ekle (eşitler bu kolona göre)
+    if sort_index.order and sort_index.order[0][0] != col:
+        menu.add_command(
+            label="Sonra Buna Göre (A'dan Z'ye)",
+            command=lambda: sort_devices_by_column(col, reverse=False, then=True)
+        )
+        menu.add_command(
+            label="Sonra Buna Göre (Z'den A'ya)",
+            command=lambda: sort_devices_by_column(col, reverse=True, then=True)
+        )
 
     if col in COLUMN_TO_FIELD:
         menu.add_separator()
@@ -1528,12 +2082,28 @@ def show_context_menu(event):
     # Eğer o satır zaten seçiliyse -> HİÇBİR ŞEY YAPMA
     if row_id not in device_tree.selection():
         # değilse sadece o satırı seç (tekli senaryo)
-        device_tree.selection_set(row_id)
-        device_tree.focus(row_id)
+        ip = ip_for_item(row_id)
+        device_view.select([ip], focus=ip)
         write_ip_from_selection()
 
     context_menu.tk_popup(event.x_root, event.y_root)
 
+# ---------------- CONFIG ----------------
+load_config()
+
+# config.json → "ui": {"frame_budget_ms": 12, "queue_max": 100000, "max_output_lines": 500,
+#                      "max_samples": 256, "virtual_list": false, "page_size": 100,
+#                      "value_refresh_s": 2.0}
+ui_settings = dict(DEFAULT_UI_SETTINGS)
+ui_settings.update(app_config.get("ui", {}))
+UI_FRAME_BUDGET = ui_settings["frame_budget_ms"] / 1000
+VALUE_REFRESH_SECONDS = max(0.0, float(ui_settings["value_refresh_s"]))
+ui_queue.maxsize = int(ui_settings["queue_max"])
+ui_queue.max_lines = int(ui_settings["max_output_lines"])
+ui_queue.max_samples = max(1, int(ui_settings["max_samples"]))
+VIRTUAL_LIST = bool(ui_settings["virtual_list"])
+PAGE_SIZE = max(1, int(ui_settings["page_size"]))
+
 # ---------------- UI ----------------
 root = tk.Tk()
 root.title("Ping Monitor")
@@ -1545,8 +2115,9 @@ root.configure(bg=BG_COLOR)
 _ui_assets = load_ui_assets()
 
 # ---------------- BACKGROUND ----------------
-bg_photo = _ui_assets["bg"]
-bg_label = tk.Label(root, image=bg_photo, bg=BG_COLOR, bd=0, highlightthickness=0)
+# resim ilk boyamadan sonra yüklenir (load_background)
+bg_photo = None
+bg_label = tk.Label(root, bg=BG_COLOR, bd=0, highlightthickness=0)
 bg_label.place(x=0, y=0, relwidth=1, relheight=1)
 
 # ---------------- TTK DARK STYLE (Treeview/Scrollbars) ----------------
@@ -1584,15 +2155,36 @@ excel_btn = tk.Button(left_controls, text="📂 Excel Seç", command=select_exce
 style_rounded_button(excel_btn, _ui_assets, wide=True)
 excel_btn.pack(side=tk.LEFT, padx=6)
 
+discovery_btn = tk.Button(left_controls, text="🔍 Keşif", command=open_discovery_window)
+style_rounded_button(discovery_btn, _ui_assets, wide=False)
+discovery_btn.pack(side=tk.LEFT, padx=6)
+
 tk.Label(right_controls, text="Ara:", font=(FONT_NAME, 11), bg=BG_COLOR, fg=FG_COLOR).pack(side=tk.LEFT, padx=(0, 8))
 
 search_container, search_entry = make_rounded_entry(right_controls, _ui_assets["search_bg"], font=(FONT_NAME, 11))
 search_container.pack(side=tk.LEFT)
 
 
+search_after_id = None
+SEARCH_DEBOUNCE_MS = 150
+
 def on_search_change(event=None):
-    global search_text
-    search_text = search_entry.get().strip()
+    # her tuşta değil, yazma durunca ara
+    global search_after_id
+    if search_after_id:
+        root.after_cancel(search_after_id)
+    search_after_id = root.after(SEARCH_DEBOUNCE_MS, apply_search)
+
+def apply_search():
+    global search_text, search_after_id
+    search_after_id = None
+
+    text = search_entry.get().strip()
+    if text == search_text:
+        return
+
+    search_text = text
+    search_index.search(search_text)
     refresh_device_list()
 
 search_entry.bind("<KeyRelease>", on_search_change)
@@ -1679,11 +2271,24 @@ for c in cols:
 device_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 device_tree.update_idletasks()
 
+device_view = VirtualTree(
+    device_tree,
+    key_fn=lambda d: d.get("ip"),
+    values_fn=device_row_values,
+    tags_fn=device_row_tags,
+    virtual=VIRTUAL_LIST,
+    scrollbar=tree_scroll,
+)
+
 bulk_status_label = tk.Label(right, text="", font=(FONT_NAME, 10), bg=BG_COLOR, fg=MUTED_FG)
 bulk_status_label.pack(fill=tk.X, padx=10, pady=(0, 5))
+monitor_status_label = tk.Label(right, text="", font=(FONT_NAME, 10), bg=BG_COLOR, fg=MUTED_FG)
+monitor_status_label.pack(fill=tk.X, padx=10, pady=(0, 5))
 # ---------------- PAGINATION UI ----------------
 pagination = tk.Frame(right, bg=BG_COLOR)
-pagination.pack(fill=tk.X, pady=5)
+if not VIRTUAL_LIST:
+    # sanal listede tüm cihazlar tek listede kaydırılır
+    pagination.pack(fill=tk.X, pady=5)
 
 page_label = tk.Label(pagination, text="Sayfa 1 / 1", bg=BG_COLOR, fg=FG_COLOR)
 page_label.pack(side=tk.LEFT, padx=10)
@@ -1740,11 +2345,12 @@ device_tree.bind("<Control-a>", select_all_rows)
 device_tree.bind("<Command-a>", select_all_rows)  # macOS için
 
 def on_mousewheel(event):
-    device_tree.yview_scroll(int(-1*(event.delta/120)), "units")
+    device_view.scroll(int(-1*(event.delta/120)))
+    return "break"
 
 device_tree.bind("<MouseWheel>", on_mousewheel)        # Windows
-device_tree.bind("<Button-4>", lambda e: device_tree.yview_scroll(-1, "units"))  # Mac
-device_tree.bind("<Button-5>", lambda e: device_tree.yview_scroll(1, "units"))   # Mac
+device_tree.bind("<Button-4>", lambda e: device_view.scroll(-1))  # Mac
+device_tree.bind("<Button-5>", lambda e: device_view.scroll(1))   # Mac
 
 
 device_tree.bind("<Button-3>", show_context_menu)
@@ -1754,12 +2360,12 @@ def ctrl_click_select(event):
     if not row:
         return "break"
 
-    if row in device_tree.selection():
-        device_tree.selection_remove(row)
+    ip = ip_for_item(row)
+    if ip in device_view.selected:
+        device_view.selected.discard(ip)
+        device_view.select([], focus=ip, add=True)
     else:
-        device_tree.selection_add(row)
-
-    device_tree.focus(row)
+        device_view.select([ip], focus=ip, add=True)
     return "break"
 
 device_tree.bind("<Control-Button-1>", ctrl_click_select)
@@ -1769,7 +2375,7 @@ root.bind("<Shift-F10>", show_context_menu)
 def safe_start_ping(event=None):
     if is_bulk_running:
         return
-    if len(device_tree.selection()) > 1:
+    if len(device_view.selected) > 1:
         return
     start_ping(event)
 
@@ -1795,6 +2401,7 @@ context_menu.add_command(
 )
 context_menu.add_command(label="▶ Ping Başlat", command=start_ping_from_menu)
 context_menu.add_command(label="⏹ Ping Durdur", command=stop_ping)
+context_menu.add_command(label="📈 Canlı İzlemeye Ekle", command=start_live_streams)
 context_menu.add_separator()
 context_menu.add_command(
     label="📡 Seçilenlere Toplu Ping",
@@ -1804,6 +2411,10 @@ context_menu.add_command(
     label="🌐 Filtrelenmiş TÜM Cihazlara Ping",
     command=start_bulk_ping_all_filtered
 )
+context_menu.add_command(
+    label="⏱ Sürekli İzleme Başlat / Durdur",
+    command=toggle_monitoring
+)
 context_menu.add_separator()
 
 # 🔴 YENİ EKLENEN
@@ -1819,30 +2430,96 @@ context_menu.add_command(
     command=clear_all_filters
 )
 
-# ---------------- START ----------------
-load_config()
-
-devices = []
-
-cached_devices = load_devices()
+def on_close():
+    # kapanırken tamponlanmış verileri diske yaz
+    bulk_stop_event.set()
+    if monitor_scheduler:
+        monitor_scheduler.stop()
+    if history:
+        history.close()
+    excel_journal.close()
+    if metrics_exporter:
+        metrics_exporter.close()
+    live_streams.close()
+    # yükleme yarıda kaldıysa tam liste yazılsın diye kalan sayfalar okunur
+    drain_device_pages()
+    persister.mark_dirty()
+    persister.close()
+    storage.close()
+    root.destroy()
+
+root.protocol("WM_DELETE_WINDOW", on_close)
 
-if excel_path and excel_mapping:
-    excel_devices = load_devices_from_excel(excel_path, excel_mapping)
-
-    for ex in excel_devices:
-        cached = next((d for d in cached_devices if d.get("ip") == ex.get("ip")), None)
+# ---------------- START ----------------
 
-        if cached:
-            ex["latency"] = cached.get("latency")
-            ex["last_ping"] = cached.get("last_ping")
-            ex["status"] = cached.get("status", "UNKNOWN")
-        else:
-            ex["latency"] = None
-            ex["last_ping"] = None
-            ex["status"] = "UNKNOWN"
+try:
+    # config.json → "history": {"dir": "history", "segment_mb": 16, "max_segments": 32, "lookback_days": 7}
+    history = HistoryStore.from_settings(app_config.get("history"))
+except OSError:
+    history = None
+
+# config.json → "stats": {"window": 120, "slices": 4, "status_source": "last" | "p50" | "p95" | "p99"}
+latency_stats = LatencyStats.from_settings(app_config.get("stats"))
+devices.subscribe(latency_stats)
+
+# config.json → "transitions": {"confirm": 3, "window": 5}  (son 5 sonucun 3'ü → durum değişir)
+transitions = TransitionDetector.from_settings(app_config.get("transitions"))
+devices.subscribe(transitions)
+transitions.subscribe(on_status_change)
+
+# config.json → "live": {"interval": 1.0, "timeout": 2.0, "max_streams": 50, "history": 40}
+live_streams = LiveStreams.from_settings(
+    lambda ip, ms, kind: ui_queue.put(("LIVE", ip, ms)),
+    app_config.get("live"),
+)
 
-        devices.append(ex)
+# config.json → "metrics": {"enabled": false, "host": "127.0.0.1", "port": 9108, "min_interval": 1.0}
+#   GET /metrics (OpenMetrics) ve /metrics.json
+if MetricsExporter.enabled(app_config.get("metrics")):
+    try:
+        metrics_exporter = MetricsExporter.from_settings(
+            lambda: devices,
+            app_config.get("metrics"),
+            stats=latency_stats,
+            get_counters=lambda: bulk_controller.stats() if bulk_controller else {},
+        ).start()
+        devices.subscribe(metrics_exporter)
+    except OSError as e:
+        metrics_exporter = None
+        messagebox.showwarning("Metrics", f"Metrik sunucusu başlatılamadı:\n\n{e}")
+
+# config.json → "storage": {"backend": "sqlite" | "json", "path": "devices.db", "page_size": 5000}
+persistence_settings = app_config.get("persistence", {})
+try:
+    storage = open_storage(app_config.get("storage"), bool(persistence_settings.get("fsync")))
+except (ValueError, sqlite3.Error) as e:
+    messagebox.showwarning("Kayıt", f"Cihaz veritabanı açılamadı, devices.json kullanılıyor:\n\n{e}")
+    storage = JsonDeviceStorage(fsync=bool(persistence_settings.get("fsync")))
+
+# config.json → "persistence": {"flush_interval": 5, "fsync": false}
+#   yazıcı thread'i kayıtlı liste tamamen yüklenince başlar (finish_device_pages)
+persister = DevicePersister.from_settings(lambda: devices, persistence_settings, storage)
+
+# config.json → "excel_journal": {"delay": 1.0, "retry": 10.0}
+excel_journal = ExcelJournal.from_settings(
+    lambda: (excel_path, excel_mapping),
+    app_config.get("excel_journal"),
+    on_result=lambda result: ui_queue.put(("EXCEL_SYNC", None, result)),
+    cache=inventory_cache,
+).start()
+
+# 1️⃣ pencere kayıtlı listenin ilk sayfasıyla hemen çizilir; kalan sayfalar ve Excel
+# ilk boyamadan sonra gelir
+device_pages = storage.iter_pages()
+devices.reset(next(device_pages, []))
+mark_startup("first_page")
 
 refresh_device_list()
 root.after(100, process_ui_queue)
+if app_config.get("monitor", {}).get("autostart"):
+    root.after(500, start_monitoring)
+# after_idle pencere eşlenmeden çalışabilir; ilk boyama <Map> ile ölçülür. Pencere
+# simge durumunda açılırsa (hiç eşlenmez) yükleme yine de başlasın
+root.bind("<Map>", on_root_mapped)
+root.after(2000, on_first_paint)
 root.mainloop()
@@ -0,0 +1,334 @@
+import gzip
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_METRICS_SETTINGS = {
+    "enabled": False,
+    "host": "127.0.0.1",    # dışarıya açmak için "0.0.0.0"
+    "port": 9108,
+    "min_interval": 1.0,    # saniye; değişiklik olsa da yük en fazla bu sıklıkta yeniden üretilir
+}
+
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+JSON_TYPE = "application/json"
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+STATUSES = ("FAST", "NORMAL", "SLOW", "VERY_SLOW", "DOWN", "UNKNOWN")
+
+# cihaz başına aileler, ``_device_openmetrics`` parçalarıyla aynı sırada
+_FAMILIES = (
+    ("pingmonitor_device_up", "1 if the last committed status is not DOWN."),
+    ("pingmonitor_device_status", "Committed status of the device."),
+    ("pingmonitor_device_rtt_seconds", "Round trip time of the last reply."),
+    ("pingmonitor_device_last_probe_timestamp_seconds", "Unix time of the last probe result."),
+    ("pingmonitor_device_rtt_quantile_seconds", "RTT percentiles over the sliding window."),
+    ("pingmonitor_device_jitter_seconds", "RFC 3550 interarrival jitter."),
+    ("pingmonitor_device_loss_ratio", "Packet loss over the sliding window."),
+)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _seconds(ms):
+    return "NaN" if ms is None else repr(ms / 1000)
+
+
+class _Payload:
+    """One rendered body, plus its gzip form made on first request."""
+
+    __slots__ = ("body", "content_type", "_gzipped")
+
+    def __init__(self, body, content_type):
+        self.body = body
+        self.content_type = content_type
+        self._gzipped = None
+
+    def gzipped(self):
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=5)
+        return self._gzipped
+
+
+class MetricsExporter:
+    """Optional HTTP endpoint with per-device status for a monitoring stack.
+
+    ``GET /metrics`` serves OpenMetrics text and ``GET /metrics.json`` the same
+    data as JSON: status, RTT, last probe time, window statistics
+    (``latency_stats``), probe counters and the sweep counters returned by
+    ``get_counters`` (e.g. ``SweepController.stats``).
+
+    Writers only call ``result()`` (two integer increments) when a result is
+    applied; store changes arrive through the ``DeviceStore`` listener calls.
+    A body is rendered on the server thread, only when a scrape finds a
+    newer ``generation`` than the cached one (and at most once per
+    ``min_interval``), from per-device fragments that are themselves only
+    rebuilt for devices that changed. Repeated scrapes are served from
+    memory and neither the probe path nor the Tk thread ever waits for it.
+
+    The last probe is exported as a unix timestamp rather than an age, so
+    the cache stays valid between results; the age is ``time() - value``.
+    """
+
+    def __init__(self, get_devices, stats=None, get_counters=None, host="127.0.0.1",
+                 port=9108, min_interval=1.0):
+        self.get_devices = get_devices
+        self.stats = stats
+        self.get_counters = get_counters or dict   # → {"done": 120, "probes_per_sec": 85.2, ...}
+        self.host = host
+        self.port = int(port)
+        self.min_interval = max(0.0, float(min_interval))
+
+        self.generation = 0
+        self.probes = 0
+        self.failures = 0
+        self.renders = 0
+        self.requests = 0
+        self.last_render_seconds = 0.0
+
+        self._cache = {}          # biçim → (generation, render zamanı, _Payload)
+        self._fragments = {}      # ip → ((cihaz anahtarı, istatistik sürümü), {biçim: hazır parça})
+        self._render_lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @classmethod
+    def from_settings(cls, get_devices, settings=None, stats=None, get_counters=None):
+        cfg = dict(DEFAULT_METRICS_SETTINGS)
+        cfg.update(settings or {})
+        return cls(get_devices, stats, get_counters, cfg["host"], cfg["port"],
+                   cfg["min_interval"])
+
+    @staticmethod
+    def enabled(settings=None):
+        return bool((settings or {}).get("enabled", DEFAULT_METRICS_SETTINGS["enabled"]))
+
+    def touch(self, *args):
+        """Mark the exported state as changed."""
+        self.generation += 1
+
+    def result(self, ms=None):
+        """Count one applied probe result; cheap enough for every result."""
+        self.probes += 1
+        if ms is None:
+            self.failures += 1
+        self.generation += 1
+
+    # ---- DeviceStore listener ----
+    reset = add = remove = update = touch
+
+    # ---------------- sunucu ----------------
+    def start(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                exporter._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="metrics-exporter", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _handle(self, request):
+        path = request.path.split("?", 1)[0]
+        if path == "/metrics":
+            kind = "openmetrics"
+        elif path == "/metrics.json":
+            kind = "json"
+        else:
+            request.send_error(404)
+            return
+
+        self.requests += 1
+        try:
+            payload = self.payload(kind)
+        except Exception as e:
+            request.send_error(500, str(e))
+            return
+
+        body = payload.body
+        gzipped = "gzip" in request.headers.get("Accept-Encoding", "")
+        if gzipped:
+            body = payload.gzipped()
+        request.send_response(200)
+        request.send_header("Content-Type", payload.content_type)
+        request.send_header("Content-Length", str(len(body)))
+        if gzipped:
+            request.send_header("Content-Encoding", "gzip")
+        request.end_headers()
+        request.wfile.write(body)
+
+    # ---------------- yük ----------------
+    def payload(self, kind="openmetrics"):
+        """Cached ``_Payload`` for ``kind``; rendered again only after a change."""
+        cached = self._cache.get(kind)
+        if cached and (cached[0] == self.generation
+                       or time.monotonic() - cached[1] < self.min_interval):
+            return cached[2]
+
+        with self._render_lock:
+            # başka bir istek beklerken üretmiş olabilir
+            cached = self._cache.get(kind)
+            generation = self.generation
+            if cached and cached[0] == generation:
+                return cached[2]
+
+            started = time.perf_counter()
+            rows = self._snapshot(kind)
+            if kind == "json":
+                payload = _Payload(self._render_json(rows, generation), JSON_TYPE)
+            else:
+                payload = _Payload(self._render_openmetrics(rows, generation), OPENMETRICS_TYPE)
+            self._cache[kind] = (generation, time.monotonic(), payload)
+            self.renders += 1
+            self.last_render_seconds = time.perf_counter() - started
+            return payload
+
+    def _snapshot(self, kind):
+        """``(status, fragment)`` per device, reusing fragments of unchanged devices.
+
+        A device's fragment is rendered again only when its name, status,
+        latency, last probe time or window statistics (``stats.version``)
+        differ from the cached ones, so a scrape
+        after a few results costs a dict lookup per device. ``list()`` of the
+        store is atomic under the GIL; device dicts are only read, never
+        locked, so the Tk thread keeps writing while this runs.
+        """
+        render = self._device_json if kind == "json" else self._device_openmetrics
+        cache = self._fragments
+        fresh = {}
+        stamps = {}
+        rows = []
+        stats_version = self.stats.version if self.stats is not None else (lambda ip: 0)
+        for d in list(self.get_devices()):
+            ip = d.get("ip")
+            if not ip or ip in fresh:
+                continue
+            key = (d.get("name") or "", d.get("status") or "UNKNOWN", d.get("latency"),
+                   d.get("last_ping"))
+            stamp = (key, stats_version(ip))
+            entry = cache.get(ip)
+            if entry is None or entry[0] != stamp:
+                entry = (stamp, {})
+            fragment = entry[1].get(kind)
+            if fragment is None:
+                fragment = entry[1][kind] = render(ip, key, self._timestamp(key[3], stamps))
+            fresh[ip] = entry
+            rows.append((key[1], fragment))
+        # çıkarılan cihazların parçaları burada düşer
+        self._fragments = fresh
+        return rows
+
+    @staticmethod
+    def _timestamp(last, stamps):
+        if not last:
+            return None
+        ts = stamps.get(last)
+        if ts is None:
+            # aynı saniyedeki sonuçlar tek kez çözülür
+            try:
+                ts = stamps[last] = datetime.strptime(last, TIME_FORMAT).timestamp()
+            except (TypeError, ValueError):
+                return None
+        return ts
+
+    def _summary(self, ip):
+        summary = self.stats.summary(ip) if self.stats is not None else None
+        return summary if summary and summary["samples"] else None
+
+    def _device_openmetrics(self, ip, key, ts):
+        """One sample line (or "") per device family, in ``_FAMILIES`` order."""
+        name, st, ms, _ = key
+        labels = f'ip="{_label(ip)}",name="{_label(name)}"'
+        up = f"pingmonitor_device_up{{{labels}}} {0 if st in ('DOWN', 'UNKNOWN') else 1}"
+        status = f'pingmonitor_device_status{{{labels},status="{_label(st)}"}} 1'
+        rtt = "" if ms is None else f"pingmonitor_device_rtt_seconds{{{labels}}} {_seconds(ms)}"
+        last = "" if ts is None else f"pingmonitor_device_last_probe_timestamp_seconds{{{labels}}} {ts}"
+        quantile = jitter = loss = ""
+        summary = self._summary(ip)
+        if summary:
+            quantile = "\n".join(
+                f'pingmonitor_device_rtt_quantile_seconds{{{labels},quantile="{q}"}} '
+                f"{_seconds(summary[k])}"
+                for q, k in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99"))
+                if summary[k] is not None
+            )
+            if summary["jitter"] is not None:
+                jitter = f"pingmonitor_device_jitter_seconds{{{labels}}} {_seconds(summary['jitter'])}"
+            loss = f"pingmonitor_device_loss_ratio{{{labels}}} {summary['loss'] / 100}"
+        return up, status, rtt, last, quantile, jitter, loss
+
+    def _device_json(self, ip, key, ts):
+        name, st, ms, _ = key
+        item = {"ip": ip, "name": name, "status": st, "rtt_ms": ms, "last_probe": ts}
+        summary = self._summary(ip)
+        if summary:
+            item.update(p50_ms=summary["p50"], p95_ms=summary["p95"], p99_ms=summary["p99"],
+                        jitter_ms=summary["jitter"], loss_pct=summary["loss"])
+        return json.dumps(item, ensure_ascii=False, separators=(",", ":"))
+
+    def _render_openmetrics(self, rows, generation):
+        out = []
+
+        def family(name, kind, help_text, samples):
+            out.append(f"# TYPE {name} {kind}")
+            out.append(f"# HELP {name} {help_text}")
+            out.extend(samples)
+
+        for i, (name, help_text) in enumerate(_FAMILIES):
+            family(name, "gauge", help_text, [f[i] for _, f in rows if f[i]])
+
+        counts = dict.fromkeys(STATUSES, 0)
+        for st, _ in rows:
+            counts[st] = counts.get(st, 0) + 1
+        family("pingmonitor_devices", "gauge", "Devices per committed status.",
+               [f'pingmonitor_devices{{status="{_label(st)}"}} {n}' for st, n in counts.items()])
+
+        family("pingmonitor_probes", "counter", "Probe results applied.",
+               [f"pingmonitor_probes_total {self.probes}"])
+        family("pingmonitor_probe_failures", "counter", "Probe results without a reply.",
+               [f"pingmonitor_probe_failures_total {self.failures}"])
+        for key, value in sorted(self._counters().items()):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"pingmonitor_sweep_{key}"
+            family(name, "gauge", f"Current bulk sweep: {key}.", [f"{name} {value}"])
+        family("pingmonitor_generation", "gauge", "Exported state version.",
+               [f"pingmonitor_generation {generation}"])
+        out.append("# EOF\n")
+        return "\n".join(out).encode("utf-8")
+
+    def _render_json(self, rows, generation):
+        head = json.dumps({
+            "generated": time.time(),
+            "generation": generation,
+            "probes": self.probes,
+            "failures": self.failures,
+            "sweep": self._counters(),
+        }, ensure_ascii=False, separators=(",", ":"))
+        # cihaz parçaları hazır JSON metni; sadece birleştirilir
+        return (head[:-1] + ',"devices":[' + ",".join(f for _, f in rows) + "]}").encode("utf-8")
+
+    def _counters(self):
+        try:
+            return dict(self.get_counters())
+        except Exception:
+            return {}
@@ -0,0 +1,122 @@
+import sqlite3
+import threading
+import time
+
+from device_storage import JsonDeviceStorage
+
+DEFAULT_PERSISTENCE_SETTINGS = {
+    "flush_interval": 5.0,   # saniye; kirli cihaz varsa en geç bu sürede yazılır
+    "fsync": False,          # True → os.fsync ile diske kadar garanti
+}
+
+
+class DevicePersister:
+    """Coalesce device saves onto a background thread.
+
+    The Tk thread only calls ``mark_dirty``; at most once per
+    ``flush_interval`` the writer thread snapshots the devices and hands them
+    to the storage backend (``device_storage``). Backends that support it
+    (``partial``) get only the devices marked dirty by IP, as one batched
+    transaction; ``devices.json`` is rewritten whole (temp file +
+    ``os.replace``). ``get_devices`` is a callable because ``main.devices`` is
+    rebound on Excel reloads.
+    """
+
+    def __init__(self, get_devices, storage=None, flush_interval=5.0):
+        self.get_devices = get_devices
+        self.storage = storage if storage is not None else JsonDeviceStorage()
+        self.flush_interval = max(0.1, float(flush_interval))
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = set()
+        self._all_dirty = False
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="device-persister", daemon=True)
+
+        self.flushes = 0
+        self.last_flush_seconds = 0.0
+        self.last_error = None
+
+    @classmethod
+    def from_settings(cls, get_devices, settings=None, storage=None):
+        cfg = dict(DEFAULT_PERSISTENCE_SETTINGS)
+        cfg.update(settings or {})
+        if storage is None:
+            storage = JsonDeviceStorage(fsync=bool(cfg["fsync"]))
+        return cls(get_devices, storage, cfg["flush_interval"])
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def mark_dirty(self, ip=None):
+        """Mark one device (or, with no ip, the whole list) as needing a save."""
+        with self._lock:
+            if ip is None:
+                self._all_dirty = True
+            else:
+                self._dirty.add(ip)
+
+    @property
+    def dirty(self):
+        return self._all_dirty or bool(self._dirty)
+
+    def flush_soon(self):
+        """Wake the writer thread instead of waiting for the next interval."""
+        self._wake.set()
+
+    def _take_dirty(self):
+        with self._lock:
+            dirty, all_dirty = self._dirty, self._all_dirty
+            self._dirty = set()
+            self._all_dirty = False
+        return dirty, all_dirty
+
+    def flush(self):
+        """Write now if anything is dirty. Safe to call from any thread."""
+        with self._write_lock:
+            dirty, all_dirty = self._take_dirty()
+            if not dirty and not all_dirty:
+                return False
+
+            started = time.perf_counter()
+            store = self.get_devices()
+            # list()/dict() kopyaları GIL altında atomik; Tk thread'i beklemez
+            if all_dirty or not self.storage.partial:
+                snapshot = [dict(d) for d in list(store)]
+                ips = None
+            else:
+                snapshot = [dict(d) for d in map(store.get, list(dirty)) if d is not None]
+                ips = dirty
+            try:
+                self.storage.save(snapshot, ips)
+            except (OSError, sqlite3.Error) as e:
+                # yazılamadı → kirli işaretini geri koy, sonraki turda tekrar dene
+                self.last_error = e
+                with self._lock:
+                    self._dirty |= dirty
+                    self._all_dirty = self._all_dirty or all_dirty
+                return False
+
+            self.last_error = None
+            self.flushes += 1
+            self.last_flush_seconds = time.perf_counter() - started
+            return True
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stopped:
+                return
+            self.flush()
+
+    def close(self):
+        """Stop the writer thread and do a final synchronous flush."""
+        self._stopped = True
+        self._wake.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self.flush()
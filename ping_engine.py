@@ -0,0 +1,592 @@
+import asyncio
+import ctypes
+import os
+import platform
+import socket
+import struct
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from ping_parser import parse_ping_output
+
+IS_WINDOWS = platform.system().lower() == "windows"
+
+ICMP_ECHO_REPLY = 0
+ICMP_DEST_UNREACHABLE = 3
+ICMP_ECHO_REQUEST = 8
+ICMP_TIME_EXCEEDED = 11
+
+PAYLOAD = b"PingMonitor-probe-0123456789abcdef"
+
+# probe sonucu türleri
+RESULT_OK = "ok"
+RESULT_TIMEOUT = "timeout"
+RESULT_UNREACHABLE = "unreachable"
+RESULT_ERROR = "error"
+
+# subprocess yedeğinde aynı anda en fazla bu kadar ping süreci
+SUBPROCESS_MAX_WORKERS = 64
+
+# "auto" → önce ICMP soketi (Windows'ta IcmpSendEcho2), olmazsa ping.exe / ping komutu
+BACKENDS = ("auto", "icmp", "subprocess")
+probe_backend = "auto"
+
+_engine = None
+_engine_failed = False
+_engine_lock = threading.Lock()
+_fallback_pool = None
+
+
+# ---------------- SUBPROCESS BACKEND (fallback) ----------------
+def ping_command(ip):
+    """Continuous ping command line (until terminated)."""
+    return ["ping", "-t", ip] if IS_WINDOWS else ["ping", ip]
+
+
+def subprocess_ping(ip, timeout=2):
+    """Ping once by spawning the system ping command."""
+    return subprocess_ping_result(ip, timeout)[0]
+
+
+def subprocess_ping_result(ip, timeout=2):
+    """Like ``subprocess_ping`` but returns ``(ms, kind)``."""
+    try:
+        if IS_WINDOWS:
+            cmd = ["ping", "-n", "1", "-w", str(int(timeout * 1000)), ip]
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                startupinfo=startupinfo,
+                creationflags=subprocess.CREATE_NO_WINDOW
+            )
+        else:
+            cmd = ["ping", "-c", "1", ip]
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT
+            )
+
+        try:
+            output, _ = proc.communicate(timeout=timeout + 1)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            return None, RESULT_TIMEOUT
+
+        # ham bayt: konsol kod sayfası (cp857 / cp850 ...) çözülmeden ayrıştırılır
+        samples = parse_ping_output(output).samples
+        if not samples:
+            return None, RESULT_TIMEOUT
+        first = samples[0]
+        if first.kind == RESULT_OK:
+            return first.rtt_us / 1000, RESULT_OK
+        return None, first.kind
+
+    except Exception:
+        return None, RESULT_ERROR
+
+
+# ---------------- ICMP BACKEND ----------------
+def icmp_checksum(data):
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def build_echo_request(ident, seq, payload=PAYLOAD):
+    header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    checksum = icmp_checksum(header + payload)
+    return struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, ident, seq) + payload
+
+
+def _strip_ip_header(packet):
+    # raw soket (ve macOS DGRAM) IP başlığını da verir; Linux DGRAM vermez
+    if len(packet) >= 20 and packet[0] >> 4 == 4:
+        return packet[(packet[0] & 0x0F) * 4:]
+    return packet
+
+
+class IcmpEngine:
+    """Send and receive ICMP echo for many hosts inside one asyncio loop.
+
+    The loop runs on its own daemon thread so the Tk thread and worker threads
+    can submit probes with ``ping`` / ``ping_many`` without blocking each other.
+    Replies are matched back to their request by sequence number (and by
+    identifier on raw sockets, where every ICMP packet on the host is seen).
+    """
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.raw = sock.type == socket.SOCK_RAW
+        self.ident = os.getpid() & 0xFFFF
+        self._seq = 0
+        self._pending = {}
+        self._start()
+
+    def _start(self):
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="icmp-engine", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    @classmethod
+    def open(cls):
+        """Open the cheapest ICMP socket available, or raise OSError."""
+        last_error = None
+        for sock_type in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+            try:
+                sock = socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP)
+            except OSError as e:
+                last_error = e
+                continue
+            sock.setblocking(False)
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+            except OSError:
+                pass
+            return cls(sock)
+        raise last_error or OSError("ICMP soketi açılamadı")
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.add_reader(self.sock.fileno(), self._on_readable)
+        self._ready.set()
+        self._loop.run_forever()
+
+    def close(self):
+        def _stop():
+            self._loop.remove_reader(self.sock.fileno())
+            self._loop.stop()
+
+        self._loop.call_soon_threadsafe(_stop)
+        self._thread.join(timeout=2)
+        self.sock.close()
+
+    # ---- receive ----
+    def _on_readable(self):
+        while True:
+            try:
+                packet, addr = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            self._handle_packet(_strip_ip_header(packet), addr[0], time.perf_counter_ns())
+
+    def _handle_packet(self, icmp, src, recv_ns):
+        if len(icmp) < 8:
+            return
+        icmp_type, _, _, ident, seq = struct.unpack("!BBHHH", icmp[:8])
+
+        if icmp_type == ICMP_ECHO_REPLY:
+            if self.raw and ident != self.ident:
+                return
+            entry = self._pending.get(seq)
+            if entry and entry[2] == src and not entry[0].done():
+                entry[0].set_result(((recv_ns - entry[1]) / 1_000_000, RESULT_OK))
+
+        elif icmp_type in (ICMP_DEST_UNREACHABLE, ICMP_TIME_EXCEEDED) and self.raw:
+            # hata paketi, orijinal isteğin IP başlığı + ilk 8 baytını taşır
+            inner = _strip_ip_header(icmp[8:])
+            if len(inner) < 8:
+                return
+            _, _, _, ident, seq = struct.unpack("!BBHHH", inner[:8])
+            entry = self._pending.get(seq)
+            if ident == self.ident and entry and not entry[0].done():
+                entry[0].set_result((None, RESULT_UNREACHABLE))
+
+    # ---- send ----
+    def _next_seq(self):
+        for _ in range(0x10000):
+            self._seq = (self._seq + 1) & 0xFFFF
+            if self._seq not in self._pending:
+                return self._seq
+        raise RuntimeError("Çok fazla bekleyen ICMP isteği")
+
+    async def _resolve(self, host):
+        try:
+            socket.inet_aton(host)
+            return host
+        except OSError:
+            pass
+        try:
+            infos = await self._loop.getaddrinfo(host, None, family=socket.AF_INET)
+        except OSError:
+            return None
+        return infos[0][4][0] if infos else None
+
+    async def probe(self, host, timeout=2):
+        """Return round-trip time in ms for one echo, or None on timeout/error."""
+        return (await self.probe_result(host, timeout))[0]
+
+    async def probe_result(self, host, timeout=2):
+        """Probe once and return ``(ms, kind)``; kind is one of the RESULT_* values."""
+        addr = await self._resolve(host)
+        if addr is None:
+            return None, RESULT_ERROR
+
+        seq = self._next_seq()
+        fut = self._loop.create_future()
+        packet = build_echo_request(self.ident, seq)
+
+        try:
+            while True:
+                try:
+                    self._pending[seq] = (fut, time.perf_counter_ns(), addr)
+                    self.sock.sendto(packet, (addr, 0))
+                    break
+                except (BlockingIOError, InterruptedError):
+                    # gönderim tamponu dolu → kısa bekle
+                    await asyncio.sleep(0.001)
+            return await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            return None, RESULT_TIMEOUT
+        except OSError:
+            return None, RESULT_ERROR
+        finally:
+            self._pending.pop(seq, None)
+
+    async def sweep(self, hosts, timeout=2, on_result=None, max_in_flight=1000, controller=None):
+        """Probe every host with at most ``max_in_flight`` outstanding echoes.
+
+        With a ``SweepController`` the rate and the in-flight limit are taken
+        from the controller instead.
+        """
+        hosts = iter(hosts)
+        if controller is not None:
+            max_in_flight = controller.max_in_flight
+
+        async def worker():
+            for host in hosts:
+                if controller is not None:
+                    await controller.acquire_async()
+                ms, kind = await self.probe_result(host, timeout)
+                if controller is not None:
+                    controller.release(kind)
+                if on_result:
+                    on_result(host, ms)
+
+        workers = [self._loop.create_task(worker()) for _ in range(max(1, max_in_flight))]
+        await asyncio.gather(*workers)
+
+    # ---- thread-safe entry points ----
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def ping(self, host, timeout=2):
+        return self.submit(self.probe(host, timeout)).result()
+
+    def ping_many(self, hosts, timeout=2, on_result=None, max_in_flight=1000, controller=None):
+        self.submit(self.sweep(hosts, timeout, on_result, max_in_flight, controller)).result()
+
+
+# ---------------- WINDOWS ICMP BACKEND ----------------
+# IcmpSendEcho2 durum kodları (ipexport.h)
+IP_SUCCESS = 0
+IP_REQ_TIMED_OUT = 11010
+# hedef ağ / makine / protokol / port erişilemez, TTL yolda / birleştirmede doldu
+IP_UNREACHABLE_STATUSES = {11002, 11003, 11004, 11005, 11013, 11014}
+ERROR_IO_PENDING = 997
+INFINITE = 0xFFFFFFFF
+
+
+class _IpOptionInformation(ctypes.Structure):
+    _fields_ = [
+        ("Ttl", ctypes.c_ubyte),
+        ("Tos", ctypes.c_ubyte),
+        ("Flags", ctypes.c_ubyte),
+        ("OptionsSize", ctypes.c_ubyte),
+        ("OptionsData", ctypes.c_void_p),
+    ]
+
+
+class _IcmpEchoReply(ctypes.Structure):
+    _fields_ = [
+        ("Address", ctypes.c_uint32),
+        ("Status", ctypes.c_uint32),
+        ("RoundTripTime", ctypes.c_uint32),
+        ("DataSize", ctypes.c_uint16),
+        ("Reserved", ctypes.c_uint16),
+        ("Data", ctypes.c_void_p),
+        ("Options", _IpOptionInformation),
+    ]
+
+
+# bir yanıt + gönderilen veri + ICMP hata mesajı (8 bayt) + IO_STATUS_BLOCK
+REPLY_BUFFER_SIZE = (ctypes.sizeof(_IcmpEchoReply) + len(PAYLOAD) + 8
+                     + 2 * ctypes.sizeof(ctypes.c_void_p))
+
+
+def _set_result(fut, result):
+    if not fut.done():
+        fut.set_result(result)
+
+
+class WindowsIcmpEngine(IcmpEngine):
+    """``IcmpEngine`` on top of the Windows ICMP helper API (IcmpSendEcho2).
+
+    Windows has no unprivileged ICMP socket and raw sockets need an
+    administrator, but iphlpapi works for any user. Echoes are sent
+    asynchronously from one alertable "icmp-apc" thread; Windows runs the
+    completion routine (an APC) on that thread, which hands ``(ms, kind)``
+    to the asyncio loop. ``sweep`` / ``submit`` / ``ping`` are shared with
+    the socket engine and no thread is held while a probe waits.
+
+    IcmpSendEcho2 reports whole milliseconds; a ``0`` is replaced by the
+    locally measured time (at most 1 ms) so LAN latencies keep their
+    fraction.
+    """
+
+    def __init__(self, iphlpapi, kernel32):
+        handle_t = ctypes.c_void_p
+        self._apc_type = ctypes.WINFUNCTYPE(None, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint32)
+        iphlpapi.IcmpCreateFile.restype = handle_t
+        iphlpapi.IcmpCreateFile.argtypes = []
+        iphlpapi.IcmpCloseHandle.argtypes = [handle_t]
+        iphlpapi.IcmpSendEcho2.restype = ctypes.c_uint32
+        iphlpapi.IcmpSendEcho2.argtypes = [
+            handle_t, handle_t, self._apc_type, ctypes.c_void_p, ctypes.c_uint32,
+            ctypes.c_void_p, ctypes.c_uint16, ctypes.c_void_p, ctypes.c_void_p,
+            ctypes.c_uint32, ctypes.c_uint32,
+        ]
+        iphlpapi.IcmpParseReplies.restype = ctypes.c_uint32
+        iphlpapi.IcmpParseReplies.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
+        kernel32.CreateEventW.restype = handle_t
+        kernel32.CreateEventW.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_wchar_p]
+        kernel32.SetEvent.argtypes = [handle_t]
+        kernel32.WaitForSingleObjectEx.restype = ctypes.c_uint32
+        kernel32.WaitForSingleObjectEx.argtypes = [handle_t, ctypes.c_uint32, ctypes.c_int]
+        kernel32.CloseHandle.argtypes = [handle_t]
+
+        handle = iphlpapi.IcmpCreateFile()
+        if not handle or handle == ctypes.c_void_p(-1).value:
+            raise ctypes.WinError(ctypes.get_last_error())
+
+        self.sock = None
+        self.raw = False
+        self.ident = os.getpid() & 0xFFFF
+        self._seq = 0
+        self._pending = {}
+        self._icmp = iphlpapi
+        self._kernel32 = kernel32
+        self._handle = handle
+        self._wake = kernel32.CreateEventW(None, False, False, None)
+        # ctypes geri çağrısı istek bitene kadar yaşamalı
+        self._apc = self._apc_type(self._on_reply)
+        self._requests = deque()
+        self._requests_lock = threading.Lock()
+        self._inflight = {}     # bağlam no → (yanıt tamponu, gönderim ns, future)
+        self._context = 0
+        self._apc_running = True
+        self._start()
+        self._apc_thread = threading.Thread(target=self._apc_loop, name="icmp-apc", daemon=True)
+        self._apc_thread.start()
+
+    @classmethod
+    def open(cls):
+        """Open an ICMP handle, or raise OSError when the API is missing."""
+        try:
+            return cls(ctypes.WinDLL("iphlpapi", use_last_error=True),
+                       ctypes.WinDLL("kernel32", use_last_error=True))
+        except AttributeError as e:
+            raise OSError(f"IcmpSendEcho2 kullanılamıyor: {e}")
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._ready.set()
+        self._loop.run_forever()
+
+    def close(self):
+        self._apc_running = False
+        self._kernel32.SetEvent(self._wake)
+        self._apc_thread.join(timeout=2)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=2)
+        self._icmp.IcmpCloseHandle(self._handle)
+        self._kernel32.CloseHandle(self._wake)
+
+    # ---- icmp-apc thread ----
+    def _apc_loop(self):
+        # uyarılabilir bekleme: biten isteklerin APC'leri burada çalışır,
+        # yeni istekler _wake ile uyandırır
+        while self._apc_running:
+            self._kernel32.WaitForSingleObjectEx(self._wake, INFINITE, True)
+            while True:
+                with self._requests_lock:
+                    if not self._requests:
+                        break
+                    addr, timeout, fut = self._requests.popleft()
+                self._send(addr, timeout, fut)
+
+    def _send(self, addr, timeout, fut):
+        self._context += 1
+        context = self._context
+        buf = ctypes.create_string_buffer(REPLY_BUFFER_SIZE)
+        # IPAddr ağ bayt sırasında bir ULONG
+        dest = int.from_bytes(socket.inet_aton(addr), "little")
+        self._inflight[context] = (buf, time.perf_counter_ns(), fut)
+        sent = self._icmp.IcmpSendEcho2(
+            self._handle, None, self._apc, context, dest, PAYLOAD, len(PAYLOAD), None,
+            buf, len(buf), max(1, int(timeout * 1000)),
+        )
+        if not sent and ctypes.get_last_error() != ERROR_IO_PENDING:
+            del self._inflight[context]
+            self._loop.call_soon_threadsafe(_set_result, fut, (None, RESULT_ERROR))
+
+    def _on_reply(self, context, io_status, reserved):
+        entry = self._inflight.pop(context, None)
+        if entry is None:
+            return
+        buf, sent_ns, fut = entry
+        measured = (time.perf_counter_ns() - sent_ns) / 1_000_000
+
+        if self._icmp.IcmpParseReplies(buf, len(buf)):
+            reply = _IcmpEchoReply.from_buffer(buf)
+            status = reply.Status
+        else:
+            reply = None
+            status = ctypes.get_last_error()
+
+        if status == IP_SUCCESS and reply is not None:
+            result = (float(reply.RoundTripTime) or min(measured, 1.0), RESULT_OK)
+        elif status == IP_REQ_TIMED_OUT:
+            result = (None, RESULT_TIMEOUT)
+        elif status in IP_UNREACHABLE_STATUSES:
+            result = (None, RESULT_UNREACHABLE)
+        else:
+            result = (None, RESULT_ERROR)
+        self._loop.call_soon_threadsafe(_set_result, fut, result)
+
+    # ---- send ----
+    async def probe_result(self, host, timeout=2):
+        """Probe once and return ``(ms, kind)``; kind is one of the RESULT_* values."""
+        addr = await self._resolve(host)
+        if addr is None:
+            return None, RESULT_ERROR
+
+        fut = self._loop.create_future()
+        with self._requests_lock:
+            self._requests.append((addr, timeout, fut))
+        self._kernel32.SetEvent(self._wake)
+        try:
+            # zaman aşımını IcmpSendEcho2 bildirir; bu sadece emniyet payı
+            return await asyncio.wait_for(fut, timeout + 1)
+        except asyncio.TimeoutError:
+            return None, RESULT_TIMEOUT
+
+
+def set_backend(name):
+    global probe_backend
+    probe_backend = name if name in BACKENDS else "auto"
+
+
+def get_engine():
+    """Return the shared ICMP engine, or None when the subprocess backend applies."""
+    global _engine, _engine_failed
+
+    if probe_backend == "subprocess":
+        return None
+
+    with _engine_lock:
+        if _engine is None and not _engine_failed:
+            try:
+                # Windows'ta ICMP DGRAM yok, raw soket de yönetici ister → IcmpSendEcho2
+                _engine = (WindowsIcmpEngine if IS_WINDOWS else IcmpEngine).open()
+            except OSError:
+                _engine_failed = True
+        return _engine
+
+
+def ping(ip, timeout=2):
+    """Ping once using the configured backend. Returns ms or None."""
+    engine = get_engine()
+    if engine is not None:
+        return engine.ping(ip, timeout)
+    return subprocess_ping(ip, timeout)
+
+
+def ping_many(ips, on_result, timeout=2, max_in_flight=1000, controller=None):
+    """Ping all ips and call ``on_result(ip, ms)`` as each one finishes.
+
+    ``ips`` may be any iterable; it is consumed lazily by both backends.
+    """
+    engine = get_engine()
+    if engine is not None:
+        engine.ping_many(ips, timeout, on_result, max_in_flight, controller)
+        return
+
+    if controller is not None:
+        max_in_flight = controller.max_in_flight
+
+    # iş parçacıkları ortak iteratörden çeker → ips tembel bir üreteç olabilir
+    ips = iter(ips)
+    ips_lock = threading.Lock()
+
+    def worker():
+        while True:
+            with ips_lock:
+                ip = next(ips, None)
+            if ip is None:
+                return
+            if controller is not None:
+                controller.acquire()
+            ms, kind = subprocess_ping_result(ip, timeout)
+            if controller is not None:
+                controller.release(kind)
+            on_result(ip, ms)
+
+    workers = max(1, min(max_in_flight, SUBPROCESS_MAX_WORKERS))
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def submit_probe(ip, callback, timeout=2):
+    """Start one probe without blocking; ``callback(ip, ms, kind)`` runs on completion.
+
+    With the ICMP engine the probe is a coroutine on the engine loop, so no
+    thread is held while waiting. The subprocess backend uses a shared,
+    bounded thread pool.
+    """
+    global _fallback_pool
+
+    engine = get_engine()
+    if engine is not None:
+        fut = engine.submit(engine.probe_result(ip, timeout))
+
+        def _done(f):
+            try:
+                ms, kind = f.result()
+            except Exception:
+                ms, kind = None, RESULT_ERROR
+            callback(ip, ms, kind)
+
+        fut.add_done_callback(_done)
+        return fut
+
+    with _engine_lock:
+        if _fallback_pool is None:
+            _fallback_pool = ThreadPoolExecutor(
+                max_workers=SUBPROCESS_MAX_WORKERS,
+                thread_name_prefix="ping"
+            )
+
+    def _run():
+        ms, kind = subprocess_ping_result(ip, timeout)
+        callback(ip, ms, kind)
+
+    return _fallback_pool.submit(_run)
@@ -0,0 +1,236 @@
+import re
+from collections import namedtuple
+
+# sonuç türleri ping_engine ile aynı
+RESULT_OK = "ok"
+RESULT_TIMEOUT = "timeout"
+RESULT_UNREACHABLE = "unreachable"
+RESULT_ERROR = "error"
+
+PingSample = namedtuple("PingSample", "seq ttl rtt_us kind")
+PingSummary = namedtuple("PingSummary", "sent received loss_pct min_ms avg_ms max_ms")
+PingReport = namedtuple("PingReport", "samples summary")
+
+# Tek bir desen, satır türleri alternatif dallar. Yerelleştirilmiş Windows
+# metinleri kod sayfasına göre farklı baytlara dönüşür (cp857 / cp850 /
+# UTF-8), bu yüzden sadece ASCII parçalar aranır: yanıt satırı dilden
+# bağımsız olarak "<n>ms TTL=<n>" ile, özetler "= n, ... = n" yapısıyla bulunur.
+# IGNORECASE kullanılmıyor (tarama ~1.6x yavaşlıyor); büyük/küçük harf
+# farkı olan yerler desende açıkça yazılı.
+_UNIX_REPLY_PATTERN = r"""
+    # iputils / busybox / BSD yanıtı: icmp_seq=1 ttl=64 time=0.045 ms
+    (?:icmp_)?seq=(?P<seq>\d+)(?:\s+ttl=(?P<ttl>\d+))?\s+time[=<](?P<time>\d+(?:\.\d+)?)\s*ms
+"""
+_WIN_REPLY_PATTERN = r"""
+    # Windows yanıtı (her dil): time=3ms / süre<1ms / temps=13 ms  TTL=128
+    [=<]\s?(?P<wtime>\d+(?:[.,]\d+)?)\s?ms\s+TTL=(?P<wttl>\d+)
+"""
+_REPLY_PATTERN = _UNIX_REPLY_PATTERN + "  |" + _WIN_REPLY_PATTERN
+
+_PATTERN = _REPLY_PATTERN + r"""
+  | # iputils: From 10.0.0.254 icmp_seq=3 Destination Host Unreachable
+    (?:icmp_)?seq=(?P<useq>\d+)\s+[^\r\n]*?(?:[Uu]nreachable|exceeded)
+  | # BSD / macOS: Request timeout for icmp_seq 5 — iputils -O: no answer yet for icmp_seq=2
+    (?:Request\ timeout\ for\ icmp_seq\ |no\ answer\ yet\ for\ icmp_seq=)(?P<tseq>\d+)
+  | (?P<timeout>Request\ timed\ out|zaman\ a|berschreitung|lai\ d.attente
+        |de\ espera\ agotado|tempo\ limite|Richiesta\ scaduta)
+  | (?P<unreach>[Uu]nreachable|ula\S{1,4}lam|nicht\ erreichbar|Impossible\ de\ joindre
+        |inaccesible|inacess|irraggiungibile|TTL\ expired|TTL\ s\S{1,3}resi)
+  | (?P<failure>General\ failure|Genel\ hata|Allgemeiner\ Fehler|faillance\ g|Error\ general)
+  | # özet (iputils / busybox / BSD)
+    (?P<tx>\d+)\ packets\ transmitted,\ (?P<rx>\d+)\ (?:packets\ )?received
+  | min/avg/max(?:/\w+)?\ =\ (?P<rmin>[\d.]+)/(?P<ravg>[\d.]+)/(?P<rmax>[\d.]+)
+  | # özet (Windows, her dil): Sent = 4, Received = 4, Lost = 0 (0% loss)
+    =\ ?(?P<wsent>\d+),[^=\r\n]*=\ ?(?P<wrecv>\d+),[^=\r\n]*=\ ?\d+\ ?\(
+  | # Minimum = 1ms, Maximum = 3ms, Average = 2ms  (sıra her dilde aynı)
+    =\ ?(?P<wmin>\d+)\ ?ms,[^=\r\n]*=\ ?(?P<wmax>\d+)\ ?ms,[^=\r\n]*=\ ?(?P<wavg>\d+)\ ?ms
+"""
+
+_TEXT_RE = re.compile(_PATTERN, re.VERBOSE)
+_BYTES_RE = re.compile(_PATTERN.encode("utf-8"), re.VERBOSE)
+# parse_ping_line özetleri zaten atlar; onları aramayan desen daha hızlı tarar
+_SAMPLE_PATTERN = _PATTERN[:_PATTERN.index("  | # özet")]
+_TEXT_SAMPLE_RE = re.compile(_SAMPLE_PATTERN, re.VERBOSE)
+_BYTES_SAMPLE_RE = re.compile(_SAMPLE_PATTERN.encode("utf-8"), re.VERBOSE)
+# extract_ping_ms sadece yanıtı arar
+_TEXT_REPLY_RE = re.compile(_REPLY_PATTERN, re.VERBOSE)
+_BYTES_REPLY_RE = re.compile(_REPLY_PATTERN.encode("utf-8"), re.VERBOSE)
+
+# Örnek dallarının her birinde geçen ASCII parçalar. Büyük desen her konumda
+# tüm dalları denediği için bunları içermeyen satırlar (başlık, boş satır,
+# istatistik) hiç taranmaz; düz metin alternatifi C tarafında hızlı aranır.
+# Desene yeni bir kelime eklenirse buraya da eklenmeli.
+_SAMPLE_HINTS = (
+    "seq", "TTL", "Request t", "zaman a", "berschreitung", "lai d", "agotado",
+    "tempo limite", "scaduta", "nreachable", "ula", "erreichbar", "joindre", "inacc",
+    "inacess", "irraggiungibile", "General failure", "Genel hata", "Fehler",
+    "faillance", "Error general",
+)
+# parse_ping_output özetleri de arar: hepsinde "=" ya da "transmitted" geçer
+_LINE_HINTS = _SAMPLE_HINTS + ("=", "transmitted")
+_TEXT_SAMPLE_HINT_RE = re.compile("|".join(map(re.escape, _SAMPLE_HINTS)))
+_BYTES_SAMPLE_HINT_RE = re.compile(_TEXT_SAMPLE_HINT_RE.pattern.encode("ascii"))
+_TEXT_LINE_HINT_RE = re.compile("|".join(map(re.escape, _LINE_HINTS)))
+_BYTES_LINE_HINT_RE = re.compile(_TEXT_LINE_HINT_RE.pattern.encode("ascii"))
+
+
+def _num(value):
+    if isinstance(value, bytes):
+        value = value.decode("ascii")
+    return float(value.replace(",", "."))
+
+
+_SUMMARY_KINDS = frozenset(("rx", "rmax", "wrecv", "wavg"))
+
+
+def _sample(m, n):
+    """PingSample for a reply / error match; ``n`` numbers Windows lines."""
+    kind = m.lastgroup
+    g = m.group
+    if kind == "time":
+        ttl = g("ttl")
+        return PingSample(int(g("seq")), int(ttl) if ttl else None,
+                          round(_num(g("time")) * 1000), RESULT_OK)
+    if kind == "wttl":
+        return PingSample(n, int(g("wttl")), round(_num(g("wtime")) * 1000), RESULT_OK)
+    if kind == "useq":
+        return PingSample(int(g("useq")), None, None, RESULT_UNREACHABLE)
+    if kind == "tseq":
+        return PingSample(int(g("tseq")), None, None, RESULT_TIMEOUT)
+    if kind == "timeout":
+        return PingSample(n, None, None, RESULT_TIMEOUT)
+    if kind == "unreach":
+        return PingSample(n, None, None, RESULT_UNREACHABLE)
+    return PingSample(n, None, None, RESULT_ERROR)
+
+
+# Hızlı yol: yaygın yanıt satırında eşleşmenin yeri str.find ile bulunur ve
+# sadece o dalın deseni oradan denenir (tüm satırı büyük desenle taramak
+# eski extract_ping_ms'ten ~2x yavaştı). Olmazsa satır tam taramaya düşer.
+_TEXT_FAST = (
+    re.compile(_WIN_REPLY_PATTERN, re.VERBOSE),
+    re.compile(_UNIX_REPLY_PATTERN, re.VERBOSE),
+    "TTL=", "seq=",
+)
+_BYTES_FAST = (
+    re.compile(_WIN_REPLY_PATTERN.encode("utf-8"), re.VERBOSE),
+    re.compile(_UNIX_REPLY_PATTERN.encode("utf-8"), re.VERBOSE),
+) + tuple(s.encode("ascii") for s in _TEXT_FAST[2:])
+# Windows yanıtında "=" / "<" işaretinin TTL='den en fazla bu kadar önce
+# olduğu varsayılır ("=1234,5 ms  TTL="); daha uzunsa tam tarama yapılır
+_WIN_REPLY_SPAN = 16
+
+
+def _fast_reply(line):
+    """Reply match found near a ``find`` hit, or None."""
+    win_re, unix_re, wttl, seq_ = _TEXT_FAST if isinstance(line, str) else _BYTES_FAST
+
+    t = line.find(seq_)
+    if t >= 0:
+        # iputils / busybox / BSD: icmp_seq=1 ttl=64 time=0.045 ms
+        return unix_re.match(line, t)
+
+    t = line.find(wttl)
+    if t > 0:
+        # Windows (her dil): =3ms TTL=128 / <1ms TTL=128 / =13 ms  TTL=128.
+        # Eşleşme ilk TTL='de biter ve içinde başka "=" / "<" olmaz; bu yüzden
+        # pencerede bulunan eşleşme tam taramanınkiyle aynıdır.
+        m = win_re.search(line, max(0, t - _WIN_REPLY_SPAN))
+        if m is not None and m.start() < t:
+            return m
+    return None
+
+
+def _reply_ms(m):
+    if m.lastgroup == "time":
+        return float(m["time"])
+    return _num(m["wtime"])
+
+
+def parse_ping_output(data):
+    """Parse ping output (``str`` or raw ``bytes``) line by line.
+
+    Returns ``PingReport(samples, summary)``. Each sample is
+    ``PingSample(seq, ttl, rtt_us, kind)``; Windows prints no sequence
+    numbers, so those samples are numbered 1, 2, ... in order. ``time<1ms``
+    is reported as 1000 µs like the old ``extract_ping_ms``. ``summary`` is
+    taken from the statistics lines when present, otherwise derived from the
+    samples (min/avg/max then come from the replies seen).
+    """
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    if isinstance(data, (bytes, bytearray)):
+        regex, hint = _BYTES_RE, _BYTES_LINE_HINT_RE
+    else:
+        regex, hint = _TEXT_RE, _TEXT_LINE_HINT_RE
+    samples = []
+    sent = received = None
+    rtt = None
+
+    for line in data.splitlines():
+        m = _fast_reply(line)
+        if m is not None:
+            samples.append(_sample(m, len(samples) + 1))
+            continue
+        if hint.search(line) is None:
+            continue
+        for m in regex.finditer(line):
+            kind = m.lastgroup
+            if kind in _SUMMARY_KINDS:
+                g = m.group
+                if kind == "rx":
+                    sent, received = int(g("tx")), int(g("rx"))
+                elif kind == "wrecv":
+                    sent, received = int(g("wsent")), int(g("wrecv"))
+                elif kind == "rmax":
+                    rtt = (_num(g("rmin")), _num(g("ravg")), _num(g("rmax")))
+                else:
+                    rtt = (_num(g("wmin")), _num(g("wavg")), _num(g("wmax")))
+            else:
+                samples.append(_sample(m, len(samples) + 1))
+
+    if sent is None:
+        sent = len(samples)
+        received = sum(1 for s in samples if s.kind == RESULT_OK)
+    if rtt is None:
+        times = [s.rtt_us / 1000 for s in samples if s.rtt_us is not None]
+        if times:
+            rtt = (min(times), sum(times) / len(times), max(times))
+
+    loss = round(100.0 * (sent - received) / sent, 1) if sent else None
+    summary = PingSummary(sent, received, loss, *(rtt or (None, None, None)))
+    return PingReport(samples, summary)
+
+
+def parse_ping_line(line, n=1):
+    """First sample in one line of live output, or None (headers, summaries).
+
+    ``n`` is used as the sequence number for Windows lines, which have none.
+    """
+    m = _fast_reply(line)
+    if m is not None:
+        return _sample(m, n)
+    if isinstance(line, (bytes, bytearray)):
+        regex, hint = _BYTES_SAMPLE_RE, _BYTES_SAMPLE_HINT_RE
+    else:
+        regex, hint = _TEXT_SAMPLE_RE, _TEXT_SAMPLE_HINT_RE
+    if hint.search(line) is None:
+        return None
+    m = regex.search(line)
+    return _sample(m, n) if m is not None else None
+
+
+def extract_ping_ms(text):
+    """Round-trip time in ms of the first reply in ``text``, or None."""
+    m = _fast_reply(text)
+    if m is not None:
+        return _reply_ms(m)
+    if isinstance(text, (bytes, bytearray)):
+        regex, hints = _BYTES_REPLY_RE, (b"TTL=", b"time")
+    else:
+        regex, hints = _TEXT_REPLY_RE, ("TTL=", "time")
+    # her yanıt desende "TTL=" ya da "time" geçer; diğer satırlar regex'e girmez
+    if hints[0] not in text and hints[1] not in text:
+        return None
+    m = regex.search(text)
+    return _reply_ms(m) if m is not None else None
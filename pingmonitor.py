@@ -0,0 +1,481 @@
+"""Headless ping engine and command line entry point (no Tk needed).
+
+    python -m pingmonitor sweep   [--config config.json] [-o results.jsonl]
+    python -m pingmonitor monitor [--config config.json] [--duration 3600] [--metrics-port 9108]
+
+    python -m pingmonitor discover 10.0.0.0/22 10.1.0.1-10.1.0.200
+    python -m pingmonitor export backup.json   /   import devices.json
+
+All commands load the same ``config.json`` / Excel inventory as the GUI and
+write JSON Lines to stdout or ``--output``: one object per probe result
+(``--events``: per status change, with ``from`` / ``to``), or for
+``discover`` one per unknown live host / inventory device that never
+answered.
+The saved device state (``devices.db``, see ``device_storage``) and the
+history log are kept up to date like in the GUI unless ``--no-save`` is
+given, in which case (and for ``discover``) the store is only read, never
+created or migrated; ``export`` / ``import`` convert it from / to the
+``devices.json`` format. Relative paths in the config are resolved
+from the config file's directory, so the CLI can run from anywhere (systemd).
+"""
+import argparse
+import json
+import os
+import signal
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+import ping_engine
+from device_loader import DEVICES_JSON
+from device_storage import export_json, import_json, open_storage
+from device_store import DeviceStore
+from discovery import AddressSpace, DiscoverySweep, DEFAULT_DISCOVERY_SETTINGS
+from filter_index import FilterIndex
+from history_store import HistoryStore
+from inventory_cache import InventoryCache, CACHE_FILE
+from metrics_exporter import MetricsExporter
+from latency_stats import LatencyStats, status_by_latency
+from persistence import DevicePersister
+from scheduler import ProbeScheduler
+from sharded_sweep import ShardedSweep, run_worker_if_requested, should_shard
+from sweep_control import SweepController
+from transitions import TransitionDetector
+
+CONFIG_FILE = "config.json"
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# JSON satırına cihazdan kopyalanan alanlar
+RECORD_FIELDS = ("name", "device", "location", "unit")
+
+
+def apply_result(device, ms, now, stats=None, transitions=None, immediate=False):
+    """Write one probe result into the device dict and return its status.
+
+    With a ``LatencyStats`` the result is added to the device's window and
+    the status comes from ``stats.classify`` (percentile / loss based when
+    configured). With a ``TransitionDetector`` that status is only a
+    candidate: ``device["status"]`` changes when the detector confirms it.
+    """
+    device["latency"] = ms
+    device["last_ping"] = now
+    if stats is None:
+        status = status_by_latency(ms)
+    else:
+        status = stats.classify(stats.record(device.get("ip"), ms), ms)
+    if transitions is None:
+        device["status"] = status
+    else:
+        transitions.observe(device, status, ms, now, immediate)
+    return device["status"]
+
+
+def apply_sweep_results(devices, results, stats=None, transitions=None):
+    """Merge ``ShardedSweep.run()`` output into ``devices`` in one pass.
+
+    Returns ``(ip, ms, status, ts)`` for every address still in ``devices``.
+    Results of one sweep share a handful of seconds, so the formatted
+    ``last_ping`` text is cached per second.
+    """
+    stamps = {}
+    applied = []
+    get = devices.get
+    for ip, ms, ts in results:
+        d = get(ip)
+        if d is None:
+            continue
+        sec = int(ts)
+        now = stamps.get(sec)
+        if now is None:
+            now = stamps[sec] = time.strftime(TIME_FORMAT, time.localtime(sec))
+        applied.append((ip, ms, apply_result(d, ms, now, stats, transitions, immediate=True), ts))
+    return applied
+
+
+def carry_ping_state(excel_devices, previous):
+    """Copy latency / last_ping / status from ``previous`` onto freshly parsed rows.
+
+    ``previous`` is anything with ``get(ip)`` (a ``DeviceStore``).
+    """
+    for ex in excel_devices:
+        old = previous.get(ex.get("ip"))
+
+        if old:
+            ex["latency"] = old.get("latency")
+            ex["last_ping"] = old.get("last_ping")
+            ex["status"] = old.get("status", "UNKNOWN")
+        else:
+            ex["latency"] = None
+            ex["last_ping"] = None
+            ex["status"] = "UNKNOWN"
+    return excel_devices
+
+
+def read_config(path=CONFIG_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_inventory(config, cache=None, storage=None):
+    """Device list the GUI would show: Excel (via the snapshot) + saved ping state.
+
+    Without a configured workbook the saved list (``storage``, see
+    ``device_storage``) is used as is. Raises ``ValueError`` when the
+    configured workbook cannot be read.
+    """
+    storage = storage or open_storage(config.get("storage"))
+    saved = DeviceStore(storage.load())
+    excel_path = config.get("excel_path")
+    mapping = config.get("excel_mapping")
+    if not excel_path or not mapping or not os.path.exists(excel_path):
+        return saved
+
+    cache = cache or InventoryCache(CACHE_FILE)
+    return DeviceStore(carry_ping_state(cache.load(excel_path, mapping), saved))
+
+
+class PingMonitor:
+    """Sweep / continuous monitoring over a ``DeviceStore`` without any UI.
+
+    Results from the probe threads are applied under one lock: the device is
+    updated, the history log and persister are told, and ``emit`` gets a
+    JSON-ready record. ``metrics`` is an optional ``MetricsExporter``;
+    ``active`` is the running controller / scheduler whose ``stats()`` it
+    exports as sweep counters.
+    """
+
+    def __init__(self, devices, config=None, history=None, persister=None, emit=None,
+                 events_only=False):
+        self.devices = devices
+        self.config = config or {}
+        self.history = history
+        self.persister = persister
+        self.emit = emit
+        self.events_only = events_only
+        # config.json → "stats": {"window": 120, "status_source": "p95", ...}
+        self.stats = LatencyStats.from_settings(self.config.get("stats"))
+        # config.json → "transitions": {"confirm": 3, "window": 5}
+        self.transitions = TransitionDetector.from_settings(self.config.get("transitions"))
+        self.transitions.subscribe(self._on_transition)
+        self.metrics = None
+        self.active = None
+        self.results = 0
+        self.down = 0
+        self._lock = threading.Lock()
+
+    def record(self, ip, ms, kind=None, immediate=False):
+        now = datetime.now()
+        with self._lock:
+            d = self.devices.get(ip)
+            if d is None:
+                return
+            status = apply_result(d, ms, now.strftime(TIME_FORMAT), self.stats,
+                                  self.transitions, immediate)
+            self._recorded(ip, d, ms, status, now, kind)
+
+    def _on_transition(self, event):
+        # cihaz kaydı sadece durum değişince kirlenir; ölçüm değerleri kapanışta yazılır
+        if self.persister:
+            self.persister.mark_dirty(event.ip)
+        if self.emit and self.events_only:
+            d = self.devices.get(event.ip) or {}
+            rec = {"ts": datetime.now().astimezone().isoformat(timespec="milliseconds"),
+                   "ip": event.ip}
+            for k in RECORD_FIELDS:
+                rec[k] = d.get(k)
+            rec["rtt_ms"] = event.ms
+            rec["from"] = event.old
+            rec["to"] = event.new
+            self.emit(rec)
+
+    def _recorded(self, ip, d, ms, status, now, kind=None):
+        self.results += 1
+        if ms is None:
+            self.down += 1
+        if self.history:
+            self.history.append(ip, ms, status, now.timestamp())
+        if self.metrics:
+            self.metrics.result(ms)
+        if self.emit and not self.events_only:
+            rec = {"ts": now.astimezone().isoformat(timespec="milliseconds"), "ip": ip}
+            for k in RECORD_FIELDS:
+                rec[k] = d.get(k)
+            rec["rtt_ms"] = ms
+            rec["status"] = status
+            summary = self.stats.summary(ip)
+            if summary and summary["samples"] > 1:
+                for k in ("p50", "p95", "p99", "jitter", "loss"):
+                    rec[k] = None if summary[k] is None else round(summary[k], 3)
+            if kind is not None:
+                rec["kind"] = kind
+            self.emit(rec)
+
+    def sweep(self, devices=None, timeout=2, processes=None):
+        """Ping every device once (adaptive concurrency) and return controller stats.
+
+        Large sweeps (``sweep.shard_threshold`` targets and more) are split
+        across ``processes`` worker processes, see ``sharded_sweep``.
+        """
+        targets = self.devices if devices is None else devices
+        settings = self.config.get("sweep", {})
+        if processes != 1 and (processes or should_shard(len(targets), settings)):
+            return self._sweep_sharded(targets, timeout, settings, processes)
+
+        controller = self.active = SweepController(**settings)
+        # tek seferlik tarama: histerezis beklemeden durum güncellenir
+        ping_engine.ping_many([d["ip"] for d in targets],
+                              lambda ip, ms: self.record(ip, ms, immediate=True),
+                              timeout=timeout, controller=controller)
+        controller.finish()
+        return controller.stats()
+
+    def _sweep_sharded(self, targets, timeout, settings, processes):
+        sweep = self.active = ShardedSweep([d["ip"] for d in targets], timeout, settings,
+                                           processes, ping_engine.probe_backend)
+        results = sweep.run()
+        with self._lock:
+            for ip, ms, status, ts in apply_sweep_results(self.devices, results, self.stats,
+                                                          self.transitions):
+                self._recorded(ip, self.devices.get(ip), ms, status, datetime.fromtimestamp(ts))
+        return sweep.stats()
+
+    def discover(self, space, devices=None, settings=None, stop_event=None):
+        """Sweep an ``AddressSpace`` and reconcile it with the inventory.
+
+        ``emit`` gets ``{"kind": "unknown", ...}`` for live hosts missing from
+        the inventory and ``{"kind": "never_alive", ...}`` for inventory
+        devices in the range that never answered. Device state is not touched.
+        """
+        cfg = dict(self.config.get("discovery", {}))
+        cfg.update(settings or {})
+        sweep = DiscoverySweep(space, cfg)
+        if stop_event is not None:
+            watcher = threading.Thread(target=lambda: stop_event.wait() and sweep.stop(), daemon=True)
+            watcher.start()
+        sweep.run()
+
+        inventory = self.devices if devices is None else DeviceStore(devices)
+        diff = sweep.diff(inventory)
+        if self.emit:
+            for ip, ms in diff["unknown"]:
+                self.emit({"kind": "unknown", "ip": ip, "rtt_ms": ms})
+            for d in diff["never_alive"]:
+                rec = {"kind": "never_alive", "ip": d.get("ip")}
+                for k in RECORD_FIELDS:
+                    rec[k] = d.get(k)
+                self.emit(rec)
+        return dict(sweep.stats(), unknown=len(diff["unknown"]),
+                    never_alive=len(diff["never_alive"]), outside=diff["outside"])
+
+    def monitor(self, stop_event, devices=None, settings=None):
+        """Run the probe scheduler until ``stop_event`` is set; return its stats."""
+        cfg = dict(self.config.get("monitor", {}))
+        cfg.update(settings or {})
+        scheduler = self.active = ProbeScheduler(self.record, cfg)
+        scheduler.set_devices(self.devices if devices is None else devices)
+        warning = scheduler.coverage_warning()
+        if warning:
+            print(f"uyarı: {warning}", file=sys.stderr)
+        scheduler.start()
+        try:
+            stop_event.wait()
+        finally:
+            scheduler.stop()
+        return scheduler.stats()
+
+
+# ---------------- CLI ----------------
+def _select(devices, filters):
+    """``--filter field=value`` → same OR-within / AND-across semantics as the GUI."""
+    if not filters:
+        return list(devices)
+    wanted = {}
+    for item in filters:
+        field, sep, value = item.partition("=")
+        if not sep:
+            raise SystemExit(f"--filter beklenen biçim alan=değer: {item}")
+        wanted.setdefault(field.strip(), set()).add(value)
+    index = FilterIndex(wanted)
+    index.reset(devices)
+    index.set_filters(wanted)
+    return [d for d in devices if index.matches(d)]
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", default=CONFIG_FILE, help="config.json yolu")
+    common.add_argument("-o", "--output", default="-",
+                        help="JSON Lines çıktısı ('-' = stdout, dosya ise sonuna eklenir)")
+    common.add_argument("--filter", action="append", default=[], metavar="ALAN=DEĞER",
+                        help="sadece eşleşen cihazlar (tekrarlanabilir)")
+    common.add_argument("--no-save", action="store_true",
+                        help="cihaz kaydını ve geçmişi güncelleme")
+    common.add_argument("--backend", choices=ping_engine.BACKENDS,
+                        help="config'teki probe_backend yerine")
+    common.add_argument("--events", action="store_true",
+                        help="her sonuç yerine sadece durum değişikliklerini yaz (from / to)")
+
+    parser = argparse.ArgumentParser(prog="pingmonitor", description="Headless Ping Monitor")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sweep = sub.add_parser("sweep", parents=[common], help="tüm cihazlara bir kez ping at")
+    sweep.add_argument("--timeout", type=float, default=2)
+    sweep.add_argument("--processes", type=int,
+                       help="işçi süreç sayısı (1 = tek süreç; yoksa sweep.processes / shard_threshold)")
+
+    monitor = sub.add_parser("monitor", parents=[common], help="sürekli izleme (Ctrl+C / SIGTERM ile dur)")
+    monitor.add_argument("--interval", type=float, help="monitor.default_interval yerine (saniye)")
+    monitor.add_argument("--duration", type=float, help="bu kadar saniye sonra dur")
+    monitor.add_argument("--metrics-port", type=int, metavar="PORT",
+                         help="GET /metrics ve /metrics.json sun (metrics.enabled yerine)")
+
+    discover = sub.add_parser("discover", parents=[common],
+                              help="CIDR / aralık tara, envanterle karşılaştır")
+    discover.add_argument("targets", nargs="+", metavar="HEDEF",
+                          help="10.0.0.0/22, 10.1.0.1-10.1.0.200, 10.2.0.1-254 veya tek IP")
+    discover.add_argument("--timeout", type=float, help="discovery.timeout yerine (saniye)")
+
+    for name, help_text in (("export", "kayıtlı cihazları devices.json biçiminde yaz"),
+                            ("import", "kayıtlı cihazları devices.json dosyasıyla değiştir")):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("--config", default=CONFIG_FILE, help="config.json yolu")
+        cmd.add_argument("path", nargs="?", default=DEVICES_JSON, help="JSON dosyası")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    output = getattr(args, "output", "-")
+    output = None if output == "-" else os.path.abspath(output)
+    json_path = os.path.abspath(args.path) if args.command in ("export", "import") else None
+    config_path = os.path.abspath(args.config)
+    config_dir = os.path.dirname(config_path)
+    if not os.path.exists(config_path):
+        print(f"config bulunamadı: {config_path}", file=sys.stderr)
+        return 2
+    # GUI ile aynı göreli yollar (devices.db, history/, inventory.cache)
+    os.chdir(config_dir)
+
+    config = read_config(config_path)
+    fsync = bool(config.get("persistence", {}).get("fsync", False))
+    # config.json → "storage": {"backend": "sqlite" | "json", "path": "devices.db"}
+    # --no-save / discover hiçbir şey yazmaz: devices.db oluşturulmaz, göç yapılmaz
+    read_only = args.command == "discover" or getattr(args, "no_save", False)
+    try:
+        storage = open_storage(config.get("storage"), fsync, read_only)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"kayıt deposu açılamadı: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        if json_path:
+            try:
+                count = (export_json if args.command == "export" else import_json)(storage, json_path)
+            except (OSError, ValueError, sqlite3.Error) as e:
+                print(f"{args.command} başarısız: {e}", file=sys.stderr)
+                return 2
+            print(json.dumps({"command": args.command, "path": json_path, "devices": count}),
+                  file=sys.stderr)
+            return 0
+        return _run(args, config, config_dir, output, storage)
+    finally:
+        storage.close()
+
+
+def _run(args, config, config_dir, output, storage):
+    ping_engine.set_backend(args.backend or config.get("probe_backend", "auto"))
+
+    try:
+        devices = load_inventory(config, InventoryCache(os.path.join(config_dir, CACHE_FILE)),
+                                 storage)
+    except ValueError as e:
+        print(f"Excel okunamadı: {e}", file=sys.stderr)
+        return 2
+    targets = _select(devices, args.filter)
+
+    space = None
+    if args.command == "discover":
+        limit = config.get("discovery", {}).get("max_addresses", DEFAULT_DISCOVERY_SETTINGS["max_addresses"])
+        try:
+            space = AddressSpace.parse(" ".join(args.targets), limit)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+
+    history = persister = None
+    if not args.no_save and space is None:
+        try:
+            history = HistoryStore.from_settings(config.get("history"))
+        except OSError as e:
+            print(f"geçmiş kaydı açılamadı: {e}", file=sys.stderr)
+        if args.command == "monitor":
+            persister = DevicePersister.from_settings(lambda: devices, config.get("persistence"),
+                                                      storage).start()
+
+    out = open(output, "a", encoding="utf-8", buffering=1) if output else sys.stdout
+
+    def emit(rec):
+        out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+    engine = PingMonitor(devices, config, history, persister, emit, events_only=args.events)
+
+    metrics = None
+    metrics_cfg = dict(config.get("metrics", {}))
+    if getattr(args, "metrics_port", None):
+        metrics_cfg.update(enabled=True, port=args.metrics_port)
+    if args.command == "monitor" and MetricsExporter.enabled(metrics_cfg):
+        try:
+            metrics = MetricsExporter.from_settings(
+                lambda: devices, metrics_cfg, engine.stats,
+                lambda: engine.active.stats() if engine.active else {},
+            ).start()
+        except OSError as e:
+            print(f"metrik sunucusu başlatılamadı: {e}", file=sys.stderr)
+            return 2
+        engine.metrics = metrics
+    try:
+        if args.command == "sweep":
+            stats = engine.sweep(targets, timeout=args.timeout, processes=args.processes)
+            if not args.no_save:
+                storage.save(devices)
+        else:
+            stop = threading.Event()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(sig, lambda *_: stop.set())
+            if space is not None:
+                settings = {"timeout": args.timeout} if args.timeout else None
+                stats = engine.discover(space, targets, settings, stop)
+            else:
+                if args.duration:
+                    timer = threading.Timer(args.duration, stop.set)
+                    timer.daemon = True
+                    timer.start()
+                settings = {"default_interval": args.interval} if args.interval else None
+                stats = engine.monitor(stop, targets, settings)
+    finally:
+        if metrics:
+            metrics.close()
+        if persister:
+            # son ölçüm değerleri de yazılsın (ara kayıtlar sadece durum değişikliğinde)
+            persister.mark_dirty()
+            persister.close()
+        if history:
+            history.close()
+        out.flush()
+        if output:
+            out.close()
+
+    summary = dict(stats, command=args.command, devices=len(targets),
+                   results=engine.results, down=engine.down)
+    print(json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    run_worker_if_requested()
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+# aynı IP için birden fazla sonuç gelirse sadece sonuncusu işlenir (tek seferlik tarama)
+COALESCE_TYPES = {"BULK"}
+# IP başına tek kayıt ama her ölçüm saklanır: geçmiş / kayıp % / geçişler hiçbirini kaçırmaz
+ACCUMULATE_TYPES = {"MONITOR"}
+# sıralı tutulan ve sınır aşılınca en eskisi atılan satırlar / canlı akış sonuçları
+LINE_TYPES = {"SINGLE", "LIVE"}
+
+DEFAULT_UI_SETTINGS = {
+    "frame_budget_ms": 12,      # bir Tk turunda kuyruğa ayrılan en fazla süre
+    "queue_max": 100000,        # birleştirilmiş sonuç anahtarı üst sınırı
+    "max_output_lines": 500,    # tür başına (SINGLE / LIVE) işlenmemiş satır üst sınırı
+    "max_samples": 256,         # IP başına bekleyen sürekli izleme ölçümü üst sınırı
+    "virtual_list": False,      # True → sayfalama yok, sadece görünen satırlar çizilir
+    "page_size": 100,
+    "value_refresh_s": 2.0,     # durumu değişmeyen satırların yeniden çizilme aralığı
+}
+
+
+class CoalescingQueue:
+    """Bounded producer → Tk queue that merges results per IP.
+
+    Items are ``(type, ip, payload)`` tuples like the old ``queue.Queue``.
+
+    * ``BULK`` results are keyed by ``(type, ip)``: a newer result replaces
+      the pending one in place and bumps its ``count``, so memory is bounded
+      by the inventory size, not by how far the UI is behind.
+    * ``MONITOR`` results are keyed the same way, but the payload is the
+      list of every pending sample in arrival order (at most
+      ``max_samples``, oldest dropped first), so the consumer applies each
+      one and repaints the row once.
+    * ``SINGLE`` output lines and ``LIVE`` results keep their order; each
+      type has its own ``max_lines`` budget, past which its oldest pending
+      item is dropped, so a busy live stream can't evict ping output.
+    * Anything else (``BULK_DONE`` …) is a control message and is never dropped.
+
+    If ``maxsize`` distinct results are already pending, new keys are dropped
+    and counted in ``dropped`` so callers can still account for them. Every
+    drop (evicted lines and samples too) is counted per type; the consumer
+    reads it back with ``take_dropped``.
+    """
+
+    def __init__(self, maxsize=100000, max_lines=500, max_samples=256):
+        self.maxsize = int(maxsize)
+        self.max_lines = int(max_lines)
+        self.max_samples = int(max_samples)
+        self._items = OrderedDict()
+        self._lines = {item_type: deque() for item_type in LINE_TYPES}
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.dropped = {}
+        self.merged = 0
+
+    def put(self, item):
+        item_type, ip, payload = item
+        with self._lock:
+            if item_type in COALESCE_TYPES:
+                key = (item_type, ip)
+                entry = self._items.get(key)
+                if entry is not None:
+                    entry[2] = payload
+                    entry[3] += 1
+                    self.merged += 1
+                    return
+                if len(self._items) >= self.maxsize:
+                    self.dropped[item_type] = self.dropped.get(item_type, 0) + 1
+                    return
+                self._items[key] = [item_type, ip, payload, 1]
+                return
+
+            if item_type in ACCUMULATE_TYPES:
+                key = (item_type, ip)
+                entry = self._items.get(key)
+                if entry is not None:
+                    samples = entry[2]
+                    samples.append(payload)
+                    entry[3] += 1
+                    self.merged += 1
+                    if len(samples) > self.max_samples:
+                        del samples[0]
+                        self.dropped[item_type] = self.dropped.get(item_type, 0) + 1
+                    return
+                if len(self._items) >= self.maxsize:
+                    self.dropped[item_type] = self.dropped.get(item_type, 0) + 1
+                    return
+                self._items[key] = [item_type, ip, [payload], 1]
+                return
+
+            self._seq += 1
+            key = ("#", self._seq)
+            self._items[key] = [item_type, ip, payload, 1]
+
+            if item_type in LINE_TYPES:
+                lines = self._lines[item_type]
+                lines.append(key)
+                while len(lines) > self.max_lines:
+                    old = lines.popleft()
+                    if self._items.pop(old, None) is not None:
+                        self.dropped[item_type] = self.dropped.get(item_type, 0) + 1
+
+    put_nowait = put
+
+    def get_nowait(self):
+        """Return the oldest pending entry as ``(type, ip, payload, count)``."""
+        with self._lock:
+            if not self._items:
+                raise IndexError("kuyruk boş")
+            key, entry = self._items.popitem(last=False)
+            lines = self._lines.get(entry[0])
+            if lines and lines[0] == key:
+                lines.popleft()
+            return tuple(entry)
+
+    def drain(self, budget_seconds, max_items=None):
+        """Yield pending entries until the time budget (or max_items) is used up."""
+        deadline = time.perf_counter() + budget_seconds
+        taken = 0
+        while True:
+            try:
+                entry = self.get_nowait()
+            except IndexError:
+                return
+            yield entry
+            taken += 1
+            if time.perf_counter() >= deadline or (max_items and taken >= max_items):
+                return
+
+    def take_dropped(self, item_type):
+        with self._lock:
+            return self.dropped.pop(item_type, 0)
+
+    def empty(self):
+        return not self._items
+
+    def qsize(self):
+        return len(self._items)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            for lines in self._lines.values():
+                lines.clear()
+
+    def clear_lines(self, item_type="SINGLE"):
+        """Drop pending ``item_type`` lines only; results and control messages stay."""
+        with self._lock:
+            lines = self._lines[item_type]
+            for key in lines:
+                self._items.pop(key, None)
+            lines.clear()
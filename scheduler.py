@@ -0,0 +1,205 @@
+import heapq
+import random
+import threading
+import time
+
+import ping_engine
+
+DEFAULT_MONITOR_SETTINGS = {
+    "default_interval": 30,     # saniye
+    "jitter": 0.1,              # aralığın ±%10'u kadar rastgele kaydırma
+    "max_in_flight": 512,       # aynı anda bekleyen en fazla probe
+    "timeout": 2,
+    "slip_warning": 1.0,        # bu kadar saniye geç kalan probe "kaymış" sayılır
+    "location_intervals": {},   # {"Fabrika": 10, ...}
+    "unit_intervals": {},       # {"Otomasyon": 15, ...}
+    "autostart": False,         # uygulama açılınca izlemeyi başlat
+}
+
+
+def interval_for_device(device, settings):
+    """Probe interval: device override > unit default > location default > global default."""
+    value = device.get("interval")
+    if value:
+        try:
+            return max(1.0, float(value))
+        except (TypeError, ValueError):
+            pass
+
+    unit_intervals = settings.get("unit_intervals") or {}
+    if device.get("unit") in unit_intervals:
+        return max(1.0, float(unit_intervals[device.get("unit")]))
+
+    location_intervals = settings.get("location_intervals") or {}
+    if device.get("location") in location_intervals:
+        return max(1.0, float(location_intervals[device.get("location")]))
+
+    return max(1.0, float(settings.get("default_interval", 30)))
+
+
+class ProbeScheduler:
+    """Continuous per-device probing driven by a min-heap of due times.
+
+    One scheduler thread pops due devices and hands them to a bounded probe
+    pool (``ping_engine.submit_probe``). First probes are spread uniformly
+    over each device's interval and every reschedule gets a small random
+    jitter, so probes don't line up into bursts. Heap entries carry a
+    generation number; when a device is removed or its interval changes, its
+    old entry is dropped lazily as it surfaces instead of rebuilding the heap.
+
+    ``required_rate`` (probes/s the intervals ask for) is compared with
+    ``capacity`` (``max_in_flight / timeout``, the rate the pool still keeps
+    up with when every probe times out); ``coverage_warning()`` reports when
+    the inventory can't be covered so the interval or pool can be adjusted.
+    """
+
+    def __init__(self, on_result, settings=None, submit=None):
+        cfg = dict(DEFAULT_MONITOR_SETTINGS)
+        cfg.update(settings or {})
+        self.settings = cfg
+
+        self.on_result = on_result
+        self._submit = submit or ping_engine.submit_probe
+        self._heap = []
+        self._intervals = {}       # ip → (interval, geçerli heap kaydının nesli)
+        self._generation = 0
+        self._counter = 0
+        self._cond = threading.Condition()
+        self._slots = threading.BoundedSemaphore(int(cfg["max_in_flight"]))
+        self.capacity = int(cfg["max_in_flight"]) / max(0.001, float(cfg["timeout"]))
+        self.required_rate = 0.0
+        self._thread = None
+        self._running = False
+
+        # kayma (schedule slip) istatistikleri
+        self.probes = 0
+        self.late = 0
+        self.max_slip = 0.0
+        self.avg_slip = 0.0
+        self.skipped = 0
+
+    # ---- device set ----
+    def set_devices(self, devices):
+        """Replace the monitored set; devices already scheduled keep their slot."""
+        now = time.monotonic()
+        with self._cond:
+            old = self._intervals
+            self._intervals = {}
+
+            for d in devices:
+                ip = d.get("ip")
+                if not ip or ip in self._intervals:
+                    continue
+                interval = interval_for_device(d, self.settings)
+
+                if ip in old and old[ip][0] == interval:
+                    # heap'teki kaydı geçerli kalır
+                    self._intervals[ip] = old[ip]
+                    continue
+
+                self._generation += 1
+                self._intervals[ip] = (interval, self._generation)
+                # ilk probe'u aralığa yay → thundering herd yok
+                self._push(now + random.uniform(0, interval), ip, self._generation)
+
+            self.required_rate = sum(1 / interval for interval, _ in self._intervals.values())
+            self._cond.notify()
+
+    def coverage_warning(self):
+        """Message when the intervals need more probes/s than ``capacity``, else None."""
+        if self.required_rate <= self.capacity:
+            return None
+        return (
+            f"{len(self._intervals)} cihaz için saniyede {self.required_rate:.0f} ping gerekiyor; "
+            f"max_in_flight={self.settings['max_in_flight']} ve timeout={self.settings['timeout']} sn "
+            f"ile yanıt vermeyen cihazlar çoğaldığında en fazla {self.capacity:.0f} ping/sn "
+            f"atılabilir. Aralığı uzatın ya da max_in_flight'ı artırın."
+        )
+
+    def _push(self, due, ip, gen):
+        self._counter += 1
+        heapq.heappush(self._heap, (due, self._counter, ip, gen))
+
+    def _next_due(self, due, interval, now):
+        jitter = self.settings["jitter"]
+        nxt = due + interval * (1 + random.uniform(-jitter, jitter))
+        if nxt < now:
+            # bir turdan fazla geride kaldık: yetişmeye çalışma, yeniden yay
+            self.skipped += 1
+            nxt = now + random.uniform(0, interval * jitter)
+        return nxt
+
+    # ---- lifecycle ----
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="probe-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._running
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                due, _, ip, gen = self._heap[0]
+                now = time.monotonic()
+                if due > now:
+                    self._cond.wait(due - now)
+                    continue
+
+                heapq.heappop(self._heap)
+                entry = self._intervals.get(ip)
+                if entry is None or entry[1] != gen:
+                    continue   # silinmiş / yeniden planlanmış cihaz
+
+                interval = entry[0]
+                self._push(self._next_due(due, interval, now), ip, gen)
+
+            self._record_slip(now - due)
+
+            # havuz doluysa burada bekleriz; bekleme bir sonraki kaymaya yansır
+            self._slots.acquire()
+            self._submit(ip, self._on_done, self.settings["timeout"])
+
+    def _on_done(self, ip, ms, kind):
+        self._slots.release()
+        self.on_result(ip, ms, kind)
+
+    def _record_slip(self, slip):
+        self.probes += 1
+        if slip > self.settings["slip_warning"]:
+            self.late += 1
+        if slip > self.max_slip:
+            self.max_slip = slip
+        self.avg_slip += (slip - self.avg_slip) / min(self.probes, 1000)
+
+    def stats(self):
+        with self._cond:
+            scheduled = len(self._intervals)
+        return {
+            "devices": scheduled,
+            "probes": self.probes,
+            "late": self.late,
+            "skipped": self.skipped,
+            "avg_slip": self.avg_slip,
+            "max_slip": self.max_slip,
+            "required_rate": self.required_rate,
+            "capacity": self.capacity,
+        }
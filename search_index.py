@@ -0,0 +1,154 @@
+from array import array
+
+SEARCH_FIELDS = ["device", "ip", "model", "mac", "location", "unit", "description"]
+NGRAM = 3
+
+# silinen doküman oranı bunu geçince posting listeleri sıkıştırılır
+COMPACT_RATIO = 0.5
+
+
+def haystack_for(device, fields=SEARCH_FIELDS):
+    return " ".join(
+        "" if device.get(k) is None else str(device.get(k)).lower()
+        for k in fields
+    )
+
+
+def ngrams(text, n=NGRAM):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class SearchIndex:
+    """Trigram index over the searchable device fields.
+
+    Each device gets an increasing document id and a prebuilt lowercase
+    haystack; every trigram maps to an ``array('I')`` of doc ids (append-only,
+    so already sorted). A query takes the rarest trigram's postings as the
+    candidate set and confirms each with a plain substring test. When the new
+    query contains the previous one (the user kept typing), the previous hits
+    are the candidates instead. Removed documents are tombstoned and the
+    postings are compacted once enough of them pile up.
+
+    It is a ``DeviceStore`` listener, so adds/edits/deletes keep it current.
+    The index itself is built lazily on the first search after a reset, so
+    startup and Excel reloads don't pay for it until someone types.
+    """
+
+    def __init__(self, fields=SEARCH_FIELDS):
+        self.fields = fields
+        self.query = ""
+        self.hits = set()
+        self.reset(())
+
+    # ---- DeviceStore listener ----
+    def reset(self, devices):
+        # canlı liste referansı; ilk aramada buradan kurulur
+        self._source = devices
+        self._built = False
+
+    def add(self, device):
+        if not self._built:
+            return
+        self._add(device)
+        self._refresh_hit(device)
+
+    def remove(self, device):
+        if not self._built:
+            return
+        doc = self._doc_of.pop(id(device), None)
+        if doc is None:
+            return
+        self._docs[doc] = None
+        self._hay[doc] = ""
+        self._dead += 1
+        self.hits.discard(doc)
+        if self._dead > COMPACT_RATIO * len(self._docs):
+            self._compact()
+
+    def update(self, device):
+        self.remove(device)
+        self.add(device)
+
+    # ---- internals ----
+    def _build(self, devices):
+        self._docs = []          # doc id → device (silinmişse None)
+        self._hay = []           # doc id → küçük harfli metin
+        self._doc_of = {}        # id(device) → doc id
+        self._postings = {}
+        self._dead = 0
+        for d in devices:
+            self._add(d)
+        self._built = True
+
+        query = self.query
+        self.query = ""
+        self.hits = set()
+        if query:
+            self.search(query)
+
+    def _add(self, device):
+        doc = len(self._docs)
+        hay = haystack_for(device, self.fields)
+        self._docs.append(device)
+        self._hay.append(hay)
+        self._doc_of[id(device)] = doc
+        postings = self._postings
+        for gram in ngrams(hay):
+            plist = postings.get(gram)
+            if plist is None:
+                postings[gram] = array("I", (doc,))
+            else:
+                plist.append(doc)
+        return doc
+
+    def _compact(self):
+        self._build([d for d in self._docs if d is not None])
+
+    def _refresh_hit(self, device):
+        doc = self._doc_of.get(id(device))
+        if doc is not None and self.query and self.query in self._hay[doc]:
+            self.hits.add(doc)
+
+    # ---- queries ----
+    def search(self, text):
+        """Set the active query and return the set of matching doc ids."""
+        q = (text or "").lower()
+        if not q:
+            self.query = ""
+            self.hits = set()
+            return self.hits
+
+        if not self._built:
+            self.query = ""
+            self._build(self._source)
+
+        hay = self._hay
+        if self.query and self.query in q:
+            # yazmaya devam edildi → önceki sonuç kümesini daralt
+            candidates = self.hits
+        elif len(q) >= NGRAM:
+            grams = ngrams(q)
+            plists = [self._postings.get(g) for g in grams]
+            if any(p is None for p in plists):
+                candidates = ()
+            else:
+                candidates = min(plists, key=len)
+        else:
+            candidates = range(len(hay))
+
+        self.hits = {doc for doc in candidates if q in hay[doc]}
+        self.query = q
+        return self.hits
+
+    def matches(self, device):
+        """True if the device matches the active query (or there is none)."""
+        if not self.query:
+            return True
+        if not self._built:
+            self.search(self.query)
+        return self._doc_of.get(id(device)) in self.hits
+
+    def matching_devices(self):
+        if self.query and not self._built:
+            self.search(self.query)
+        return [self._docs[doc] for doc in sorted(self.hits)]
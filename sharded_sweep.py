@@ -0,0 +1,286 @@
+"""Bulk sweep split across worker processes (one per core).
+
+The parent starts ``python sharded_sweep.py`` (in a frozen build the app exe
+with ``--sweep-worker``) once per shard instead of using ``multiprocessing``: spawn/forkserver children re-import ``__main__`` and
+main.py builds the Tk window at import time. Results come back through one
+memory-mapped file shared by all workers, laid out by device index::
+
+    [done u64, limit u64] * shards   progress, read by the parent while running
+    rtt   f64 * n                    ms, NaN = no reply
+    ts    f64 * n                    unix time of the result
+    code  u8  * n                    0 = not probed, 1 = reply, 2 = no reply
+
+so nothing per device is pickled or printed; a worker only writes its final
+``SweepController`` stats as one JSON line on stdout.
+"""
+import json
+import math
+import mmap
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import ping_engine
+from sweep_control import DEFAULT_SWEEP_SETTINGS, SweepController
+
+DEFAULT_SHARD_SETTINGS = {
+    "processes": 0,             # 0 → çekirdek sayısı, 1 → kapalı
+    "shard_threshold": 20000,   # bu kadar hedefin altında tek süreçte kalınır
+}
+
+CODE_NONE = 0
+CODE_REPLY = 1
+CODE_NO_REPLY = 2
+
+_HEADER = 16   # shard başına done + limit
+
+# PyInstaller exe'sinde sharded_sweep.py diskte yok: işçi, exe'nin kendisi bu argümanla
+WORKER_ARG = "--sweep-worker"
+
+
+def shard_settings(settings=None):
+    """``DEFAULT_SHARD_SETTINGS`` updated from config ``"sweep"``."""
+    cfg = dict(DEFAULT_SHARD_SETTINGS)
+    cfg.update({k: v for k, v in (settings or {}).items() if k in DEFAULT_SHARD_SETTINGS})
+    processes = int(cfg["processes"]) or os.cpu_count() or 1
+    return max(1, processes), int(cfg["shard_threshold"])
+
+
+def should_shard(count, settings=None):
+    processes, threshold = shard_settings(settings)
+    return processes > 1 and count >= threshold
+
+
+def worker_command():
+    """Command line that starts one shard worker (before its own arguments)."""
+    if getattr(sys, "frozen", False):
+        return [sys.executable, WORKER_ARG]
+    return [sys.executable, os.path.abspath(__file__)]
+
+
+def run_worker_if_requested(argv=None):
+    """Run a shard worker and exit when the process was started as one.
+
+    Frozen builds re-launch the app exe itself, so its entry point has to call
+    this first, before any window is created.
+    """
+    argv = sys.argv if argv is None else argv
+    if len(argv) > 1 and argv[1] == WORKER_ARG:
+        sys.exit(_worker_main(argv[2:]))
+
+
+def _layout(n, shards):
+    rtt = _HEADER * shards
+    ts = rtt + 8 * n
+    code = ts + 8 * n
+    return rtt, ts, code, code + n
+
+
+def _split_settings(settings, shards):
+    """Per-worker controller settings: the global rate / concurrency divided."""
+    cfg = dict(DEFAULT_SWEEP_SETTINGS)
+    cfg.update({k: v for k, v in (settings or {}).items() if k in DEFAULT_SWEEP_SETTINGS})
+    cfg["max_rate"] = max(1.0, float(cfg["max_rate"]) / shards)
+    for key in ("max_in_flight", "initial_in_flight"):
+        cfg[key] = max(1, int(cfg[key]) // shards)
+    cfg["min_in_flight"] = min(int(cfg["min_in_flight"]), cfg["max_in_flight"])
+    return cfg
+
+
+class ShardedSweep:
+    """One bulk sweep over ``ips`` with one worker process per shard.
+
+    ``run()`` blocks until every worker exits and returns ``(ip, ms, ts)``
+    for each probed address (``ms`` None = no reply). ``stats()`` matches
+    ``SweepController.stats()`` closely enough for the status line and can be
+    called from another thread while the sweep runs.
+    """
+
+    def __init__(self, ips, timeout=2, settings=None, processes=None, backend="auto"):
+        self.ips = list(dict.fromkeys(ips))
+        self.timeout = timeout
+        self.settings = dict(settings or {})
+        auto_processes, _ = shard_settings(self.settings)
+        self.shards = max(1, min(processes or auto_processes, len(self.ips) or 1))
+        self.backend = backend
+
+        self.started_at = None
+        self.finished_at = None
+        self.failed_shards = 0
+        self._worker_stats = []
+        self._mm = None
+        self._procs = []
+
+    # ---------------- ilerleme ----------------
+    def _progress(self):
+        mm = self._mm
+        if mm is None:
+            return 0, 0
+        try:
+            header = memoryview(mm)[:_HEADER * self.shards].cast("Q")
+        except ValueError:   # run() tam o sırada kapattı
+            return 0, 0
+        try:
+            values = header.tolist()
+        finally:
+            header.release()
+        return sum(values[0::2]), sum(values[1::2])
+
+    def stats(self):
+        if self._worker_stats:
+            done = sum(s.get("done", 0) for s in self._worker_stats)
+            limit = sum(s.get("limit", 0) for s in self._worker_stats)
+        else:
+            done, limit = self._progress()
+        started = self.started_at or time.monotonic()
+        elapsed = max((self.finished_at or time.monotonic()) - started, 1e-6)
+        stats = {
+            "sent": sum(s.get("sent", 0) for s in self._worker_stats) or done,
+            "done": done,
+            "timeouts": sum(s.get("timeouts", 0) for s in self._worker_stats),
+            "errors": sum(s.get("errors", 0) for s in self._worker_stats),
+            "in_flight": 0,
+            "limit": limit,
+            "elapsed": elapsed,
+            "probes_per_sec": done / elapsed,
+            "processes": self.shards,
+            "failed_shards": self.failed_shards,
+        }
+        return stats
+
+    # ---------------- çalıştırma ----------------
+    def run(self, on_progress=None, poll=0.25, stop_event=None):
+        n = len(self.ips)
+        rtt_off, ts_off, code_off, size = _layout(n, self.shards)
+        self.started_at = time.monotonic()
+
+        fd, path = tempfile.mkstemp(prefix="pingmonitor-sweep-", suffix=".bin")
+        try:
+            with os.fdopen(fd, "r+b") as f:
+                f.truncate(max(size, 1))
+                self._mm = mmap.mmap(f.fileno(), max(size, 1))
+            self._start_workers(path, n)
+            self._wait(on_progress, poll, stop_event)
+            results = self._collect(rtt_off, ts_off, code_off)
+        finally:
+            for proc in self._procs:
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self.finished_at = time.monotonic()
+        return results
+
+    def _start_workers(self, path, n):
+        flags = subprocess.CREATE_NO_WINDOW if ping_engine.IS_WINDOWS else 0
+        per_shard = math.ceil(n / self.shards) if n else 0
+        worker_settings = json.dumps(_split_settings(self.settings, self.shards))
+        for shard in range(self.shards):
+            start = shard * per_shard
+            chunk = self.ips[start:start + per_shard]
+            cmd = worker_command() + [path, str(n), str(self.shards), str(shard), str(start),
+                                      str(self.timeout), self.backend, worker_settings]
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                    creationflags=flags)
+            # IP listesi stdin'den, satır başına bir adres
+            proc.stdin.write("\n".join(chunk).encode("utf-8"))
+            proc.stdin.close()
+            self._procs.append(proc)
+
+    def _wait(self, on_progress, poll, stop_event):
+        while any(p.poll() is None for p in self._procs):
+            if stop_event is not None and stop_event.wait(poll):
+                for p in self._procs:
+                    p.terminate()
+                break
+            if stop_event is None:
+                time.sleep(poll)
+            if on_progress is not None:
+                on_progress(self._progress()[0])
+
+        for proc in self._procs:
+            out = proc.stdout.read()
+            proc.wait()
+            try:
+                self._worker_stats.append(json.loads(out.decode("utf-8").strip().splitlines()[-1]))
+            except (ValueError, IndexError):
+                self.failed_shards += 1
+        if on_progress is not None:
+            on_progress(self._progress()[0])
+
+    def _collect(self, rtt_off, ts_off, code_off):
+        """Snapshot the result arrays in three bulk copies and zip them by index."""
+        n = len(self.ips)
+        view = memoryview(self._mm)
+        try:
+            rtt = view[rtt_off:ts_off].cast("d").tolist()
+            ts = view[ts_off:code_off].cast("d").tolist()
+            codes = bytes(view[code_off:code_off + n])
+        finally:
+            view.release()
+        return [
+            (ip, r if c == CODE_REPLY else None, t)
+            for ip, r, t, c in zip(self.ips, rtt, ts, codes)
+            if c
+        ]
+
+
+# ---------------- işçi süreç ----------------
+def _worker_main(argv):
+    path, n, shards, shard, start, timeout, backend, settings = argv
+    n, shards, shard, start = int(n), int(shards), int(shard), int(start)
+    timeout = float(timeout)
+    # --windowed exe'de sys.stdin / sys.stdout None olur; borular yine fd 0 / 1'de
+    stdin = sys.stdin if sys.stdin is not None else open(0, "r", encoding="utf-8", closefd=False)
+    ips = [line.strip() for line in stdin.read().splitlines() if line.strip()]
+    index = {ip: start + i for i, ip in enumerate(ips)}
+
+    rtt_off, ts_off, code_off, size = _layout(n, shards)
+    ping_engine.set_backend(backend)
+    controller = SweepController(**json.loads(settings))
+    lock = threading.Lock()
+
+    with open(path, "r+b") as f:
+        mm = mmap.mmap(f.fileno(), max(size, 1))
+    view = memoryview(mm)
+    header = view[:_HEADER * shards].cast("Q")
+    rtt = view[rtt_off:ts_off].cast("d")
+    ts = view[ts_off:code_off].cast("d")
+    codes = view[code_off:code_off + n]
+    slot = shard * 2
+
+    def on_result(ip, ms):
+        i = index.get(ip)
+        if i is None:
+            return
+        with lock:
+            rtt[i] = math.nan if ms is None else ms
+            ts[i] = time.time()
+            codes[i] = CODE_NO_REPLY if ms is None else CODE_REPLY
+            header[slot] += 1
+            header[slot + 1] = controller.limit
+
+    try:
+        ping_engine.ping_many(ips, on_result, timeout=timeout, controller=controller)
+        controller.finish()
+    finally:
+        for v in (header, rtt, ts, codes, view):
+            v.release()
+        mm.close()
+
+    stdout = sys.stdout if sys.stdout is not None else open(1, "w", encoding="utf-8", closefd=False)
+    print(json.dumps(controller.stats()), file=stdout, flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_worker_main(sys.argv[1:]))
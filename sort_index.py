@@ -0,0 +1,240 @@
+import ipaddress
+import math
+
+# bir turda anahtarı değişen satırlar listenin 1/RESORT_DIVISOR'ını geçerse tam sıralama
+RESORT_DIVISOR = 128
+
+# eksik değerler her kolonda artan sırada sona, azalan sırada başa gelir; anahtarlar
+# düz str / float kalsın diye tuple yerine en büyük değer kullanılır
+MISSING_TEXT = "\U0010ffff"
+
+
+def text_key(value):
+    """Case-insensitive key for any cell value; Excel numbers are compared as text."""
+    if value is None:
+        return MISSING_TEXT
+    text = str(value).strip()
+    return text.casefold() if text else MISSING_TEXT
+
+
+def number_key(value):
+    return math.inf if value is None else value
+
+
+def ip_key(ip):
+    """IPv4 before IPv6, both by integer address; host names after them."""
+    text = "" if ip is None else str(ip).strip()
+    # sık durum: noktalı IPv4, ipaddress modülünden ~10 kat hızlı
+    parts = text.split(".")
+    if len(parts) == 4 and all(p.isascii() and p.isdigit() and len(p) <= 3 for p in parts):
+        a, b, c, d = map(int, parts)
+        if a < 256 and b < 256 and c < 256 and d < 256:
+            return (0, 4, a << 24 | b << 16 | c << 8 | d)
+    try:
+        addr = ipaddress.ip_address(text)
+    except ValueError:
+        return (1, 0, text.casefold()) if text else (2,)
+    return (0, addr.version, int(addr))
+
+
+def _before(a, b, reverses):
+    """True if composite key ``a`` sorts strictly before ``b``."""
+    for x, y, rev in zip(a, b, reverses):
+        if x != y:
+            return x > y if rev else x < y
+    return False
+
+
+class SortIndex:
+    """Keeps the device list sorted by one or more columns.
+
+    ``key_funcs`` maps a column to ``fn(device) → key``. Keys are computed
+    once per device and column and cached by device object until the
+    ``DeviceStore`` reports an update, so re-sorting or adding a secondary
+    column does not recompute them. ``sort(order)`` takes ``[(column,
+    reverse), ...]``, most significant first, and runs one stable
+    ``list.sort`` per column from the last to the first.
+
+    While a sort is active the composite key of every row is kept in list
+    order. A device whose key changes (``touch`` for result-driven columns,
+    ``update`` for edits, ``add`` for new rows) is moved to its new place by
+    binary search instead of a full re-sort. Columns listed in ``volatile``
+    change with every probe result; ``touch`` ignores the others.
+    """
+
+    def __init__(self, key_funcs, volatile=()):
+        self.key_funcs = dict(key_funcs)
+        self.volatile = set(volatile)
+        self.order = []
+        self._cache = {col: {} for col in self.key_funcs}
+        self._keys = None          # sıralı listeyle hizalı bileşik anahtarlar
+        self._devices = []
+        self.moved = False         # son okumadan beri yer değiştiren satır var mı
+
+    # ---------------- anahtarlar ----------------
+    def key(self, device, column):
+        cache = self._cache[column]
+        k = cache.get(id(device))
+        if k is None:
+            k = cache[id(device)] = self.key_funcs[column](device)
+        return k
+
+    def _composite(self, device):
+        return tuple(self.key(device, col) for col, _ in self.order)
+
+    def _column(self, column, devices):
+        """Cached keys of ``column`` for ``devices``, in the same order."""
+        cache = self._cache[column]
+        ids = list(map(id, devices))
+        try:
+            return list(map(cache.__getitem__, ids))
+        except KeyError:
+            fn = self.key_funcs[column]
+            for d in devices:
+                if id(d) not in cache:
+                    cache[id(d)] = fn(d)
+            return list(map(cache.__getitem__, ids))
+
+    def _forget(self, device, columns=None):
+        for col in columns or self._cache:
+            self._cache[col].pop(id(device), None)
+
+    @property
+    def is_live(self):
+        return any(col in self.volatile for col, _ in self.order)
+
+    # ---------------- sıralama ----------------
+    def sort(self, order):
+        """Sort the list in place by ``[(column, reverse), ...]``."""
+        self.order = [(col, bool(rev)) for col, rev in order if col in self.key_funcs]
+        devices = self._devices
+        columns = [self._column(col, devices) for col, _ in self.order]
+        # kolon başına bir stable sıralama, en az önemliden başlayarak; sadece
+        # sıra numaraları taşınır, liste en sonda bir kez dizilir
+        positions = range(len(devices))
+        for keys, (_, rev) in zip(reversed(columns), reversed(self.order)):
+            positions = sorted(positions, key=keys.__getitem__, reverse=rev)
+        devices[:] = [devices[i] for i in positions]
+        self._keys = (list(zip(*([keys[i] for i in positions] for keys in columns)))
+                      if self.order else None)
+        self.moved = True
+
+    def _bisect(self, key):
+        reverses = [rev for _, rev in self.order]
+        keys = self._keys
+        lo, hi = 0, len(keys)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _before(key, keys[mid], reverses):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def _position(self, device, key):
+        """Index of ``device`` in the list, searched among rows with its old key."""
+        reverses = [rev for _, rev in self.order]
+        keys = self._keys
+        lo, hi = 0, len(keys)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _before(keys[mid], key, reverses):
+                lo = mid + 1
+            else:
+                hi = mid
+        devices = self._devices
+        while lo < len(keys) and keys[lo] == key:
+            if devices[lo] is device:
+                return lo
+            lo += 1
+        return None
+
+    def _reposition(self, device, i):
+        """Move the row at ``i`` (or a new last row, ``i=None``) to its sorted place."""
+        devices = self._devices
+        key = self._composite(device)
+        if i is not None:
+            if self._keys[i] == key:
+                return False
+            del self._keys[i]
+            del devices[i]
+        else:
+            devices.pop()
+        j = self._bisect(key)
+        self._keys.insert(j, key)
+        devices.insert(j, device)
+        moved = j != i
+        self.moved = self.moved or moved
+        return moved
+
+    def _usable(self, extra=0):
+        if self._keys is not None and len(self._keys) + extra == len(self._devices):
+            return True
+        # liste dışarıdan değişti → bir kez tam sıralama
+        if self.order:
+            self.sort(self.order)
+        return False
+
+    def touch(self, device):
+        """Re-key ``device`` after a probe result; True if its row moved."""
+        if not self.is_live:
+            return False
+        old = self._keys is not None and self._composite(device)
+        self._forget(device, self.volatile)
+        return self._move(device, old)
+
+    def touch_many(self, devices):
+        """``touch`` for a batch; True if any row moved.
+
+        Past ``1 / RESORT_DIVISOR`` of the list one re-sort of the almost
+        sorted list is cheaper than moving the rows one by one.
+        """
+        if not self.is_live:
+            return False
+        devices = list(devices)
+        if self._keys is not None and len(devices) * RESORT_DIVISOR < len(self._keys):
+            moved = False
+            for d in devices:
+                moved = self.touch(d) or moved
+            return moved
+        for d in devices:
+            self._forget(d, self.volatile)
+        self.sort(self.order)
+        return True
+
+    def _move(self, device, old):
+        if not self._usable():
+            return True
+        i = self._position(device, old)
+        if i is None:
+            self.sort(self.order)
+            return True
+        return self._reposition(device, i)
+
+    def take_moved(self):
+        moved, self.moved = self.moved, False
+        return moved
+
+    # ---- DeviceStore listener ----
+    def reset(self, devices):
+        self._devices = devices
+        self._cache = {col: {} for col in self.key_funcs}
+        self._keys = None
+        # Excel yeniden yüklendiğinde de seçili sıralama geçerli kalır
+        if self.order:
+            self.sort(self.order)
+
+    def add(self, device):
+        if self.order and self._usable(extra=1):
+            self._reposition(device, None)
+
+    def remove(self, device):
+        self._forget(device)
+        # hangi satırın silindiği bilinmiyor: anahtarlar bir sonraki kullanımda yeniden dizilir
+        self._keys = None
+
+    def update(self, device):
+        old = self.order and self._keys is not None and self._composite(device)
+        self._forget(device)
+        if self.order:
+            self._move(device, old)
@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import time
+
+DEFAULT_SWEEP_SETTINGS = {
+    "max_rate": 500,          # saniyede en fazla gönderilen probe
+    "max_in_flight": 1000,    # aynı anda bekleyen en fazla probe
+    "min_in_flight": 8,
+    "initial_in_flight": 64,
+    "increase_step": 16,      # AIMD: sorunsuz her pencerede +step
+    "decrease_factor": 0.5,   # AIMD: sıkışmada limit * factor
+    "error_threshold": 0.02,  # gönderim hatası oranı (ENOBUFS vb.)
+    "timeout_jump": 0.15,     # timeout oranı taban çizgisinin bu kadar üstüne çıkarsa
+}
+
+OUTCOME_OK = "ok"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_ERROR = "error"
+
+
+class SweepController:
+    """Rate ceiling + AIMD concurrency limit for one bulk sweep.
+
+    A token bucket caps probes per second; the in-flight limit grows additively
+    while the timeout/error mix stays near its baseline and is cut
+    multiplicatively when it spikes. Many DOWN hosts in an inventory are
+    normal, so timeouts are compared against a running baseline instead of
+    against zero.
+    """
+
+    def __init__(self, **settings):
+        cfg = dict(DEFAULT_SWEEP_SETTINGS)
+        cfg.update({k: v for k, v in settings.items() if k in DEFAULT_SWEEP_SETTINGS})
+
+        self.max_rate = float(cfg["max_rate"])
+        self.max_in_flight = int(cfg["max_in_flight"])
+        self.min_in_flight = max(1, int(cfg["min_in_flight"]))
+        self.increase_step = int(cfg["increase_step"])
+        self.decrease_factor = float(cfg["decrease_factor"])
+        self.error_threshold = float(cfg["error_threshold"])
+        self.timeout_jump = float(cfg["timeout_jump"])
+
+        self.limit = min(self.max_in_flight, max(self.min_in_flight, int(cfg["initial_in_flight"])))
+        self.in_flight = 0
+
+        self._lock = threading.Lock()
+        self._tokens = 1.0
+        self._last_refill = time.monotonic()
+
+        # pencere istatistikleri
+        self._window_done = 0
+        self._window_timeouts = 0
+        self._window_errors = 0
+        self._timeout_baseline = None
+
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self.sent = 0
+        self.done = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    # ---- admission ----
+    def _refill(self, now):
+        if self.max_rate <= 0:
+            self._tokens = 1.0
+            return
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        # küçük patlamalara izin ver ama en fazla 1/10 saniyelik kadar
+        burst = max(1.0, self.max_rate / 10)
+        self._tokens = min(burst, self._tokens + elapsed * self.max_rate)
+
+    def try_acquire(self):
+        """Take a slot and a token. Returns 0 on success, else seconds to wait."""
+        with self._lock:
+            if self.in_flight >= self.limit:
+                return 0.005
+
+            now = time.monotonic()
+            self._refill(now)
+            if self.max_rate > 0 and self._tokens < 1.0:
+                return (1.0 - self._tokens) / self.max_rate
+
+            if self.max_rate > 0:
+                self._tokens -= 1.0
+            self.in_flight += 1
+            self.sent += 1
+            return 0
+
+    def acquire(self):
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self, outcome):
+        with self._lock:
+            self.in_flight -= 1
+            self.done += 1
+            self._window_done += 1
+
+            if outcome == OUTCOME_TIMEOUT:
+                self.timeouts += 1
+                self._window_timeouts += 1
+            elif outcome == OUTCOME_ERROR:
+                self.errors += 1
+                self._window_errors += 1
+
+            # her "limit" kadar sonuçta bir karar ver (~1 RTT penceresi)
+            if self._window_done >= self.limit:
+                self._adjust()
+
+    def _adjust(self):
+        done = self._window_done
+        timeout_ratio = self._window_timeouts / done
+        error_ratio = self._window_errors / done
+
+        if self._timeout_baseline is None:
+            self._timeout_baseline = timeout_ratio
+
+        congested = (
+            error_ratio > self.error_threshold
+            or timeout_ratio > self._timeout_baseline + self.timeout_jump
+        )
+
+        if congested:
+            self.limit = max(self.min_in_flight, int(self.limit * self.decrease_factor))
+        else:
+            self.limit = min(self.max_in_flight, self.limit + self.increase_step)
+            # taban çizgisini sadece sağlıklı pencerelerden öğren
+            self._timeout_baseline = 0.8 * self._timeout_baseline + 0.2 * timeout_ratio
+
+        self._window_done = 0
+        self._window_timeouts = 0
+        self._window_errors = 0
+
+    # ---- reporting ----
+    def finish(self):
+        self.finished_at = time.monotonic()
+
+    def throughput(self):
+        """Achieved probes per second so far."""
+        end = self.finished_at or time.monotonic()
+        elapsed = max(end - self.started_at, 1e-6)
+        return self.done / elapsed
+
+    def stats(self):
+        return {
+            "sent": self.sent,
+            "done": self.done,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "limit": self.limit,
+            "elapsed": (self.finished_at or time.monotonic()) - self.started_at,
+            "probes_per_sec": self.throughput(),
+        }
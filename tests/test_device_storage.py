@@ -0,0 +1,105 @@
+import sqlite3
+
+import pytest
+
+from device_storage import SqliteDeviceStorage, open_storage
+
+
+def _devices(*ips, status="UP"):
+    return [{"ip": ip, "device": f"sw-{i}", "status": status, "location": "A"}
+            for i, ip in enumerate(ips)]
+
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / "devices.db")
+
+
+@pytest.fixture
+def storage(db):
+    s = SqliteDeviceStorage(db)
+    yield s
+    s.close()
+
+
+def test_full_save_round_trip_keeps_order(storage):
+    devices = _devices("10.0.0.3", "10.0.0.1", "10.0.0.2")
+    storage.save(devices)
+    assert storage.load() == devices
+    assert len(storage) == 3
+
+
+def test_full_save_deletes_missing_known_rows(storage):
+    storage.save(_devices("10.0.0.1", "10.0.0.2", "10.0.0.3"))
+    storage.save(_devices("10.0.0.1", "10.0.0.3"))
+    assert [d["ip"] for d in storage.load()] == ["10.0.0.1", "10.0.0.3"]
+
+
+def test_full_save_keeps_rows_added_by_another_instance(db, storage):
+    storage.save(_devices("10.0.0.1", "10.0.0.2"))
+    other = SqliteDeviceStorage(db)
+    try:
+        other.save(_devices("10.0.0.9"), ips={"10.0.0.9"})
+    finally:
+        other.close()
+    # bu örnek 10.0.0.9'u hiç görmedi → silmemeli; gördüğü 10.0.0.2 silinir
+    storage.save(_devices("10.0.0.1"))
+    assert sorted(d["ip"] for d in storage.load()) == ["10.0.0.1", "10.0.0.9"]
+
+
+def test_partial_save_touches_only_dirty_rows(storage):
+    storage.save(_devices("10.0.0.1", "10.0.0.2", "10.0.0.3"))
+    changed = _devices("10.0.0.1", "10.0.0.2", "10.0.0.3", status="DOWN")
+    storage.save([changed[1]], ips={"10.0.0.2"})
+    assert [d["status"] for d in storage.load()] == ["UP", "DOWN", "UP"]
+
+
+def test_partial_save_appends_new_and_deletes_listed(storage):
+    storage.save(_devices("10.0.0.1", "10.0.0.2"))
+    (new,) = _devices("10.0.0.5")
+    storage.save([new], ips={"10.0.0.5", "10.0.0.1"})
+    # 10.0.0.1 kirli ama listede yok → silindi; yeni cihaz sona eklendi
+    assert [d["ip"] for d in storage.load()] == ["10.0.0.2", "10.0.0.5"]
+
+
+def test_partial_save_keeps_positions(storage):
+    storage.save(_devices("10.0.0.1", "10.0.0.2", "10.0.0.3"))
+    storage.save(_devices("10.0.0.3", status="DOWN"), ips={"10.0.0.3"})
+    assert [d["ip"] for d in storage.load()] == ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+
+
+def test_rows_without_ip_and_duplicates(storage):
+    devices = _devices("10.0.0.1", "10.0.0.1") + [{"device": "no-ip"}]
+    devices[1]["device"] = "second"
+    storage.save(devices)
+    assert storage.load() == [devices[0]]
+
+
+def test_select_indexed_fields(storage):
+    devices = _devices("10.0.0.1", "10.0.0.2")
+    devices[1]["status"] = "DOWN"
+    storage.save(devices)
+    assert storage.select(status="DOWN") == [devices[1]]
+    with pytest.raises(ValueError):
+        storage.select(model="x")
+
+
+def test_read_only_never_writes(db, storage):
+    storage.save(_devices("10.0.0.1"))
+    ro = SqliteDeviceStorage(db, read_only=True)
+    try:
+        assert [d["ip"] for d in ro.load()] == ["10.0.0.1"]
+        with pytest.raises(sqlite3.OperationalError):
+            ro.save(_devices("10.0.0.2"))
+    finally:
+        ro.close()
+
+
+def test_open_storage_read_only_missing_db_creates_nothing(tmp_path):
+    path = tmp_path / "devices.db"
+    storage = open_storage({"path": str(path)}, read_only=True)
+    try:
+        assert storage.load() == []
+    finally:
+        storage.close()
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,127 @@
+from device_store import DeviceStore
+from filter_index import FilterIndex
+from search_index import SearchIndex
+from transitions import TransitionDetector
+
+
+class Recorder:
+    """DeviceStore listener that logs every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def reset(self, devices):
+        self.calls.append(("reset", len(devices)))
+
+    def add(self, device):
+        self.calls.append(("add", device["ip"]))
+
+    def remove(self, device):
+        self.calls.append(("remove", device["ip"]))
+
+    def update(self, device):
+        self.calls.append(("update", device["ip"]))
+
+    def change_ip(self, device, old_ip):
+        self.calls.append(("change_ip", old_ip, device["ip"]))
+
+
+def _devices(*ips):
+    return [{"ip": ip, "device": f"sw-{i}", "location": "A"} for i, ip in enumerate(ips)]
+
+
+def test_get_and_first_duplicate_wins():
+    a, b, c = _devices("10.0.0.1", "10.0.0.2", "10.0.0.1")
+    store = DeviceStore([a, b, c])
+    assert store.get("10.0.0.1") is a
+    assert store.get("10.0.0.9") is None
+    store.remove_device(a)
+    # kopya öne alınır
+    assert store.get("10.0.0.1") is c
+    store.remove_device(c)
+    assert store.get("10.0.0.1") is None
+    assert set(store.ips()) == {"10.0.0.2"}
+
+
+def test_change_ip_rekeys_index():
+    a, b = _devices("10.0.0.1", "10.0.0.2")
+    store = DeviceStore([a, b])
+    a["ip"] = "10.0.0.3"
+    store.updated(a, old_ip="10.0.0.1")
+    assert store.get("10.0.0.3") is a
+    assert store.get("10.0.0.1") is None
+    assert not store.has_ip("10.0.0.1")
+    assert store.has_ip("10.0.0.3", exclude_device=b)
+    assert not store.has_ip("10.0.0.3", exclude_device=a)
+
+
+def test_change_ip_notifies_listeners_only_when_old_ip_is_free():
+    a, b, c = _devices("10.0.0.1", "10.0.0.2", "10.0.0.1")
+    store = DeviceStore([a, b, c])
+    rec = Recorder()
+    store.subscribe(rec)
+
+    a["ip"] = "10.0.0.5"
+    store.updated(a, old_ip="10.0.0.1")
+    # c hâlâ 10.0.0.1'de → eski IP'nin durumu silinmemeli
+    assert rec.calls == [("reset", 3), ("update", "10.0.0.5")]
+    assert store.get("10.0.0.1") is c
+
+    c["ip"] = "10.0.0.6"
+    store.updated(c, old_ip="10.0.0.1")
+    assert rec.calls[-2:] == [("change_ip", "10.0.0.1", "10.0.0.6"), ("update", "10.0.0.6")]
+
+
+def test_unchanged_ip_is_a_plain_update():
+    (a,) = _devices("10.0.0.1")
+    store = DeviceStore([a])
+    rec = Recorder()
+    store.subscribe(rec)
+    store.updated(a, old_ip="10.0.0.1")
+    assert rec.calls == [("reset", 1), ("update", "10.0.0.1")]
+
+
+def test_add_remove_reach_listeners():
+    store = DeviceStore(_devices("10.0.0.1"))
+    rec = Recorder()
+    store.subscribe(rec)
+    (b,) = _devices("10.0.0.2")
+    store.add(b)
+    assert store.remove_ip("10.0.0.2") is b
+    assert store.remove_ip("10.0.0.2") is None
+    assert rec.calls == [("reset", 1), ("add", "10.0.0.2"), ("remove", "10.0.0.2")]
+
+
+def test_indexes_follow_ip_edit():
+    a, b = _devices("10.0.0.1", "10.0.0.2")
+    store = DeviceStore([a, b])
+    search = SearchIndex()
+    filters = FilterIndex(["ip", "location"])
+    store.subscribe(search)
+    store.subscribe(filters)
+    search.search("10.0.0.1")
+    filters.set_filters({"ip": {"10.0.0.1"}})
+    assert search.matches(a) and filters.matches(a)
+
+    a["ip"] = "10.0.0.7"
+    store.updated(a, old_ip="10.0.0.1")
+    assert not search.matches(a)
+    assert not filters.matches(a)
+    assert search.search("10.0.0.7") and search.matches(a)
+    filters.set_filters({"ip": {"10.0.0.7"}})
+    assert filters.matches(a) and not filters.matches(b)
+
+
+def test_transition_detector_forgets_old_ip():
+    a, b = _devices("10.0.0.1", "10.0.0.2")
+    store = DeviceStore([a, b])
+    detector = TransitionDetector(confirm=2, window=3)
+    store.subscribe(detector)
+    a["status"] = "UP"
+    detector.observe(a, "DOWN")
+
+    a["ip"] = "10.0.0.9"
+    store.updated(a, old_ip="10.0.0.1")
+    # eski adresin DOWN sonucu yeni adrese sayılmaz
+    assert detector.observe(a, "DOWN") is None
+    assert a["status"] == "UP"
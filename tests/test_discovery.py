@@ -0,0 +1,65 @@
+import pytest
+
+from discovery import AddressSpace, parse_targets
+
+
+def _v4(ip):
+    a, b, c, d = map(int, ip.split("."))
+    return a << 24 | b << 16 | c << 8 | d
+
+
+def test_cidr_excludes_network_and_broadcast():
+    assert parse_targets("10.0.0.0/30") == [(4, _v4("10.0.0.1"), _v4("10.0.0.2"))]
+    # /31 ve /32'de dışlanacak adres yok
+    assert parse_targets("10.0.0.0/31") == [(4, _v4("10.0.0.0"), _v4("10.0.0.1"))]
+    assert parse_targets("10.0.0.7/32") == [(4, _v4("10.0.0.7"), _v4("10.0.0.7"))]
+
+
+def test_ranges_singles_and_separators():
+    assert parse_targets("10.0.0.1-5; 10.0.1.1-10.0.1.2,10.0.2.9") == [
+        (4, _v4("10.0.0.1"), _v4("10.0.0.5")),
+        (4, _v4("10.0.1.1"), _v4("10.0.1.2")),
+        (4, _v4("10.0.2.9"), _v4("10.0.2.9")),
+    ]
+
+
+def test_overlapping_and_adjacent_ranges_merge():
+    assert parse_targets("10.0.0.5-20 10.0.0.1-10 10.0.0.21") == [
+        (4, _v4("10.0.0.1"), _v4("10.0.0.21")),
+    ]
+
+
+def test_ipv6_kept_apart_from_ipv4():
+    ranges = parse_targets("fe80::1-fe80::3 10.0.0.1")
+    assert [r[0] for r in ranges] == [4, 6]
+    assert ranges[1][2] - ranges[1][1] == 2
+
+
+@pytest.mark.parametrize("spec", ["", "  ", "10.0.0.300", "10.0.0.9-1", "10.0.0.1-fe80::1", "nope"])
+def test_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        parse_targets(spec)
+
+
+def test_max_addresses():
+    parse_targets("10.0.0.0/24", max_addresses=254)
+    with pytest.raises(ValueError):
+        parse_targets("10.0.0.0/24", max_addresses=253)
+
+
+def test_address_space_index_round_trip():
+    space = AddressSpace.parse("10.0.1.0/30 10.0.0.250-255 fe80::1")
+    addresses = list(space)
+    assert len(space) == len(addresses) == 9
+    assert addresses[:2] == ["10.0.0.250", "10.0.0.251"]
+    for i, ip in enumerate(addresses):
+        assert space.index(ip) == i
+        assert space.address(i) == ip
+        assert ip in space
+
+
+@pytest.mark.parametrize("ip", ["10.0.0.249", "10.0.1.0", "10.0.1.3", "fe80::2", "::1", "bad"])
+def test_address_space_index_outside(ip):
+    space = AddressSpace.parse("10.0.1.0/30 10.0.0.250-255 fe80::1")
+    assert space.index(ip) is None
+    assert ip not in space
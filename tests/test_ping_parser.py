@@ -0,0 +1,107 @@
+import json
+import os
+
+import pytest
+
+from ping_parser import (
+    RESULT_OK, RESULT_TIMEOUT, RESULT_UNREACHABLE, extract_ping_ms, parse_ping_line,
+    parse_ping_output,
+)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "benchmarks", "fixtures", "ping")
+
+with open(os.path.join(FIXTURE_DIR, "expected.json"), "r", encoding="utf-8") as f:
+    EXPECTED = json.load(f)
+
+
+def _read(name):
+    with open(os.path.join(FIXTURE_DIR, name), "rb") as f:
+        return f.read()
+
+
+def _report(data):
+    report = parse_ping_output(data)
+    return {
+        "samples": [list(s) for s in report.samples],
+        "summary": report.summary._asdict(),
+    }
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_fixture_bytes(name):
+    assert _report(_read(name)) == EXPECTED[name]
+
+
+@pytest.mark.parametrize("name", sorted(n for n in EXPECTED if "cp8" not in n))
+def test_fixture_text_matches_bytes(name):
+    assert _report(_read(name).decode("utf-8")) == EXPECTED[name]
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_fixture_line_by_line(name):
+    # canlı akış: her satır ayrı gelir, Windows satırları sırayla numaralanır
+    samples = []
+    for line in _read(name).splitlines():
+        sample = parse_ping_line(line, len(samples) + 1)
+        if sample is not None:
+            samples.append(list(sample))
+    assert samples == EXPECTED[name]["samples"]
+
+
+@pytest.mark.parametrize("line, ms", [
+    ("64 bytes from 10.0.0.1: icmp_seq=1 ttl=64 time=0.045 ms", 0.045),
+    ("64 bytes from 10.0.0.1: seq=0 ttl=64 time=1.234 ms", 1.234),
+    ("Reply from 10.0.0.1: bytes=32 time=3ms TTL=128", 3.0),
+    ("Reply from 10.0.0.1: bytes=32 time<1ms TTL=128", 1.0),
+    ("10.0.0.1 yanıtı: bayt=32 süre=14ms TTL=64", 14.0),
+    ("Antwort von 10.0.0.1: Bytes=32 Zeit=2ms TTL=128", 2.0),
+    ("Réponse de 10.0.0.1 : octets=32 temps=13 ms TTL=128", 13.0),
+    ("Request timed out.", None),
+    ("PING 10.0.0.1 (10.0.0.1) 56(84) bytes of data.", None),
+    ("", None),
+])
+def test_extract_ping_ms(line, ms):
+    assert extract_ping_ms(line) == ms
+    assert extract_ping_ms(line.encode("utf-8")) == ms
+
+
+@pytest.mark.parametrize("line, kind", [
+    ("Request timed out.", RESULT_TIMEOUT),
+    ("İstek zaman aşımına uğradı.", RESULT_TIMEOUT),
+    ("Zeitüberschreitung der Anforderung.", RESULT_TIMEOUT),
+    ("Reply from 10.0.0.254: Destination host unreachable.", RESULT_UNREACHABLE),
+    ("From 10.0.0.254 icmp_seq=3 Destination Host Unreachable", RESULT_UNREACHABLE),
+    ("Request timeout for icmp_seq 5", RESULT_TIMEOUT),
+    ("64 bytes from 10.0.0.1: icmp_seq=1 ttl=64 time=0.045 ms", RESULT_OK),
+])
+def test_parse_ping_line_kind(line, kind):
+    assert parse_ping_line(line).kind == kind
+
+
+@pytest.mark.parametrize("line", [
+    "--- 10.0.0.1 ping statistics ---",
+    "3 packets transmitted, 3 received, 0% packet loss, time 2003ms",
+    "rtt min/avg/max/mdev = 0.040/0.045/0.051/0.004 ms",
+    "    Packets: Sent = 4, Received = 4, Lost = 0 (0% loss),",
+    "Pinging 10.0.0.1 with 32 bytes of data:",
+])
+def test_parse_ping_line_skips_headers_and_summaries(line):
+    assert parse_ping_line(line) is None
+
+
+def test_summary_derived_without_statistics():
+    report = parse_ping_output(
+        "Reply from 10.0.0.1: bytes=32 time=2ms TTL=128\n"
+        "Request timed out.\n"
+        "Reply from 10.0.0.1: bytes=32 time=4ms TTL=128\n"
+    )
+    assert [s.kind for s in report.samples] == [RESULT_OK, RESULT_TIMEOUT, RESULT_OK]
+    assert [s.seq for s in report.samples] == [1, 2, 3]
+    assert report.summary == (3, 2, 33.3, 2.0, 3.0, 4.0)
+
+
+def test_empty_output():
+    report = parse_ping_output(b"")
+    assert report.samples == []
+    assert report.summary == (0, 0, None, None, None, None)
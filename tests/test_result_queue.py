@@ -0,0 +1,113 @@
+import pytest
+
+from result_queue import CoalescingQueue
+
+
+def _drain(q):
+    out = []
+    while True:
+        try:
+            out.append(q.get_nowait())
+        except IndexError:
+            return out
+
+
+def test_bulk_coalesces_in_place():
+    q = CoalescingQueue()
+    q.put(("BULK", "10.0.0.1", "a"))
+    q.put(("BULK", "10.0.0.2", "b"))
+    q.put(("BULK", "10.0.0.1", "c"))
+    # yeni sonuç eskinin yerini alır, sırası değişmez
+    assert _drain(q) == [("BULK", "10.0.0.1", "c", 2), ("BULK", "10.0.0.2", "b", 1)]
+    assert q.merged == 1
+
+
+def test_order_across_types():
+    q = CoalescingQueue()
+    q.put(("SINGLE", None, "line 1"))
+    q.put(("BULK", "10.0.0.1", "a"))
+    q.put(("BULK_DONE", None, None))
+    q.put(("SINGLE", None, "line 2"))
+    assert [e[2] for e in _drain(q)] == ["line 1", "a", None, "line 2"]
+
+
+def test_monitor_accumulates_every_sample():
+    q = CoalescingQueue()
+    for ms in (1, 2, 3):
+        q.put(("MONITOR", "10.0.0.1", ms))
+    q.put(("MONITOR", "10.0.0.2", 9))
+    assert _drain(q) == [("MONITOR", "10.0.0.1", [1, 2, 3], 3), ("MONITOR", "10.0.0.2", [9], 1)]
+    assert q.take_dropped("MONITOR") == 0
+
+
+def test_monitor_drops_oldest_past_max_samples():
+    q = CoalescingQueue(max_samples=3)
+    for ms in range(5):
+        q.put(("MONITOR", "10.0.0.1", ms))
+    assert _drain(q) == [("MONITOR", "10.0.0.1", [2, 3, 4], 5)]
+    assert q.take_dropped("MONITOR") == 2
+    assert q.take_dropped("MONITOR") == 0
+
+
+def test_lines_evict_oldest_past_max_lines():
+    q = CoalescingQueue(max_lines=3)
+    for i in range(5):
+        q.put(("SINGLE", None, i))
+    assert [e[2] for e in _drain(q)] == [2, 3, 4]
+    assert q.take_dropped("SINGLE") == 2
+
+
+def test_line_types_have_separate_budgets():
+    q = CoalescingQueue(max_lines=2)
+    q.put(("SINGLE", None, "s1"))
+    q.put(("SINGLE", None, "s2"))
+    for i in range(10):
+        q.put(("LIVE", "10.0.0.1", i))
+    # canlı akış ping çıktısını silemez
+    assert [e[2] for e in _drain(q)] == ["s1", "s2", 8, 9]
+    assert q.take_dropped("SINGLE") == 0
+    assert q.take_dropped("LIVE") == 8
+
+
+def test_consumed_lines_free_their_budget():
+    q = CoalescingQueue(max_lines=2)
+    q.put(("SINGLE", None, 1))
+    q.put(("SINGLE", None, 2))
+    assert q.get_nowait()[2] == 1
+    q.put(("SINGLE", None, 3))
+    assert [e[2] for e in _drain(q)] == [2, 3]
+    assert q.take_dropped("SINGLE") == 0
+
+
+def test_maxsize_drops_new_keys_only():
+    q = CoalescingQueue(maxsize=2)
+    q.put(("BULK", "10.0.0.1", "a"))
+    q.put(("BULK", "10.0.0.2", "b"))
+    q.put(("BULK", "10.0.0.3", "c"))
+    q.put(("BULK", "10.0.0.1", "d"))
+    q.put(("BULK_DONE", None, None))
+    assert [(e[1], e[2]) for e in _drain(q)] == [("10.0.0.1", "d"), ("10.0.0.2", "b"), (None, None)]
+    assert q.take_dropped("BULK") == 1
+
+
+def test_clear_lines_keeps_results_and_control():
+    q = CoalescingQueue()
+    q.put(("SINGLE", None, "line"))
+    q.put(("LIVE", "10.0.0.1", 1))
+    q.put(("BULK", "10.0.0.1", "a"))
+    q.put(("BULK_DONE", None, None))
+    q.clear_lines("SINGLE")
+    assert [e[0] for e in _drain(q)] == ["LIVE", "BULK", "BULK_DONE"]
+
+
+def test_drain_respects_max_items():
+    q = CoalescingQueue()
+    for i in range(5):
+        q.put(("SINGLE", None, i))
+    assert [e[2] for e in q.drain(1.0, max_items=2)] == [0, 1]
+    assert q.qsize() == 3
+
+
+def test_get_nowait_empty_raises():
+    with pytest.raises(IndexError):
+        CoalescingQueue().get_nowait()
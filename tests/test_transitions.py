@@ -0,0 +1,70 @@
+from transitions import StatusEvent, TransitionDetector
+
+
+def _feed(detector, device, statuses):
+    return [detector.observe(device, s, now=str(i)) for i, s in enumerate(statuses)]
+
+
+def test_first_result_settles_at_once():
+    device = {"ip": "10.0.0.1"}
+    detector = TransitionDetector(confirm=3, window=5)
+    event = detector.observe(device, "UP", ms=1.5, now="t")
+    assert event == StatusEvent("10.0.0.1", None, "UP", 1.5, "t")
+    assert device["status"] == "UP"
+
+
+def test_needs_n_of_last_m():
+    device = {"ip": "10.0.0.1", "status": "UP"}
+    detector = TransitionDetector(confirm=3, window=5)
+    events = _feed(detector, device, ["DOWN", "UP", "DOWN", "UP", "DOWN"])
+    # üçüncü DOWN son beşin içinde → geçiş
+    assert events[:4] == [None] * 4
+    assert events[4].old == "UP" and events[4].new == "DOWN"
+    assert device["status"] == "DOWN"
+
+
+def test_sporadic_loss_never_flips():
+    device = {"ip": "10.0.0.1", "status": "UP"}
+    detector = TransitionDetector(confirm=3, window=5)
+    events = _feed(detector, device, ["DOWN", "UP", "UP", "UP", "UP"] * 4)
+    assert events == [None] * 20
+    assert device["status"] == "UP"
+
+
+def test_old_results_leave_the_window():
+    device = {"ip": "10.0.0.1", "status": "UP"}
+    detector = TransitionDetector(confirm=2, window=3)
+    events = _feed(detector, device, ["DOWN", "UP", "UP", "DOWN"])
+    # ilk DOWN pencereden çıktı → tek DOWN yetmez
+    assert events == [None] * 4
+
+
+def test_immediate_skips_hysteresis():
+    device = {"ip": "10.0.0.1", "status": "UP"}
+    detector = TransitionDetector(confirm=3, window=5)
+    assert detector.observe(device, "DOWN", immediate=True).new == "DOWN"
+
+
+def test_listeners_and_counters():
+    device = {"ip": "10.0.0.1", "status": "UP"}
+    detector = TransitionDetector(confirm=1, window=1)
+    seen = []
+    detector.subscribe(seen.append)
+    _feed(detector, device, ["UP", "DOWN", "DOWN", "UP"])
+    assert [(e.old, e.new) for e in seen] == [("UP", "DOWN"), ("DOWN", "UP")]
+    assert detector.results == 4
+    assert detector.events == 2
+
+
+def test_from_settings_clamps():
+    detector = TransitionDetector.from_settings({"confirm": 9, "window": 4})
+    assert (detector.confirm, detector.window) == (4, 4)
+    assert (TransitionDetector.from_settings().confirm, TransitionDetector.from_settings().window) == (3, 5)
+
+
+def test_remove_forgets_recent_results():
+    device = {"ip": "10.0.0.1", "status": "UP"}
+    detector = TransitionDetector(confirm=2, window=3)
+    detector.observe(device, "DOWN")
+    detector.remove(device)
+    assert detector.observe(device, "DOWN") is None
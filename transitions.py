@@ -0,0 +1,85 @@
+from collections import namedtuple
+
+DEFAULT_TRANSITION_SETTINGS = {
+    "confirm": 3,   # N: yeni durum son M sonucun en az N'inde görülmeli
+    "window": 5,    # M
+}
+
+# durum değişikliği olayı; ``now`` sonuçla aynı "%Y-%m-%d %H:%M:%S" metni
+StatusEvent = namedtuple("StatusEvent", "ip old new ms now")
+
+# ilk sonuçta beklemeden geçilen durumlar
+UNSETTLED = (None, "UNKNOWN")
+
+
+class TransitionDetector:
+    """Between raw probe results and their consumers: emits only status changes.
+
+    ``observe`` gets the device and the status its latest result maps to.
+    The device keeps its committed ``status`` until the new one shows up in
+    at least ``confirm`` of the last ``window`` results (N-of-M
+    hysteresis), so a link that drops one packet in five never leaves UP.
+    Then ``device["status"]`` is switched and every subscriber is called with
+    a ``StatusEvent``. Devices without a settled status, and one-shot
+    results (``immediate=True``, e.g. a bulk sweep) switch at once.
+
+    Recent raw statuses are kept as a short tuple per IP. The detector is
+    also a ``DeviceStore`` listener so removed devices are forgotten.
+    """
+
+    def __init__(self, confirm=3, window=5):
+        self.window = max(1, int(window))
+        self.confirm = min(self.window, max(1, int(confirm)))
+        self._recent = {}
+        self._listeners = []
+        self.results = 0
+        self.events = 0
+
+    @classmethod
+    def from_settings(cls, settings=None):
+        cfg = dict(DEFAULT_TRANSITION_SETTINGS)
+        cfg.update(settings or {})
+        return cls(cfg["confirm"], cfg["window"])
+
+    def subscribe(self, listener):
+        """``listener(event)`` is called synchronously for every change."""
+        self._listeners.append(listener)
+
+    def observe(self, device, status, ms=None, now=None, immediate=False):
+        """Feed one result; returns the ``StatusEvent`` or None if nothing changed."""
+        ip = device.get("ip")
+        recent = (self._recent.get(ip, ()) + (status,))[-self.window:]
+        self._recent[ip] = recent
+        self.results += 1
+
+        old = device.get("status")
+        if status == old:
+            return None
+        if not (immediate or old in UNSETTLED or recent.count(status) >= self.confirm):
+            return None
+
+        device["status"] = status
+        event = StatusEvent(ip, old, status, ms, now)
+        self.events += 1
+        for listener in self._listeners:
+            listener(event)
+        return event
+
+    # ---- DeviceStore listener ----
+    def reset(self, devices):
+        keep = {d.get("ip") for d in devices}
+        for ip in [ip for ip in self._recent if ip not in keep]:
+            del self._recent[ip]
+
+    def add(self, device):
+        pass
+
+    def remove(self, device):
+        self._recent.pop(device.get("ip"), None)
+
+    def update(self, device):
+        pass
+
+    def change_ip(self, device, old_ip):
+        # son durumlar eski adrese ait; yeni IP ilk sonucunda yerleşir
+        self._recent.pop(old_ip, None)
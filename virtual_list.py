@@ -0,0 +1,269 @@
+class VirtualTree:
+    """Keyed, diff-based row management for a flat ttk.Treeview.
+
+    Rows are arbitrary objects (device dicts); ``key_fn`` gives each a stable
+    key (the IP), ``values_fn`` / ``tags_fn`` build what the Treeview shows.
+
+    * Normal mode: every row is materialized. ``set_rows`` diffs against what
+      is already in the tree — deletes vanished keys, inserts new ones,
+      rewrites only rows whose values/tags changed and reorders with one
+      ``set_children`` call when the order differs.
+    * Virtual mode: only the visible window exists in the tree. A fixed pool
+      of items is recycled as the window moves; scrolling rewrites the pool
+      slots whose content changed. Selection is kept by key, so it survives
+      scrolling and re-sorting.
+    """
+
+    def __init__(self, tree, key_fn, values_fn, tags_fn, virtual=False,
+                 scrollbar=None, row_height=26, header_height=28):
+        self.tree = tree
+        self.key_fn = key_fn
+        self.values_fn = values_fn
+        self.tags_fn = tags_fn
+        self.virtual = virtual
+        self.scrollbar = scrollbar
+        self.row_height = row_height
+        self.header_height = header_height
+
+        self.rows = []
+        self.key_pos = {}        # key → modeldeki sıra (O(1) klavye gezinmesi için)
+        self.items = {}          # key → görünen item id
+        self.item_keys = {}      # item id → key
+        self._cache = {}         # item id → (values, tags)
+        self._order = []         # normal modda ağaçtaki item sırası
+        self._pool = []          # sanal modda geri dönüştürülen item'lar
+
+        self.top = 0
+        self.visible = 20
+        self.selected = set()
+        self.focus_key = None
+        self._syncing = False
+
+        if virtual:
+            tree.configure(yscrollcommand="")
+            if scrollbar is not None:
+                scrollbar.configure(command=self.yview)
+            tree.bind("<Configure>", self._on_configure, add="+")
+
+    # ---------------- model ----------------
+    def set_rows(self, rows):
+        self.rows = rows
+        self.key_pos = {}
+        for i, r in enumerate(rows):
+            self.key_pos.setdefault(self.key_fn(r), i)
+
+        self.selected &= self.key_pos.keys()
+        if self.focus_key not in self.key_pos:
+            self.focus_key = None
+        self.top = max(0, min(self.top, len(rows) - self.visible))
+        self.render()
+
+    def refresh_key(self, key):
+        """Re-render one row if it is currently materialized (O(1))."""
+        item = self.items.get(key)
+        if item is None:
+            return
+        pos = self.key_pos.get(key)
+        if pos is None:
+            return
+        self._write(item, self.rows[pos])
+
+    def _write(self, item, row):
+        values = self.values_fn(row)
+        tags = self.tags_fn(row)
+        if self._cache.get(item) != (values, tags):
+            self.tree.item(item, values=values, tags=tags)
+            self._cache[item] = (values, tags)
+
+    # ---------------- rendering ----------------
+    def render(self):
+        if self.virtual:
+            self._render_window()
+        else:
+            self._render_all()
+        self._sync_selection()
+
+    def _render_all(self):
+        keys = []
+        seen = set()
+        for r in self.rows:
+            k = self.key_fn(r)
+            if k in seen:
+                continue   # aynı IP iki kez → tek satır
+            seen.add(k)
+            keys.append((k, r))
+
+        # ❌ silinenler
+        gone = [item for k, item in self.items.items() if k not in seen]
+        if gone:
+            self.tree.delete(*gone)
+            for item in gone:
+                self._cache.pop(item, None)
+                self.items.pop(self.item_keys.pop(item), None)
+
+        # ➕ yeniler / ✏️ değişenler
+        order = []
+        for k, r in keys:
+            item = self.items.get(k)
+            if item is None:
+                values = self.values_fn(r)
+                tags = self.tags_fn(r)
+                item = self.tree.insert("", "end", values=values, tags=tags)
+                self._cache[item] = (values, tags)
+                self.items[k] = item
+                self.item_keys[item] = k
+            else:
+                self._write(item, r)
+            order.append(item)
+
+        # ↕️ sıra değiştiyse tek çağrıda yeniden diz
+        if order != self._order:
+            self.tree.set_children("", *order)
+            self._order = order
+
+    def _render_window(self):
+        window = self.rows[self.top:self.top + self.visible]
+
+        # havuzu pencere boyuna getir
+        while len(self._pool) < len(window):
+            item = self.tree.insert("", "end", values=())
+            self._pool.append(item)
+            self._cache[item] = None
+        if len(self._pool) > len(window):
+            extra = self._pool[len(window):]
+            self.tree.delete(*extra)
+            for item in extra:
+                self._cache.pop(item, None)
+            del self._pool[len(window):]
+
+        self.items = {}
+        self.item_keys = {}
+        for item, r in zip(self._pool, window):
+            k = self.key_fn(r)
+            self.items.setdefault(k, item)
+            self.item_keys[item] = k
+            self._write(item, r)
+
+        self._update_scrollbar()
+
+    def _sync_selection(self):
+        wanted = [self.items[k] for k in self.selected if k in self.items]
+        self._syncing = True
+        try:
+            self.tree.selection_set(wanted)
+            focus = self.items.get(self.focus_key)
+            if focus:
+                self.tree.focus(focus)
+        finally:
+            # <<TreeviewSelect>> olay döngüsünde gelir; bayrağı orada sıfırla
+            self.tree.after_idle(self._end_sync)
+
+    def _end_sync(self):
+        self._syncing = False
+
+    # ---------------- scrolling (virtual) ----------------
+    def _on_configure(self, event):
+        visible = max(1, (event.height - self.header_height) // self.row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.top = max(0, min(self.top, len(self.rows) - self.visible))
+            self.render()
+
+    def _update_scrollbar(self):
+        if self.scrollbar is None:
+            return
+        total = len(self.rows)
+        if total <= 0:
+            self.scrollbar.set(0, 1)
+            return
+        self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible) / total))
+
+    def scroll_to(self, top):
+        top = max(0, min(int(top), len(self.rows) - self.visible))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def scroll(self, rows):
+        if self.virtual:
+            self.scroll_to(self.top + rows)
+        else:
+            self.tree.yview_scroll(rows, "units")
+
+    def yview(self, *args):
+        """Scrollbar command: ``moveto fraction`` / ``scroll n units|pages``."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * len(self.rows))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= max(1, self.visible - 1)
+            self.scroll_to(self.top + step)
+
+    def ensure_visible(self, key):
+        pos = self.key_pos.get(key)
+        if pos is None:
+            return
+        if self.virtual:
+            if pos < self.top:
+                self.scroll_to(pos)
+            elif pos >= self.top + self.visible:
+                self.scroll_to(pos - self.visible + 1)
+        item = self.items.get(key)
+        if item:
+            self.tree.see(item)
+
+    # ---------------- selection ----------------
+    def on_user_select(self):
+        """Pull a user-made Treeview selection back into the key set."""
+        if self._syncing:
+            return
+        tree_sel = set(self.tree.selection())
+        for item, k in self.item_keys.items():
+            if item in tree_sel:
+                self.selected.add(k)
+            else:
+                self.selected.discard(k)
+        focus = self.tree.focus()
+        if focus in self.item_keys:
+            self.focus_key = self.item_keys[focus]
+
+    def selection_keys(self):
+        """Selected keys in display order."""
+        return sorted(self.selected, key=lambda k: self.key_pos.get(k, 0))
+
+    def first_selected(self):
+        keys = self.selection_keys()
+        return keys[0] if keys else None
+
+    def select(self, keys, focus=None, add=False):
+        if not add:
+            self.selected = set()
+        self.selected.update(k for k in keys if k in self.key_pos)
+        if focus is not None:
+            self.focus_key = focus
+            self.ensure_visible(focus)
+        self._sync_selection()
+
+    def select_all(self):
+        self.select(self.key_pos.keys(), focus=self.key_at(0))
+
+    def key_at(self, index):
+        if 0 <= index < len(self.rows):
+            return self.key_fn(self.rows[index])
+        return None
+
+    def move_focus(self, direction, extend=False):
+        """Arrow-key navigation by model index, independent of what is materialized."""
+        if not self.rows:
+            return None
+        if self.focus_key is None or self.focus_key not in self.key_pos:
+            target = self.key_at(0)
+        else:
+            target = self.key_at(self.key_pos[self.focus_key] + direction)
+            if target is None:
+                return None
+        self.select([target], focus=target, add=extend)
+        return target